@@ -0,0 +1,40 @@
+-- ============================================================================
+-- MIGRAÇÃO 004: Índice único de identidade dos owners
+-- ============================================================================
+-- O orchestrator grava owners em lote com INSERT ... ON CONFLICT
+-- (full_name, line1, zip), que exige este índice único.
+-- Duplicatas já existentes são fundidas no menor id antes da criação.
+-- ============================================================================
+
+-- Mapa duplicata -> owner mantido
+CREATE TEMP TABLE owner_merge AS
+SELECT id AS dup_id, keep_id
+FROM (
+    SELECT
+        id,
+        MIN(id) OVER (
+            PARTITION BY full_name, mailing_address->>'line1', mailing_address->>'zip'
+        ) AS keep_id
+    FROM owners
+) t
+WHERE id <> keep_id;
+
+-- Referências passam a apontar para o owner mantido
+UPDATE parks_master p
+SET owner_id = m.keep_id
+FROM owner_merge m
+WHERE p.owner_id = m.dup_id;
+
+UPDATE contacts c
+SET owner_id = m.keep_id
+FROM owner_merge m
+WHERE c.owner_id = m.dup_id;
+
+DELETE FROM owners o
+USING owner_merge m
+WHERE o.id = m.dup_id;
+
+DROP TABLE owner_merge;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_owners_identity
+    ON owners (full_name, (mailing_address->>'line1'), (mailing_address->>'zip'));
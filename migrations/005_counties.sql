@@ -0,0 +1,19 @@
+-- ============================================================================
+-- MIGRAÇÃO 005: Tabela de limites dos condados
+-- ============================================================================
+-- O orchestrator resolve o condado de cada parque pendente na própria
+-- consulta de parks_master (LEFT JOIN LATERAL + ST_Intersects no índice
+-- GiST, restrito ao estado do parque). Parques sem match seguem pelo
+-- CountyMapper. Nomes de condado se repetem entre estados ("Marion County"
+-- existe em IN, FL, OH...), por isso a chave é (state, name).
+-- Depois da migração, popular com: python scripts/load_counties.py
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS counties (
+    state VARCHAR(2) NOT NULL,      -- Mesmo formato de parks_master.state: "IN"
+    name VARCHAR(100) NOT NULL,     -- Mesmo formato do CountyMapper: "Marion County"
+    geom GEOMETRY(MultiPolygon, 4326) NOT NULL,
+    PRIMARY KEY (state, name)
+);
+
+CREATE INDEX IF NOT EXISTS idx_counties_geom ON counties USING GIST(geom);
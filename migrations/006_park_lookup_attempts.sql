@@ -0,0 +1,10 @@
+-- ============================================================================
+-- MIGRAÇÃO 006: Última tentativa de busca de proprietário por parque
+-- ============================================================================
+-- O orchestrator grava last_lookup_attempt_at a cada checkpoint e só volta
+-- a buscar parques cuja última tentativa passou de 24 horas: uma execução
+-- retomada após queda não repete buscas que acabaram de falhar.
+-- ============================================================================
+
+ALTER TABLE parks_master
+    ADD COLUMN IF NOT EXISTS last_lookup_attempt_at TIMESTAMP WITH TIME ZONE;
@@ -0,0 +1,16 @@
+-- ============================================================================
+-- MIGRAÇÃO 007: Índice para os filtros de estado/condado do dashboard
+-- ============================================================================
+-- /api/counties/<estado> agrupa parks_master por condado dentro de um
+-- estado; com (state, county) vira um index scan em vez de seq scan +
+-- hash aggregate. /api/states já usa o prefixo de idx_parks_master_state_city.
+-- Executar com: python scripts/run_migration.py migrations/007_dashboard_indexes.sql
+-- (sem CONCURRENTLY: o run_migration roda tudo numa transação)
+-- ============================================================================
+
+CREATE INDEX IF NOT EXISTS idx_parks_master_state_county
+    ON parks_master(state, county)
+    WHERE state IS NOT NULL AND county IS NOT NULL;
+
+-- Estatísticas novas para o planner considerar o índice
+ANALYZE parks_master;
@@ -19,6 +19,7 @@ import sys
 import re
 from pathlib import Path
 from datetime import datetime
+from typing import Optional
 from loguru import logger
 from sqlalchemy import text
 
@@ -218,26 +219,34 @@ def create_owners_from_parks():
         logger.info(f"  Pendentes de SOS: {stats[3]}")
 
 
-def main():
+def main(options: Optional[dict] = None) -> bool:
+    """
+    Execução principal.
+    
+    options=None: modo CLI. Chamado em processo (dashboard) com options,
+    não reconfigura os sinks do logger.
+    """
     print("=" * 70)
     print("FASE 3 ALTERNATIVA: OWNERS A PARTIR DOS NOMES DOS PARQUES")
     print("=" * 70)
     print()
     
     # Configurar logging
-    logger.remove()
-    logger.add(sys.stderr, level="INFO", colorize=True)
+    if options is None:
+        logger.remove()
+        logger.add(sys.stderr, level="INFO", colorize=True)
     
     # Testar conexão
     print("1. Testando conexão com banco...")
     if not test_connection():
         print("   ❌ Falha na conexão")
-        return
+        return False
     print("   ✅ Conexão OK")
     print()
     
     # Criar owners
     create_owners_from_parks()
+    return True
 
 
 if __name__ == "__main__":
@@ -432,8 +432,15 @@ def print_stats(stats: dict, title: str):
     logger.info(f"{'='*50}\n")
 
 
-def main():
-    """Função principal do script."""
+def main(options: Optional[dict] = None):
+    """
+    Função principal do script.
+    
+    options=None: lê os argumentos da linha de comando. Chamado em processo
+    (dashboard), options sobrescreve os defaults do parser (chaves com "_"
+    no lugar de "-", ex.: {'source': 'website', 'skip_apis': True}) e os
+    sinks do logger ficam como estão.
+    """
     parser = argparse.ArgumentParser(
         description="Enriquecimento de contatos digitais (Fase 5)"
     )
@@ -470,10 +477,14 @@ def main():
         help="Apenas simular, não salvar no banco",
     )
     
-    args = parser.parse_args()
+    if options is None:
+        args = parser.parse_args()
+        setup_logging()
+    else:
+        args = parser.parse_args([])
+        vars(args).update(options)
     
     # Setup
-    setup_logging()
     logger.info("="*60)
     logger.info("  FASE 5: ENRIQUECIMENTO DE CONTATOS DIGITAIS")
     logger.info("="*60)
@@ -19,6 +19,7 @@ Data: 2025-12
 import sys
 import argparse
 from pathlib import Path
+from typing import Optional
 from loguru import logger
 
 # Adicionar projeto ao path
@@ -177,8 +178,14 @@ def check_prerequisites():
     return True
 
 
-def main():
-    """Função principal."""
+def main(options: Optional[dict] = None):
+    """
+    Função principal.
+    
+    options=None: lê os argumentos da linha de comando e pede confirmação.
+    Chamado em processo (dashboard), options sobrescreve os defaults do
+    parser (ex.: {'limit': 50}) e roda sem prompt nem sinks extras de log.
+    """
     parser = argparse.ArgumentParser(
         description="Fase 4: Enriquecimento Corporativo"
     )
@@ -204,9 +211,13 @@ def main():
         help='Executar apenas migração SQL'
     )
     
-    args = parser.parse_args()
-    
-    setup_logging()
+    interactive = options is None
+    if interactive:
+        args = parser.parse_args()
+        setup_logging()
+    else:
+        args = parser.parse_args([])
+        vars(args).update(options)
     
     print("\n" + "="*70)
     print("FASE 4: ENRIQUECIMENTO CORPORATIVO")
@@ -258,10 +269,11 @@ def main():
     if not args.mock:
         print("O site do Indiana SOS pode bloquear IPs com muitas requisições.")
     
-    response = input("\nDeseja continuar? [s/N]: ").strip().lower()
-    if response != 's':
-        print("Operação cancelada.")
-        return 0
+    if interactive:
+        response = input("\nDeseja continuar? [s/N]: ").strip().lower()
+        if response != 's':
+            print("Operação cancelada.")
+            return 0
     
     # Executar enriquecimento
     print("\n" + "="*70)
@@ -12,6 +12,7 @@ Date: December 2025
 import sys
 from pathlib import Path
 from datetime import datetime
+from typing import Optional
 import pandas as pd
 from loguru import logger
 from sqlalchemy import text
@@ -252,28 +253,39 @@ def generate_full_csv(output_dir: Path, state_filter: str = None) -> str:
     return str(filepath)
 
 
-def main():
-    """Função principal."""
+def main(options: Optional[dict] = None) -> bool:
+    """
+    Função principal.
+    
+    options=None: modo CLI (pergunta o filtro de estado). Chamado em
+    processo (dashboard) lê options['state_filter'] (padrão 'IN', None =
+    todos) e não reconfigura os sinks do logger.
+    """
+    interactive = options is None
     print("=" * 80)
     print("GERAÇÃO DE CSVs PARA DIRECT MAIL")
     print("=" * 80)
     print()
     
     # Configurar logging
-    logger.remove()
-    logger.add(sys.stderr, level="INFO", colorize=True)
+    if interactive:
+        logger.remove()
+        logger.add(sys.stderr, level="INFO", colorize=True)
     
     # Diretório de saída
     output_dir = Path(__file__).parent.parent / "output"
     output_dir.mkdir(exist_ok=True)
     
     # Perguntar filtro de estado
-    print("Filtrar por estado?")
-    print("  1. Apenas Indiana (IN)")
-    print("  2. Todos os estados")
-    
-    choice = input("\nEscolha (1/2) [1]: ").strip() or "1"
-    state_filter = "IN" if choice == "1" else None
+    if interactive:
+        print("Filtrar por estado?")
+        print("  1. Apenas Indiana (IN)")
+        print("  2. Todos os estados")
+        
+        choice = input("\nEscolha (1/2) [1]: ").strip() or "1"
+        state_filter = "IN" if choice == "1" else None
+    else:
+        state_filter = options.get('state_filter', 'IN')
     
     if state_filter:
         logger.info(f"📍 Filtrando apenas: {state_filter}")
@@ -303,6 +315,8 @@ def main():
     print(f"  3. {csv3}")
     print()
     print("=" * 80)
+    
+    return True
 
 
 if __name__ == "__main__":
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Popula a tabela counties (migrations/005_counties.sql) com os limites dos
+condados do GeoJSON usado pelo CountyMapper.
+
+Uso:
+    python scripts/load_counties.py
+    python scripts/load_counties.py --geojson data/geo/indiana_counties.geojson
+    python scripts/load_counties.py --geojson data/geo/ohio_counties.geojson --state OH
+"""
+import argparse
+import os
+import sys
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from loguru import logger
+
+from src.database import get_db_session
+from src.owners.county_mapper import CountyMapper
+
+
+# Reexecutável: condados já presentes têm a geometria substituída
+_UPSERT_COUNTY = text("""
+    INSERT INTO counties (state, name, geom)
+    VALUES (:state, :name, ST_Multi(ST_GeomFromWKB(decode(:geom, 'hex'), 4326)))
+    ON CONFLICT (state, name) DO UPDATE SET geom = EXCLUDED.geom
+""")
+
+
+def load_counties(geojson_path=None, state: str = 'IN') -> int:
+    """Grava os condados do GeoJSON (todos de `state`) na tabela counties. Retorna quantos."""
+    mapper = CountyMapper(geojson_path=geojson_path)
+    rows = [
+        {'state': state, 'name': name, 'geom': geom}
+        for name, geom in mapper.county_geometries()
+    ]
+    
+    if not rows:
+        logger.error("❌ Nenhum condado carregado do GeoJSON")
+        return 0
+    
+    with get_db_session() as session:
+        session.execute(_UPSERT_COUNTY, rows)
+    
+    logger.success(f"✓ {len(rows)} condados ({state}) gravados na tabela counties")
+    return len(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Carrega limites de condados no PostGIS")
+    parser.add_argument('--geojson', help='GeoJSON de condados (padrão: o do CountyMapper)')
+    parser.add_argument('--state', default='IN', help='UF dos condados do GeoJSON (padrão: IN)')
+    args = parser.parse_args()
+    
+    sys.exit(0 if load_counties(args.geojson, args.state.upper()) else 1)
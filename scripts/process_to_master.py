@@ -4,26 +4,36 @@ Executa deduplicação e consolidação de dados.
 """
 import sys
 from pathlib import Path
+from typing import Optional
 from loguru import logger
+from sqlalchemy import text
 
 # Adicionar projeto ao path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from src.processing.deduplication import process_parks_raw_to_master
-from src.database import test_connection
+from src.database import test_connection, get_db_session
 
 
-def main():
-    """Execução principal."""
+def main(options: Optional[dict] = None):
+    """
+    Execução principal.
+    
+    options=None: modo CLI (log em arquivo + confirmação interativa).
+    Com options (chamada em processo pelo dashboard) não pergunta nada
+    nem mexe nos sinks do logger.
+    """
+    interactive = options is None
     
     # Configurar logging
-    logger.add(
-        "logs/process_master_{time}.log",
-        rotation="1 day",
-        retention="30 days",
-        level="INFO"
-    )
+    if interactive:
+        logger.add(
+            "logs/process_master_{time}.log",
+            rotation="1 day",
+            retention="30 days",
+            level="INFO"
+        )
     
     logger.info("="*70)
     logger.info("SCRIPT DE PROCESSAMENTO: parks_raw → parks_master")
@@ -38,30 +48,31 @@ def main():
     logger.info("✓ Conexão estabelecida")
     
     # Confirmar execução
-    print("\n" + "="*70)
-    print("PROCESSAMENTO DE DEDUPLICAÇÃO E CONSOLIDAÇÃO")
-    print("="*70)
-    print("\nEste script irá:")
-    print("  1. Carregar todos os registros não processados de parks_raw")
-    print("  2. Normalizar endereços usando algoritmo de parsing")
-    print("  3. Agrupar registros por ZIP code e proximidade geográfica")
-    print("  4. Detectar duplicatas usando similaridade de nomes (>85%)")
-    print("  5. Consolidar dados de múltiplas fontes em registros master")
-    print("  6. Inserir registros únicos em parks_master")
-    print("\nAlgoritmo de deduplicação:")
-    print("  - Blocking por ZIP code + raio de 500m")
-    print("  - Similaridade de nome: fuzzy matching (RapidFuzz)")
-    print("  - Prioridade de fontes: Google Places > OSM > Yelp")
-    print("  - Consolidação: melhor valor de cada fonte")
+    if interactive:
+        print("\n" + "="*70)
+        print("PROCESSAMENTO DE DEDUPLICAÇÃO E CONSOLIDAÇÃO")
+        print("="*70)
+        print("\nEste script irá:")
+        print("  1. Carregar todos os registros não processados de parks_raw")
+        print("  2. Normalizar endereços usando algoritmo de parsing")
+        print("  3. Agrupar registros por ZIP code e proximidade geográfica")
+        print("  4. Detectar duplicatas usando similaridade de nomes (>85%)")
+        print("  5. Consolidar dados de múltiplas fontes em registros master")
+        print("  6. Inserir registros únicos em parks_master")
+        print("\nAlgoritmo de deduplicação:")
+        print("  - Blocking por ZIP code + raio de 500m")
+        print("  - Similaridade de nome: fuzzy matching (RapidFuzz)")
+        print("  - Prioridade de fontes: Google Places > OSM > Yelp")
+        print("  - Consolidação: melhor valor de cada fonte")
     
-    print("\n" + "="*70)
+        print("\n" + "="*70)
     
-    confirm = input("\nDeseja continuar? (s/N): ").strip().lower()
+        confirm = input("\nDeseja continuar? (s/N): ").strip().lower()
     
-    if confirm != 's':
-        logger.info("Processamento cancelado pelo usuário")
-        print("\nProcessamento cancelado.")
-        return False
+        if confirm != 's':
+            logger.info("Processamento cancelado pelo usuário")
+            print("\nProcessamento cancelado.")
+            return False
     
     # Executar processamento
     logger.info("\n2. Iniciando processamento...")
@@ -74,9 +85,6 @@ def main():
             logger.info(f"  {len(master_records)} registros master criados")
             
             # Estatísticas finais
-            from database import get_db_session
-            from sqlalchemy import text
-            
             with get_db_session() as session:
                 # Total de parks_master
                 result = session.execute(text("SELECT COUNT(*) FROM parks_master"))
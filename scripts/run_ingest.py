@@ -8,6 +8,7 @@ import yaml
 from loguru import logger
 from sqlalchemy import text
 import json
+from typing import Optional
 
 # Adicionar src ao path
 project_root = Path(__file__).parent.parent
@@ -102,8 +103,13 @@ def insert_parks_to_db(parks, batch_size: int = 100):
     return inserted
 
 
-def main():
-    """Execução principal - Google Places automatizado."""
+def main(options: Optional[dict] = None):
+    """
+    Execução principal - Google Places automatizado.
+    
+    options: chamada em processo pelo dashboard; a ingestão não tem
+    opções próprias (o estado vem do config).
+    """
     
     logger.info("="*60)
     logger.info("INGESTÃO GOOGLE PLACES - MODO AUTOMATIZADO")
@@ -115,7 +121,7 @@ def main():
         return False
     
     # Carregar config
-    config = load_config()
+    config = load_config(str(project_root / "config" / "indiana.yaml"))
     logger.info(f"Estado: {config.state['name']}")
     
     # Buscar dados do Google Places
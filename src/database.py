@@ -3,7 +3,8 @@ Módulo de conexão com PostgreSQL/PostGIS.
 Carrega credenciais de variáveis de ambiente para segurança.
 """
 import os
-from typing import Optional
+import threading
+from typing import Any, Dict, Optional
 from contextlib import contextmanager
 from sqlalchemy import create_engine, text
 from sqlalchemy.engine import Engine
@@ -49,13 +50,22 @@ class DatabaseConfig:
 _engine: Optional[Engine] = None
 _SessionLocal: Optional[sessionmaker] = None
 
+# Evita duas engines quando threads (ex.: servidor Flask) chegam juntas
+_engine_lock = threading.Lock()
 
-def get_engine(echo: bool = False) -> Engine:
+# Opções efetivas com que a engine foi criada (para detectar conflitos)
+_engine_options: Dict[str, Any] = {}
+
+
+def get_engine(echo: bool = False, **engine_options: Any) -> Engine:
     """
     Retorna a engine SQLAlchemy (singleton).
     
     Args:
         echo: Se True, loga todas as queries SQL
+        **engine_options: Sobrescrevem as opções padrão de create_engine
+            (só valem na primeira chamada, que cria a engine; chamadas
+            seguintes com opções diferentes geram um warning)
         
     Returns:
         Engine do SQLAlchemy
@@ -63,19 +73,44 @@ def get_engine(echo: bool = False) -> Engine:
     global _engine
     
     if _engine is None:
-        config = DatabaseConfig()
-        _engine = create_engine(
-            config.connection_string,
-            echo=echo,
-            pool_size=10,
-            max_overflow=20,
-            pool_pre_ping=True,  # Verifica conexões antes de usar
-        )
-        logger.info(f"Engine criada: {config.host}:{config.port}/{config.database}")
+        with _engine_lock:
+            if _engine is None:
+                config = DatabaseConfig()
+                options = {
+                    'pool_size': 10,
+                    'max_overflow': 20,
+                    'pool_timeout': 30,
+                    'pool_pre_ping': True,  # Verifica conexões antes de usar
+                    'pool_recycle': 1800,  # Renova conexões antes de timeouts de idle do servidor/proxy
+                    # executemany de UPDATE via execute_batch (psycopg2); INSERTs
+                    # em lote usam VALUES multi-linha
+                    'executemany_mode': "values_plus_batch",
+                    **engine_options,
+                }
+                _engine = create_engine(config.connection_string, echo=echo, **options)
+                _engine_options.update(echo=echo, **options)
+                logger.info(f"Engine criada: {config.host}:{config.port}/{config.database}")
+                return _engine
     
+    # Engine já existia: opções desta chamada não têm efeito
+    if echo or engine_options:
+        _warn_conflicting_options({'echo': echo, **engine_options})
     return _engine
 
 
+def _warn_conflicting_options(requested: Dict[str, Any]):
+    """Avisa se a engine já existente foi criada com outras opções."""
+    conflicts = {
+        key: value for key, value in requested.items()
+        if _engine_options.get(key) != value
+    }
+    if conflicts:
+        logger.warning(
+            f"get_engine: engine já criada com {_engine_options}; "
+            f"opções ignoradas: {conflicts}"
+        )
+
+
 def get_session_maker() -> sessionmaker:
     """
     Retorna o sessionmaker configurado.
@@ -192,7 +192,7 @@ class GooglePlacesAPI:
         # Rate limiting (Google permite ~100 req/s, mas vamos ser conservadores)
         self.requests_per_second = 10
         self.min_delay = 1.0 / self.requests_per_second
-        self.last_request_time = 0
+        self.last_request_time = float("-inf")
         
         # Quota tracking
         self.daily_quota = int(os.getenv("MAX_API_CALLS_PER_DAY", "10000"))
@@ -219,7 +219,7 @@ class GooglePlacesAPI:
     
     def _respect_rate_limit(self):
         """Aplica rate limiting."""
-        elapsed = time.time() - self.last_request_time
+        elapsed = time.monotonic() - self.last_request_time
         if elapsed < self.min_delay:
             time.sleep(self.min_delay - elapsed)
     
@@ -242,7 +242,7 @@ class GooglePlacesAPI:
         
         try:
             response = requests.get(url, params=params, timeout=30)
-            self.last_request_time = time.time()
+            self.last_request_time = time.monotonic()
             self.requests_today += 1
             
             response.raise_for_status()
@@ -10,7 +10,6 @@ import hashlib
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Tuple, Set
 from datetime import datetime, timedelta
-from decimal import Decimal
 import requests
 from loguru import logger
 from dotenv import load_dotenv
@@ -162,7 +161,7 @@ class GooglePlacesNewAPI:
         # Rate limiting
         self.requests_per_second = 10
         self.min_delay = 1.0 / self.requests_per_second
-        self.last_request_time = 0
+        self.last_request_time = float("-inf")
         
         # Quota tracking
         self.daily_quota = int(os.getenv("MAX_API_CALLS_PER_DAY", "10000"))
@@ -186,7 +185,7 @@ class GooglePlacesNewAPI:
     
     def _respect_rate_limit(self):
         """Aplica rate limiting."""
-        elapsed = time.time() - self.last_request_time
+        elapsed = time.monotonic() - self.last_request_time
         if elapsed < self.min_delay:
             time.sleep(self.min_delay - elapsed)
     
@@ -264,7 +263,7 @@ class GooglePlacesNewAPI:
         
         try:
             response = requests.post(url, headers=headers, json=body, timeout=30)
-            self.last_request_time = time.time()
+            self.last_request_time = time.monotonic()
             self.requests_today += 1
             
             if response.status_code == 200:
@@ -334,7 +333,7 @@ class GooglePlacesNewAPI:
         
         try:
             response = requests.post(url, headers=headers, json=body, timeout=30)
-            self.last_request_time = time.time()
+            self.last_request_time = time.monotonic()
             self.requests_today += 1
             
             if response.status_code == 200:
@@ -397,7 +396,7 @@ class GooglePlacesNewAPI:
         
         try:
             response = requests.get(url, headers=headers, timeout=30)
-            self.last_request_time = time.time()
+            self.last_request_time = time.monotonic()
             self.requests_today += 1
             
             if response.status_code == 200:
@@ -491,12 +490,12 @@ def parse_place_to_park_raw(place: Dict[str, Any]) -> ParkRawData:
         state=state,
         zip_code=zip_code,
         county=county,
-        latitude=Decimal(str(lat)) if lat else None,
-        longitude=Decimal(str(lon)) if lon else None,
+        latitude=lat,
+        longitude=lon,
         phone=phone,
         website=website,
         business_status=business_status,
-        rating=Decimal(str(rating)) if rating else None,
+        rating=rating,
         total_reviews=user_rating_count,
         raw_data={
             'place_id': place_id,
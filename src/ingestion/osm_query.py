@@ -4,16 +4,56 @@ Respeita rate limits e conformidade legal.
 """
 import os
 import time
-import yaml
+import functools
+from collections import Counter
 from typing import List, Dict, Any, Optional
 from pathlib import Path
 import requests
 from loguru import logger
-from dotenv import load_dotenv
+from pydantic import TypeAdapter, ValidationError
 
 from ..models import OSMElement, ParkRawData, StateConfig
 
-load_dotenv()
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    import json
+    ORJSON_AVAILABLE = False
+
+_OSM_ELEMENTS_ADAPTER = TypeAdapter(List[OSMElement])
+
+
+# Query Overpass QL com bbox global: o texto só varia no placeholder {bbox},
+# então bboxes iguais geram queries idênticas (cacheáveis pelo servidor)
+_QUERY_TEMPLATE = """
+[out:json][timeout:90][bbox:{bbox}];
+(
+  // Camp sites (campgrounds)
+  nwr["tourism"="camp_site"];
+  
+  // Caravan sites (RV parks)
+  nwr["tourism"="caravan_site"];
+  
+  // Mobile home parks
+  nwr["landuse"="residential"]["residential"="mobile_home"];
+  
+  // Trailer parks
+  nwr["landuse"="residential"]["residential"="trailer_park"];
+  
+  // Busca adicional por prefixo de nome (regex ancorada usa o índice de tags).
+  // Sobreposições com as buscas por tag são removidas na deduplicação.
+  nwr["name"~"^(Mobile Home|Trailer|RV )",i];
+);
+out center meta;
+""".strip()
+
+
+def _json_loads(content: bytes) -> Any:
+    """Decodifica JSON direto dos bytes da resposta (orjson quando disponível)."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(content)
+    return json.loads(content)
 
 
 class OSMQueryBuilder:
@@ -37,53 +77,30 @@ class OSMQueryBuilder:
         # Bounding box: (min_lat, min_lon, max_lat, max_lon)
         bbox_str = f"{self.bbox['min_lat']},{self.bbox['min_lon']},{self.bbox['max_lat']},{self.bbox['max_lon']}"
         
-        query = f"""
-[out:json][timeout:90];
-(
-  // Camp sites (campgrounds)
-  node["tourism"="camp_site"]({bbox_str});
-  way["tourism"="camp_site"]({bbox_str});
-  relation["tourism"="camp_site"]({bbox_str});
-  
-  // Caravan sites (RV parks)
-  node["tourism"="caravan_site"]({bbox_str});
-  way["tourism"="caravan_site"]({bbox_str});
-  relation["tourism"="caravan_site"]({bbox_str});
-  
-  // Mobile home parks
-  node["landuse"="residential"]["residential"="mobile_home"]({bbox_str});
-  way["landuse"="residential"]["residential"="mobile_home"]({bbox_str});
-  relation["landuse"="residential"]["residential"="mobile_home"]({bbox_str});
-  
-  // Trailer parks
-  node["landuse"="residential"]["residential"="trailer_park"]({bbox_str});
-  way["landuse"="residential"]["residential"="trailer_park"]({bbox_str});
-  relation["landuse"="residential"]["residential"="trailer_park"]({bbox_str});
-  
-  // Busca adicional por nome (pode conter "mobile home park", "rv park", etc)
-  node["name"~"mobile home|trailer park|rv park|rv resort",i]({bbox_str});
-  way["name"~"mobile home|trailer park|rv park|rv resort",i]({bbox_str});
-);
-out center;
-out meta;
-"""
-        return query.strip()
+        return _QUERY_TEMPLATE.replace('{bbox}', bbox_str)
 
 
 class OverpassAPI:
     """Cliente para Overpass API com rate limiting."""
     
+    _env_loaded = False
+    
     def __init__(self):
+        if not OverpassAPI._env_loaded:
+            from dotenv import load_dotenv
+            load_dotenv()
+            OverpassAPI._env_loaded = True
+        
         self.base_url = os.getenv(
             "OVERPASS_API_URL",
             "https://overpass-api.de/api/interpreter"
         )
         self.rate_limit_seconds = float(os.getenv("OVERPASS_RATE_LIMIT", "1"))
-        self.last_request_time = 0
+        self.last_request_time = float("-inf")
     
     def _respect_rate_limit(self):
         """Aplica rate limiting entre requisições."""
-        elapsed = time.time() - self.last_request_time
+        elapsed = time.monotonic() - self.last_request_time
         if elapsed < self.rate_limit_seconds:
             sleep_time = self.rate_limit_seconds - elapsed
             logger.debug(f"Rate limiting: aguardando {sleep_time:.2f}s")
@@ -109,20 +126,24 @@ class OverpassAPI:
         logger.debug(f"Query: {query[:200]}...")
         
         try:
-            response = requests.post(
+            with requests.post(
                 self.base_url,
                 data={'data': query},
                 timeout=timeout,
+                stream=True,
                 headers={
                     'User-Agent': 'MHP-BI-Research/1.0 (Legal Compliance)',
-                    'Accept': 'application/json'
+                    'Accept': 'application/json',
+                    'Accept-Encoding': 'gzip, deflate'
                 }
-            )
-            
-            self.last_request_time = time.time()
+            ) as response:
+                self.last_request_time = time.monotonic()
+                response.raise_for_status()
+                
+                # Download em blocos já descomprimidos pelo urllib3
+                content = b''.join(response.iter_content(chunk_size=65536))
             
-            response.raise_for_status()
-            data = response.json()
+            data = _json_loads(content)
             
             logger.info(f"Query executada com sucesso. Elementos retornados: {len(data.get('elements', []))}")
             
@@ -183,11 +204,25 @@ def fetch_osm_parks(state_config: StateConfig) -> List[ParkRawData]:
     parks_raw = []
     skipped = 0
     
-    for element_data in elements:
+    # Validar todos os elementos em uma única chamada ao pydantic-core;
+    # se algum for inválido, revalida individualmente para descartá-lo
+    try:
+        osm_elements = _OSM_ELEMENTS_ADAPTER.validate_python(elements)
+    except ValidationError as e:
+        logger.warning(
+            f"{e.error_count()} erros de validação no lote OSM - "
+            f"validando elementos individualmente"
+        )
+        osm_elements = []
+        for element_data in elements:
+            try:
+                osm_elements.append(OSMElement.model_validate(element_data))
+            except ValidationError as element_error:
+                logger.warning(f"Erro ao validar elemento OSM: {element_error}")
+                skipped += 1
+    
+    for osm_element in osm_elements:
         try:
-            # Validar elemento com Pydantic
-            osm_element = OSMElement(**element_data)
-            
             # Converter para ParkRawData
             park_raw = osm_element.to_park_raw()
             
@@ -215,23 +250,30 @@ def fetch_osm_parks(state_config: StateConfig) -> List[ParkRawData]:
     return parks_raw
 
 
+@functools.lru_cache(maxsize=4)
 def load_state_config(config_path: str = "config/indiana.yaml") -> StateConfig:
     """
     Carrega configuração do estado a partir do arquivo YAML.
     
+    O resultado é cacheado por caminho; use
+    ``load_state_config.cache_clear()`` após editar o arquivo.
+    
     Args:
         config_path: Caminho para o arquivo de configuração
         
     Returns:
         StateConfig validado
     """
+    import yaml
+    
     config_file = Path(config_path)
     
     if not config_file.exists():
         raise FileNotFoundError(f"Arquivo de configuração não encontrado: {config_path}")
     
     with open(config_file, 'r', encoding='utf-8') as f:
-        config_dict = yaml.safe_load(f)
+        # Parser em C (libyaml) quando disponível
+        config_dict = yaml.load(f, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
     
     return StateConfig(**config_dict)
 
@@ -262,10 +304,7 @@ def main():
     
     if parks:
         # Estatísticas por tipo
-        types_count = {}
-        for park in parks:
-            park_type = park.park_type or 'unknown'
-            types_count[park_type] = types_count.get(park_type, 0) + 1
+        types_count = Counter(park.park_type or 'unknown' for park in parks)
         
         logger.info("\nDistribuição por tipo:")
         for park_type, count in sorted(types_count.items()):
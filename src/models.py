@@ -3,14 +3,49 @@ Modelos Pydantic para validação e serialização de dados.
 """
 from datetime import datetime
 from typing import Optional, List, Dict, Any
-from decimal import Decimal
-from pydantic import BaseModel, Field, validator, ConfigDict
+from pydantic import BaseModel, Field, field_validator, ConfigDict, ValidationInfo
+
+
+# Mapeamento (tag, valor) do OSM -> park_type, na ordem de prioridade das chaves.
+# Valores comparados já normalizados (strip + minúsculas)
+_PARK_TYPE_TAG_KEYS = ('tourism', 'residential')
+_PARK_TYPE_MAP = {
+    ('tourism', 'camp_site'): 'campground',
+    ('tourism', 'caravan_site'): 'rv_park',
+    ('residential', 'mobile_home'): 'mobile_home_park',
+    ('residential', 'mobile_home_park'): 'mobile_home_park',
+    ('residential', 'trailer_park'): 'trailer_park',
+}
+
+# Sem valor exato no mapa: trecho contido no valor da tag -> park_type
+# (ex: residential=Mobile Homes, residential=trailer_court)
+_PARK_TYPE_SUBSTRINGS = {
+    'residential': (('mobile', 'mobile_home_park'), ('trailer', 'trailer_park')),
+}
+
+
+def _park_type_from_tags(tags: Dict[str, Any]) -> Optional[str]:
+    """park_type pelas tags do OSM (tourism tem prioridade sobre residential)."""
+    for key in _PARK_TYPE_TAG_KEYS:
+        value = str(tags.get(key) or '').strip().lower()
+        if not value:
+            continue
+        
+        park_type = _PARK_TYPE_MAP.get((key, value))
+        if park_type:
+            return park_type
+        
+        for substring, fallback_type in _PARK_TYPE_SUBSTRINGS.get(key, ()):
+            if substring in value:
+                return fallback_type
+    
+    return None
 
 
 class ParkRawData(BaseModel):
     """Modelo para dados brutos de parques (parks_raw table)."""
     
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra='ignore')
     
     # Identificação
     external_id: Optional[str] = None
@@ -28,8 +63,8 @@ class ParkRawData(BaseModel):
     county: Optional[str] = None
     
     # Coordenadas
-    latitude: Optional[Decimal] = None
-    longitude: Optional[Decimal] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
     
     # Contato
     phone: Optional[str] = None
@@ -38,7 +73,7 @@ class ParkRawData(BaseModel):
     
     # Informações operacionais
     business_status: Optional[str] = None
-    rating: Optional[Decimal] = None
+    rating: Optional[float] = None
     total_reviews: Optional[int] = None
     
     # Metadados
@@ -49,15 +84,15 @@ class ParkRawData(BaseModel):
     fetched_at: datetime = Field(default_factory=datetime.now)
     is_processed: bool = False
     
-    @validator('latitude')
-    def validate_latitude(cls, v):
-        if v is not None and not (-90 <= float(v) <= 90):
-            raise ValueError('Latitude deve estar entre -90 e 90')
-        return v
-    
-    @validator('longitude')
-    def validate_longitude(cls, v):
-        if v is not None and not (-180 <= float(v) <= 180):
+    @field_validator('latitude', 'longitude', mode='after')
+    @classmethod
+    def validate_coordinate(cls, v: Optional[float], info: ValidationInfo) -> Optional[float]:
+        if v is None:
+            return v
+        if info.field_name == 'latitude':
+            if not (-90 <= v <= 90):
+                raise ValueError('Latitude deve estar entre -90 e 90')
+        elif not (-180 <= v <= 180):
             raise ValueError('Longitude deve estar entre -180 e 180')
         return v
 
@@ -65,7 +100,7 @@ class ParkRawData(BaseModel):
 class OSMElement(BaseModel):
     """Modelo para elementos do OpenStreetMap."""
     
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra='ignore')
     
     type: str  # node, way, relation
     id: int
@@ -80,19 +115,13 @@ class OSMElement(BaseModel):
         """Converte OSM element para ParkRawData."""
         
         # Determinar coordenadas
-        lat = self.lat if self.lat else (self.center.get('lat') if self.center else None)
-        lon = self.lon if self.lon else (self.center.get('lon') if self.center else None)
+        # "is not None" para não descartar coordenadas 0.0
+        center = self.center or {}
+        lat = self.lat if self.lat is not None else center.get('lat')
+        lon = self.lon if self.lon is not None else center.get('lon')
         
-        # Determinar tipo de parque baseado nas tags
-        park_type = None
-        if self.tags.get('tourism') == 'camp_site':
-            park_type = 'campground'
-        elif self.tags.get('tourism') == 'caravan_site':
-            park_type = 'rv_park'
-        elif 'mobile' in self.tags.get('residential', '').lower():
-            park_type = 'mobile_home_park'
-        elif 'trailer' in self.tags.get('residential', '').lower():
-            park_type = 'trailer_park'
+        # Determinar tipo de parque baseado nas tags (tourism tem prioridade)
+        park_type = _park_type_from_tags(self.tags)
         
         return ParkRawData(
             external_id=f"osm_{self.type}_{self.id}",
@@ -103,8 +132,8 @@ class OSMElement(BaseModel):
             city=self.tags.get('addr:city'),
             state=self.tags.get('addr:state', 'IN'),
             zip_code=self.tags.get('addr:postcode'),
-            latitude=Decimal(str(lat)) if lat else None,
-            longitude=Decimal(str(lon)) if lon else None,
+            latitude=lat,
+            longitude=lon,
             phone=self.tags.get('phone') or self.tags.get('contact:phone'),
             website=self.tags.get('website') or self.tags.get('contact:website'),
             raw_data={
@@ -189,9 +218,20 @@ class GooglePlaceDetails(BaseModel):
                 return component.get('long_name') or component.get('short_name')
         return None
     
+    def address_component_index(self) -> Dict[str, Optional[str]]:
+        """Indexa os componentes do endereço por tipo (primeira ocorrência vence)."""
+        index: Dict[str, Optional[str]] = {}
+        for component in self.address_components:
+            value = component.get('long_name') or component.get('short_name')
+            for component_type in component.get('types', []):
+                index.setdefault(component_type, value)
+        return index
+    
     def to_park_raw(self) -> ParkRawData:
         """Converte Google Place Details para ParkRawData."""
         
+        components = self.address_component_index()
+        
         # Determinar tipo de parque baseado em types
         park_type = None
         types_lower = [t.lower() for t in self.types]
@@ -208,16 +248,16 @@ class GooglePlaceDetails(BaseModel):
             name=self.name,
             park_type=park_type,
             address=self.formatted_address,
-            city=self.extract_address_component('locality'),
-            state=self.extract_address_component('administrative_area_level_1'),
-            zip_code=self.extract_address_component('postal_code'),
-            county=self.extract_address_component('administrative_area_level_2'),
-            latitude=Decimal(str(self.geometry['location']['lat'])),
-            longitude=Decimal(str(self.geometry['location']['lng'])),
+            city=components.get('locality'),
+            state=components.get('administrative_area_level_1'),
+            zip_code=components.get('postal_code'),
+            county=components.get('administrative_area_level_2'),
+            latitude=self.geometry['location']['lat'],
+            longitude=self.geometry['location']['lng'],
             phone=self.formatted_phone_number,
             website=self.website,
             business_status=self.business_status,
-            rating=Decimal(str(self.rating)) if self.rating else None,
+            rating=self.rating,
             total_reviews=self.user_ratings_total,
             raw_data={
                 'place_id': self.place_id,
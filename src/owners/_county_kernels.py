@@ -0,0 +1,52 @@
+"""
+Kernels numéricos do CountyMapper
+=================================
+
+Classificação em lote de coordenadas pelo raster de condados, compilada
+com Numba quando disponível (opcional: pip install numba).
+
+Códigos devolvidos por classify_batch:
+- >= 0: índice do condado (célula interna do raster)
+- -1: célula de divisa - precisa de refinamento com os polígonos
+- -2: fora do bbox de Indiana
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+NEEDS_REFINE = -1
+OUTSIDE = -2
+
+
+def _classify_batch(lats, lons, raster, min_lat, max_lat, min_lon, max_lon):
+    size = raster.shape[0]
+    lat_scale = size / (max_lat - min_lat)
+    lon_scale = size / (max_lon - min_lon)
+    out = np.empty(len(lats), np.int16)
+
+    for i in prange(len(lats)):
+        lat = lats[i]
+        lon = lons[i]
+
+        if not (min_lat <= lat <= max_lat and min_lon <= lon <= max_lon):
+            out[i] = OUTSIDE
+            continue
+
+        row = min(int((lat - min_lat) * lat_scale), size - 1)
+        col = min(int((lon - min_lon) * lon_scale), size - 1)
+        value = raster[row, col]
+        out[i] = value - 1 if value > 0 else NEEDS_REFINE
+
+    return out
+
+
+if NUMBA_AVAILABLE:
+    classify_batch = njit(cache=True, parallel=True)(_classify_batch)
+else:
+    classify_batch = None
@@ -41,14 +41,36 @@ Author: BellaTerra Intelligence Team
 Date: December 2025
 """
 
+import asyncio
+import functools
+import json
+import random
+import re
+import sys
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, Optional, List
-from dataclasses import dataclass
+from collections import OrderedDict
+from typing import Any, ClassVar, Dict, Hashable, Optional, List, Tuple
+from dataclasses import dataclass, fields
 from datetime import datetime
+from email.utils import parsedate_to_datetime
 from enum import Enum
 
 from loguru import logger
 
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+try:
+    import h2  # noqa: F401 - habilita HTTP/2 no httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 
 class PropertyClassCode(Enum):
     """
@@ -65,7 +87,48 @@ class PropertyClassCode(Enum):
     UNKNOWN = "999"      # Não classificado
 
 
-@dataclass
+# Classes de propriedade tratadas como comerciais
+_COMMERCIAL_CLASSES = frozenset({
+    PropertyClassCode.COMMERCIAL.value,
+    PropertyClassCode.INDUSTRIAL.value,
+})
+
+# CEP americano sem hífen: 12345 ou 123456789
+_ZIP_RE = re.compile(r'\d{5}(?:\d{4})?')
+
+# Separadores comuns de co-proprietários (" & ", " AND ", " + ")
+_OWNER_SEPARATOR = re.compile(r'\s+(?:&|AND|\+)\s+', re.IGNORECASE)
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[int]:
+    """
+    Interpreta o header Retry-After (segundos ou data HTTP).
+    
+    Returns:
+        Segundos a aguardar, ou None se ausente/inválido
+    """
+    if not value:
+        return None
+    
+    value = value.strip()
+    if value.isdigit():
+        return int(value)
+    
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    
+    return max(0, int(retry_at.timestamp() - time.time()))
+
+
+@functools.lru_cache(maxsize=256)
+def _isoformat(value: datetime) -> str:
+    """isoformat() cacheado: registros de um mesmo lote compartilham o timestamp."""
+    return value.isoformat()
+
+
+@dataclass(slots=True)
 class OwnerRecord:
     """
     Registro padronizado de proprietário retornado pelos fetchers.
@@ -110,8 +173,18 @@ class OwnerRecord:
         if self.fetched_at is None:
             self.fetched_at = datetime.now()
         
+        # Campos de baixa cardinalidade: compartilhar um único objeto str
+        if self.mailing_state:
+            self.mailing_state = sys.intern(self.mailing_state)
+        if self.mailing_country:
+            self.mailing_country = sys.intern(self.mailing_country)
+        if self.property_class_code:
+            self.property_class_code = sys.intern(self.property_class_code)
+        if self.source:
+            self.source = sys.intern(self.source)
+        
         # Detectar se é propriedade comercial
-        if self.property_class_code in ["300", "400"]:
+        if self.property_class_code in _COMMERCIAL_CLASSES:
             self.is_commercial_property = True
         
         # Validar endereço para mala direta
@@ -127,58 +200,87 @@ class OwnerRecord:
         - Cidade não vazia
         - CEP não vazio (formato: 12345 ou 12345-6789)
         """
-        has_name = bool(self.owner_name_1 and self.owner_name_1.strip())
-        has_address = bool(self.mailing_address_line1 and self.mailing_address_line1.strip())
-        has_city = bool(self.mailing_city and self.mailing_city.strip())
-        has_zip = bool(self.mailing_zip and self.mailing_zip.strip())
+        # "não vazio e não só espaços" sem criar cópias com strip()
+        has_name = bool(self.owner_name_1 and not self.owner_name_1.isspace())
+        has_address = bool(self.mailing_address_line1 and not self.mailing_address_line1.isspace())
+        has_city = bool(self.mailing_city and not self.mailing_city.isspace())
         
         # Validar formato do ZIP
-        valid_zip = False
-        if has_zip:
-            zip_clean = self.mailing_zip.replace("-", "").strip()
-            valid_zip = len(zip_clean) in [5, 9] and zip_clean.isdigit()
+        valid_zip = bool(
+            self.mailing_zip and _ZIP_RE.fullmatch(self.mailing_zip.replace("-", "").strip())
+        )
         
         self.is_valid_mailing_address = (
-            has_name and has_address and has_city and has_zip and valid_zip
+            has_name and has_address and has_city and valid_zip
         )
         
         # Marcar para revisão manual se endereço incompleto
         if not self.is_valid_mailing_address:
             self.needs_manual_review = True
+            reasons = []
             if not has_name:
-                self.notes += "Nome ausente. "
+                reasons.append("Nome ausente.")
             if not has_address:
-                self.notes += "Endereço ausente. "
+                reasons.append("Endereço ausente.")
             if not has_city:
-                self.notes += "Cidade ausente. "
+                reasons.append("Cidade ausente.")
             if not valid_zip:
-                self.notes += "CEP inválido. "
+                reasons.append("CEP inválido.")
+            
+            if reasons:
+                self.notes = (self.notes + " " if self.notes else "") + " ".join(reasons)
     
     def to_dict(self) -> Dict:
         """Converte para dicionário (útil para inserção no banco)."""
-        return {
-            'owner_name_1': self.owner_name_1,
-            'owner_name_2': self.owner_name_2,
-            'mailing_address_line1': self.mailing_address_line1,
-            'mailing_address_line2': self.mailing_address_line2,
-            'mailing_city': self.mailing_city,
-            'mailing_state': self.mailing_state,
-            'mailing_zip': self.mailing_zip,
-            'mailing_country': self.mailing_country,
-            'parcel_id': self.parcel_id,
-            'property_address': self.property_address,
-            'property_class_code': self.property_class_code,
-            'assessed_value': self.assessed_value,
-            'tax_year': self.tax_year,
+        data = {name: getattr(self, name) for name in _OWNER_RECORD_FIELDS}
+        data['fetched_at'] = _isoformat(self.fetched_at) if self.fetched_at else None
+        data['notes'] = self.notes.strip()
+        return data
+    
+    def to_tuple(self) -> tuple:
+        """Valores na ordem de _OWNER_RECORD_FIELDS (para executemany sem dicts)."""
+        return tuple(getattr(self, name) for name in _OWNER_RECORD_FIELDS)
+    
+    def to_db_row(self) -> tuple:
+        """
+        Linha da tabela owners, na ordem de _OWNER_DB_COLUMNS.
+        
+        Usada tanto no INSERT multi-linha quanto no COPY do orquestrador:
+        uma tupla por registro, sem dict intermediário.
+        """
+        mailing_address = {
+            'line1': self.mailing_address_line1,
+            'line2': self.mailing_address_line2,
+            'city': self.mailing_city,
+            'state': self.mailing_state,
+            'zip': self.mailing_zip,
+            'country': self.mailing_country
+        }
+        
+        metadata = {
             'source': self.source,
             'source_url': self.source_url,
-            'fetched_at': self.fetched_at.isoformat() if self.fetched_at else None,
+            'fetched_at': _isoformat(self.fetched_at),
             'confidence_score': self.confidence_score,
-            'is_valid_mailing_address': self.is_valid_mailing_address,
-            'is_commercial_property': self.is_commercial_property,
-            'needs_manual_review': self.needs_manual_review,
-            'notes': self.notes.strip()
+            'parcel_id': self.parcel_id,
+            'property_class_code': self.property_class_code,
+            'notes': self.notes
         }
+        
+        return (
+            self.owner_name_1,
+            # json.dumps: aspas ("O'Brien") e None (null) serializados corretamente
+            json.dumps(mailing_address, default=str),
+            json.dumps(metadata, default=str),
+            self.is_valid_mailing_address
+        )
+
+
+# Ordem fixa dos campos de OwnerRecord (chaves de to_dict / posições de to_tuple)
+_OWNER_RECORD_FIELDS = tuple(f.name for f in fields(OwnerRecord))
+
+# Colunas de owners preenchidas por OwnerRecord.to_db_row (mesma ordem)
+_OWNER_DB_COLUMNS = ('full_name', 'mailing_address', 'metadata', 'mail_eligible')
 
 
 class FetchResult:
@@ -193,12 +295,15 @@ class FetchResult:
         success: bool,
         records: List[OwnerRecord] = None,
         error_message: str = "",
-        retry_after_seconds: Optional[int] = None
+        retry_after_seconds: Optional[int] = None,
+        transport_error: bool = False
     ):
         self.success = success
         self.records = records or []
         self.error_message = error_message
         self.retry_after_seconds = retry_after_seconds  # Para rate limiting
+        # Timeout, erro de conexão ou 5xx: o site não respondeu (circuit breaker)
+        self.transport_error = transport_error
     
     @property
     def found_owner(self) -> bool:
@@ -211,6 +316,129 @@ class FetchResult:
         return len(self.records) > 1
 
 
+class LookupCache:
+    """
+    Cache LRU com TTL para resultados de busca (thread-safe).
+    
+    Dados de County Assessor mudam raramente, então um TTL de horas/dias é
+    seguro; o LRU limita a memória em execuções longas.
+    """
+    
+    def __init__(self, maxsize: int = 10_000, ttl_seconds: float = 86400):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Retorna o valor em cache, ou None se ausente/expirado."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            
+            expires_at, value = entry
+            if time.monotonic() >= expires_at:
+                del self._data[key]
+                return None
+            
+            self._data.move_to_end(key)
+            return value
+    
+    def set(self, key: Hashable, value: Any):
+        """Armazena um valor, descartando o menos usado se o cache estiver cheio."""
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def _county_key(county_name: str) -> str:
+    """Normaliza nome de condado para o registro ("Marion County" -> "marion")."""
+    key = county_name.strip().lower()
+    if key.endswith(' county'):
+        key = key[:-len(' county')]
+    return key
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker (Closed → Open → Half-Open) para um condado.
+    
+    Após `failure_threshold` falhas consecutivas o circuito abre e as
+    chamadas são recusadas imediatamente por `recovery_timeout` segundos.
+    Depois disso, uma única chamada de teste (half-open) é liberada: se
+    tiver sucesso o circuito fecha, se falhar volta a abrir.
+    """
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 60.0):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+    
+    @property
+    def state(self) -> str:
+        """Estado atual do circuito."""
+        if self.opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self.opened_at >= self.recovery_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+    
+    def retry_after(self) -> int:
+        """Segundos restantes até o circuito aceitar uma chamada de teste."""
+        if self.opened_at is None:
+            return 0
+        remaining = self.recovery_timeout - (time.monotonic() - self.opened_at)
+        return max(1, int(remaining + 0.999))
+    
+    def allow_request(self) -> bool:
+        """
+        Retorna True se a chamada pode prosseguir.
+        
+        Em half-open, apenas uma chamada de teste é liberada por vez.
+        """
+        with self._lock:
+            state = self.state
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+    
+    def record_success(self):
+        """Registra sucesso: fecha o circuito."""
+        with self._lock:
+            self.consecutive_failures = 0
+            self.opened_at = None
+            self._probe_in_flight = False
+    
+    def record_failure(self):
+        """Registra falha: abre o circuito ao atingir o limite (ou se a chamada de teste falhou)."""
+        with self._lock:
+            self.consecutive_failures += 1
+            if self._probe_in_flight or self.consecutive_failures >= self.failure_threshold:
+                if self.opened_at is None or self._probe_in_flight:
+                    logger.warning(
+                        f"🔌 Circuit breaker aberto após {self.consecutive_failures} falhas "
+                        f"(nova tentativa em {self.recovery_timeout:.0f}s)"
+                    )
+                self.opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+
 class CountyAssessorFetcher(ABC):
     """
     Classe abstrata base para todos os fetchers de County Assessor.
@@ -219,11 +447,61 @@ class CountyAssessorFetcher(ABC):
     
     Exemplo de implementação:
         class MarionCountyBeaconFetcher(CountyAssessorFetcher):
+            COUNTY = "Marion"  # registra o fetcher para o condado
+            
             def lookup_owner(self, address, lat, lon):
                 # Implementação específica para Marion County (Beacon)
                 ...
+    
+    Subclasses que definem COUNTY são registradas automaticamente e podem
+    ser obtidas com CountyAssessorFetcher.for_county("Marion County").
     """
     
+    # Condado atendido pela subclasse (None = fetcher genérico, sem registro)
+    COUNTY: ClassVar[Optional[str]] = None
+    
+    # Registro condado normalizado -> subclasse
+    _registry: ClassVar[Dict[str, type]] = {}
+    
+    # Limite global de buscas assíncronas simultâneas (todos os condados).
+    # Com o limite atingido e a fila cheia, novas buscas são recusadas na
+    # hora (backpressure) em vez de ficarem presas aguardando.
+    max_concurrency: ClassVar[int] = 50
+    max_queue_depth: ClassVar[int] = 100
+    _global_semaphore: ClassVar[Optional[asyncio.Semaphore]] = None
+    _global_semaphore_loop: ClassVar[Optional[asyncio.AbstractEventLoop]] = None
+    _queued: ClassVar[int] = 0
+    
+    # Cliente HTTP assíncrono compartilhado por todos os fetchers: reutiliza
+    # conexões keep-alive (e HTTP/2 quando disponível) entre condados que
+    # usam o mesmo domínio, como os ~40 condados Beacon
+    _shared_client: ClassVar[Optional["httpx.AsyncClient"]] = None
+    _shared_client_loop: ClassVar[Optional[asyncio.AbstractEventLoop]] = None
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        county = cls.__dict__.get('COUNTY')
+        if county:
+            CountyAssessorFetcher._registry[_county_key(county)] = cls
+    
+    @classmethod
+    def registered_class(cls, county_name: str) -> Optional[type]:
+        """Subclasse registrada para o condado, ou None."""
+        return CountyAssessorFetcher._registry.get(_county_key(county_name))
+    
+    @classmethod
+    def for_county(cls, county_name: str) -> "CountyAssessorFetcher":
+        """
+        Instancia o fetcher registrado para o condado.
+        
+        Raises:
+            KeyError: Se nenhuma subclasse registrou o condado
+        """
+        fetcher_cls = cls.registered_class(county_name)
+        if fetcher_cls is None:
+            raise KeyError(f"Nenhum fetcher registrado para {county_name}")
+        return fetcher_cls(county_name)
+    
     def __init__(self, county_name: str, system_type: str):
         """
         Inicializa o fetcher.
@@ -234,13 +512,30 @@ class CountyAssessorFetcher(ABC):
         """
         self.county_name = county_name
         self.system_type = system_type
-        self.base_url = self._get_base_url()
         
         # Estatísticas de uso
         self.total_requests = 0
         self.successful_requests = 0
         self.failed_requests = 0
         self.rate_limited_count = 0
+        self._stats_lock = threading.Lock()
+        
+        # Rate limiter do fetcher (definido pelas subclasses)
+        self.rate_limiter: Optional[RateLimiter] = None
+        
+        # Circuit breaker: para de chamar o site do condado se ele cair
+        self._breaker = CircuitBreaker()
+        
+        # Cache de buscas bem-sucedidas (mesmo parque/parcela não gasta rate limit)
+        self._cache = LookupCache(maxsize=10_000, ttl_seconds=86400)
+        
+        # Buscas assíncronas em andamento (duplicatas aguardam a primeira)
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+    
+    @functools.cached_property
+    def base_url(self) -> str:
+        """URL base do sistema do condado (calculada no primeiro acesso)."""
+        return self._get_base_url()
     
     @abstractmethod
     def _get_base_url(self) -> str:
@@ -293,6 +588,242 @@ class CountyAssessorFetcher(ABC):
         """
         pass
     
+    def fetch_owner(
+        self,
+        address: str,
+        lat: float,
+        lon: float,
+        parcel_id: Optional[str] = None
+    ) -> FetchResult:
+        """
+        Ponto de entrada recomendado: lookup_owner com cache e circuit breaker.
+        
+        Resultados bem-sucedidos ficam em cache por parcel_id normalizado
+        (ou endereço + coordenadas), então buscas repetidas não vão à rede.
+        """
+        key = self._cache_key(address, lat, lon, parcel_id)
+        return self._cached(key, self._call_guarded, self.lookup_owner, address, lat, lon, parcel_id)
+    
+    def fetch_by_parcel_id(self, parcel_id: str) -> FetchResult:
+        """search_by_parcel_id com cache e circuit breaker."""
+        key = ('parcel', self.normalize_parcel_id(parcel_id))
+        return self._cached(key, self._call_guarded, self.search_by_parcel_id, parcel_id)
+    
+    def _cache_key(
+        self,
+        address: str,
+        lat: Optional[float],
+        lon: Optional[float],
+        parcel_id: Optional[str] = None
+    ) -> Tuple:
+        """Chave de cache: parcel_id normalizado, ou endereço + coordenadas (~1m)."""
+        if parcel_id:
+            return ('parcel', self.normalize_parcel_id(parcel_id))
+        return (
+            'address',
+            ' '.join((address or '').upper().split()),
+            round(float(lat), 5) if lat is not None else None,
+            round(float(lon), 5) if lon is not None else None,
+        )
+    
+    def _cached(self, key: Hashable, fn, *args, **kwargs) -> FetchResult:
+        """Retorna o resultado em cache para `key` ou executa `fn` e cacheia se sucesso."""
+        cached = self._cache.get(key)
+        if cached is not None:
+            logger.debug("✅ Cache hit ({}): {}", self.county_name, key)
+            return cached
+        
+        result = fn(*args, **kwargs)
+        
+        # Só sucessos: falhas podem ser transitórias (rede, rate limit)
+        if result.success:
+            self._cache.set(key, result)
+        
+        return result
+    
+    async def lookup_owner_async(
+        self,
+        address: str,
+        lat: float,
+        lon: float,
+        parcel_id: Optional[str] = None
+    ) -> FetchResult:
+        """
+        Versão assíncrona de lookup_owner.
+        
+        A implementação padrão executa lookup_owner em uma thread, permitindo
+        que buscas de vários condados se sobreponham no event loop. Subclasses
+        com cliente HTTP assíncrono sobrescrevem _lookup_owner_io.
+        
+        Buscas concorrentes pela mesma chave são colapsadas: apenas a primeira
+        vai à rede e as demais aguardam o mesmo resultado (que também alimenta
+        o cache via fetch_owner).
+        """
+        key = self._cache_key(address, lat, lon, parcel_id)
+        
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+        
+        semaphore = self._get_global_semaphore()
+        if semaphore.locked() and CountyAssessorFetcher._queued >= self.max_queue_depth:
+            self.rate_limited_count += 1
+            logger.warning(f"⛔ Capacidade esgotada - busca recusada ({self.county_name})")
+            return FetchResult(
+                success=False,
+                error_message="max_concurrency",
+                retry_after_seconds=1
+            )
+        
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            CountyAssessorFetcher._queued += 1
+            try:
+                await semaphore.acquire()
+            finally:
+                CountyAssessorFetcher._queued -= 1
+            
+            try:
+                result = await self._fetch_owner_async(address, lat, lon, parcel_id)
+            finally:
+                semaphore.release()
+            
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Marca a exceção como consumida se ninguém mais aguardava
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+    
+    async def _fetch_owner_async(
+        self,
+        address: str,
+        lat: float,
+        lon: float,
+        parcel_id: Optional[str] = None
+    ) -> FetchResult:
+        """Equivalente assíncrono de fetch_owner (cache + circuit breaker)."""
+        key = self._cache_key(address, lat, lon, parcel_id)
+        cached = self._cache.get(key)
+        if cached is not None:
+            logger.debug("✅ Cache hit ({}): {}", self.county_name, key)
+            return cached
+        
+        if not self._breaker.allow_request():
+            return self._circuit_open_result()
+        
+        try:
+            result = await self._lookup_owner_io(address, lat, lon, parcel_id)
+        except Exception:
+            self._breaker.record_failure()
+            raise
+        
+        self._record_breaker_outcome(result)
+        if result.success:
+            self._cache.set(key, result)
+        
+        return result
+    
+    async def _lookup_owner_io(
+        self,
+        address: str,
+        lat: float,
+        lon: float,
+        parcel_id: Optional[str] = None
+    ) -> FetchResult:
+        """
+        Busca assíncrona sem cache/breaker.
+        
+        Padrão: lookup_owner numa thread. Subclasses com cliente HTTP
+        assíncrono (get_async_client) sobrescrevem para não ocupar threads.
+        """
+        return await asyncio.to_thread(self.lookup_owner, address, lat, lon, parcel_id)
+    
+    @classmethod
+    def _get_global_semaphore(cls) -> asyncio.Semaphore:
+        """Semáforo global do event loop atual (recriado se o loop mudar)."""
+        loop = asyncio.get_running_loop()
+        base = CountyAssessorFetcher
+        if base._global_semaphore is None or base._global_semaphore_loop is not loop:
+            base._global_semaphore = asyncio.Semaphore(cls.max_concurrency)
+            base._global_semaphore_loop = loop
+            base._queued = 0
+        return base._global_semaphore
+    
+    @classmethod
+    def get_async_client(cls) -> "httpx.AsyncClient":
+        """
+        Retorna o httpx.AsyncClient compartilhado (criado no primeiro uso).
+        
+        Subclasses assíncronas devem usar `await self.get_async_client().get(url)`
+        em vez de abrir conexões próprias. Feche com `await CountyAssessorFetcher.aclose()`.
+        """
+        if not HTTPX_AVAILABLE:
+            raise RuntimeError("httpx não instalado. Instale com: pip install 'httpx[http2]'")
+        
+        loop = asyncio.get_running_loop()
+        base = CountyAssessorFetcher
+        if (base._shared_client is None or base._shared_client.is_closed
+                or base._shared_client_loop is not loop):
+            limits = httpx.Limits(max_connections=50, max_keepalive_connections=20)
+            base._shared_client = httpx.AsyncClient(
+                transport=httpx.AsyncHTTPTransport(
+                    http2=HTTP2_AVAILABLE,
+                    limits=limits,
+                    retries=2  # Reconexão automática em connection reset
+                ),
+                timeout=httpx.Timeout(15.0, connect=5.0),
+                headers={'User-Agent': get_random_user_agent()},
+                follow_redirects=True
+            )
+            base._shared_client_loop = loop
+        
+        return base._shared_client
+    
+    @classmethod
+    async def aclose(cls):
+        """Fecha o cliente HTTP compartilhado (chamar no shutdown)."""
+        base = CountyAssessorFetcher
+        if base._shared_client is not None:
+            await base._shared_client.aclose()
+            base._shared_client = None
+            base._shared_client_loop = None
+    
+    async def lookup_many(
+        self,
+        properties: List[Dict],
+        concurrency: int = 5
+    ) -> List[FetchResult]:
+        """
+        Busca proprietários de várias propriedades concorrentemente.
+        
+        Args:
+            properties: Dicts com 'address', 'lat', 'lon' e opcionalmente 'parcel_id'
+            concurrency: Máximo de buscas simultâneas
+        
+        Returns:
+            Lista de FetchResult na mesma ordem de `properties`
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def _lookup(prop: Dict) -> FetchResult:
+            async with semaphore:
+                return await self.lookup_owner_async(
+                    prop.get('address', ''),
+                    prop.get('lat'),
+                    prop.get('lon'),
+                    prop.get('parcel_id')
+                )
+        
+        return await asyncio.gather(*(_lookup(prop) for prop in properties))
+    
     def get_statistics(self) -> Dict:
         """Retorna estatísticas de uso do fetcher."""
         success_rate = (
@@ -310,15 +841,111 @@ class CountyAssessorFetcher(ABC):
             'success_rate': f"{success_rate:.1f}%"
         }
     
-    def _increment_stats(self, success: bool, rate_limited: bool = False):
-        """Incrementa estatísticas de uso."""
-        self.total_requests += 1
+    def _increment_stats(
+        self,
+        success: bool,
+        rate_limited: bool = False,
+        transport_error: bool = False
+    ):
+        """
+        Incrementa estatísticas de uso.
+        
+        Alimenta também o circuit breaker: sucessos fecham o circuito e
+        falhas de transporte (timeout, conexão, 5xx) contam para abri-lo.
+        Outras falhas ("não encontrado") não indicam site fora do ar.
+        """
+        with self._stats_lock:
+            self.total_requests += 1
+            if success:
+                self.successful_requests += 1
+            else:
+                self.failed_requests += 1
+            if rate_limited:
+                self.rate_limited_count += 1
+        
         if success:
-            self.successful_requests += 1
+            self._breaker.record_success()
+        elif transport_error:
+            self._breaker.record_failure()
+    
+    def _http_error_result(self, error: Exception) -> FetchResult:
+        """
+        Converte o erro de uma requisição (requests ou httpx) em FetchResult.
+        
+        Não dorme nem repete: quem repete é o orquestrador (tenacity, com
+        backoff exponencial + jitter ou o Retry-After devolvido aqui).
+        
+        - Timeout / conexão / resposta ilegível / HTTP 5xx: transport_error
+          (recuperável, conta para o circuit breaker)
+        - HTTP 429: rate limit, com retry_after_seconds do header Retry-After
+        - Demais HTTP 4xx: não recuperável
+        """
+        response = getattr(error, 'response', None)
+        status = response.status_code if response is not None else None
+        
+        if status is None or status >= 500:
+            self._increment_stats(success=False, transport_error=True)
+            return FetchResult(
+                success=False,
+                error_message=f"Erro de transporte: {error}",
+                transport_error=True
+            )
+        
+        if status == 429:
+            self._increment_stats(success=False, rate_limited=True)
+            return FetchResult(
+                success=False,
+                error_message="Rate limit (HTTP 429)",
+                retry_after_seconds=_parse_retry_after(response.headers.get('Retry-After'))
+            )
+        
+        self._increment_stats(success=False)
+        return FetchResult(
+            success=False,
+            error_message=f"Erro HTTP {status} (não recuperável): {error}"
+        )
+    
+    def _call_guarded(self, fn, *args, **kwargs) -> FetchResult:
+        """
+        Executa uma chamada ao site do condado protegida pelo circuit breaker.
+        
+        Com o circuito aberto retorna FetchResult(error_message="circuit_open")
+        imediatamente, sem gastar rate limit nem aguardar timeouts.
+        """
+        if not self._breaker.allow_request():
+            return self._circuit_open_result()
+        
+        try:
+            result = fn(*args, **kwargs)
+        except Exception:
+            self._breaker.record_failure()
+            raise
+        
+        self._record_breaker_outcome(result)
+        return result
+    
+    def _circuit_open_result(self) -> FetchResult:
+        """Resultado imediato enquanto o circuit breaker está aberto."""
+        return FetchResult(
+            success=False,
+            error_message="circuit_open",
+            retry_after_seconds=self._breaker.retry_after()
+        )
+    
+    def _record_breaker_outcome(self, result: FetchResult):
+        """
+        Alimenta o circuit breaker com o resultado de uma chamada.
+        
+        Rate limiting conta como falha; qualquer outra resposta (inclusive
+        "não encontrado") mostra que o site está respondendo. Falhas de
+        transporte já foram registradas em _increment_stats.
+        """
+        if result.transport_error:
+            return
+        if result.retry_after_seconds:
+            self._breaker.record_failure()
         else:
-            self.failed_requests += 1
-        if rate_limited:
-            self.rate_limited_count += 1
+            self._breaker.record_success()
     
     # ========================================================================
     # MÉTODOS AUXILIARES COMPARTILHADOS
@@ -354,17 +981,8 @@ class CountyAssessorFetcher(ABC):
         Returns:
             Tupla (owner_name_1, owner_name_2)
         """
-        raw_name = raw_name.strip()
-        
-        # Separadores comuns de co-proprietários
-        separators = [' & ', ' AND ', ' + ']
-        
-        for sep in separators:
-            if sep in raw_name.upper():
-                parts = raw_name.upper().split(sep, 1)
-                return (parts[0].strip(), parts[1].strip() if len(parts) > 1 else None)
-        
-        return (raw_name, None)
+        parts = _OWNER_SEPARATOR.split(raw_name.strip(), 1)
+        return (parts[0].strip(), parts[1].strip() if len(parts) == 2 else None)
     
     @staticmethod
     def calculate_confidence_score(record: OwnerRecord) -> float:
@@ -417,6 +1035,10 @@ class RateLimiter:
     
     ⚠️ CRÍTICO para evitar bloqueios!
     
+    Usa token bucket: a taxa média é `requests_per_minute`, mas capacidade
+    não usada (ex: request anterior demorou) acumula até `capacity` tokens,
+    permitindo pequenos bursts sem exceder a média.
+    
     Uso:
         limiter = RateLimiter(requests_per_minute=10)
         
@@ -425,14 +1047,48 @@ class RateLimiter:
             result = fetcher.lookup_owner(...)
     """
     
-    def __init__(self, requests_per_minute: int = 10):
+    def __init__(self, requests_per_minute: float = 10, capacity: Optional[int] = None):
         """
         Args:
-            requests_per_minute: Máximo de requests por minuto
+            requests_per_minute: Máximo de requests por minuto (taxa média)
+            capacity: Tamanho máximo do burst (padrão: janela de 10s)
         """
         self.requests_per_minute = requests_per_minute
-        self.min_delay_seconds = 60.0 / requests_per_minute
-        self.last_request_time = None
+        self.rate = requests_per_minute / 60.0  # tokens por segundo
+        self.capacity = capacity or max(1, requests_per_minute // 6)
+        self.tokens = float(self.capacity)
+        self.last_refill = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def take(self, n: int = 1) -> float:
+        """
+        Reserva `n` tokens e retorna quantos segundos aguardar antes de usá-los.
+        
+        Os tokens são debitados imediatamente (o saldo pode ficar negativo),
+        então chamadas concorrentes recebem esperas sucessivas em vez de
+        competir. Serve tanto para time.sleep quanto para asyncio.sleep.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+            self.last_refill = now
+            
+            self.tokens -= n
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+    
+    def drain(self):
+        """
+        Zera o saldo de tokens (ex: servidor respondeu 429).
+        
+        Reservas já feitas (saldo negativo) são mantidas; a partir daqui os
+        tokens só voltam no ritmo normal da taxa.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(0.0, self.tokens + (now - self.last_refill) * self.rate)
+            self.last_refill = now
     
     def wait(self):
         """
@@ -440,22 +1096,140 @@ class RateLimiter:
         
         Deve ser chamado ANTES de cada request.
         """
-        import time
+        sleep_time = self.take()
+        if sleep_time > 0:
+            logger.debug("⏳ Rate limiting: aguardando {:.2f}s", sleep_time)
+            time.sleep(sleep_time)
+
+
+class AsyncRateLimiter(RateLimiter):
+    """
+    Versão assíncrona do RateLimiter para uso com asyncio.
+    
+    Mesmo token bucket, mas aguarda com asyncio.sleep, sem bloquear o
+    event loop.
+    
+    Uso:
+        limiter = AsyncRateLimiter(requests_per_minute=10)
+        
+        async def fetch(park):
+            await limiter.wait()
+            ...
+    """
+    
+    async def wait(self):
+        """
+        Aguarda o tempo necessário para respeitar o rate limit.
         
-        if self.last_request_time is not None:
-            elapsed = time.time() - self.last_request_time
-            if elapsed < self.min_delay_seconds:
-                sleep_time = self.min_delay_seconds - elapsed
-                logger.debug(f"⏳ Rate limiting: aguardando {sleep_time:.2f}s")
-                time.sleep(sleep_time)
+        Deve ser chamado ANTES de cada request.
+        """
+        sleep_time = self.take()
+        if sleep_time > 0:
+            logger.debug("⏳ Rate limiting: aguardando {:.2f}s", sleep_time)
+            await asyncio.sleep(sleep_time)
+
+
+class AdaptiveRateLimiter(AsyncRateLimiter):
+    """
+    AsyncRateLimiter que ajusta a taxa pela latência observada (estilo AutoThrottle).
+    
+    Mantém uma média móvel exponencial (EWMA) da latência das respostas e, a
+    cada `window` requests, recalcula a taxa alvo como
+    target_concurrency / latência. Reduções são aplicadas na hora; aumentos
+    são lineares (no máximo `min_rate` por janela) e só em janelas sem 429.
+    Um 429 corta a taxa pela metade, no máximo uma vez por `cooldown`
+    segundos (vários 429 da mesma rajada contam como um).
+    """
+    
+    def __init__(
+        self,
+        requests_per_minute: float = 10,
+        capacity: Optional[int] = None,
+        min_requests_per_minute: Optional[float] = None,
+        max_requests_per_minute: Optional[float] = None,
+        target_concurrency: float = 1.0,
+        window: int = 20,
+        cooldown: float = 30.0
+    ):
+        """
+        Args:
+            requests_per_minute: Taxa inicial
+            capacity: Tamanho máximo do burst
+            min_requests_per_minute: Piso da taxa (padrão: 1/4 da inicial)
+            max_requests_per_minute: Teto da taxa (padrão: 2x a inicial)
+            target_concurrency: Requests "em voo" desejados no servidor
+            window: Requests entre reajustes da taxa
+            cooldown: Segundos mínimos entre dois cortes por 429
+        """
+        super().__init__(requests_per_minute, capacity)
+        self.min_rate = (min_requests_per_minute or max(1.0, requests_per_minute / 4)) / 60.0
+        self.max_rate = (max_requests_per_minute or requests_per_minute * 2) / 60.0
+        self.target_concurrency = target_concurrency
+        self.window = window
+        self.cooldown = cooldown
+        self.ewma_latency: Optional[float] = None
+        self._samples = 0
+        self._rate_limited_in_window = False
+        self._last_cut = float('-inf')
+    
+    def _set_rate(self, rate: float):
+        self.rate = min(self.max_rate, max(self.min_rate, rate))
+        self.requests_per_minute = self.rate * 60.0
+    
+    def record_latency(self, seconds: float):
+        """Registra a latência de uma resposta e reajusta a taxa a cada janela."""
+        with self._lock:
+            if self.ewma_latency is None:
+                self.ewma_latency = seconds
+            else:
+                self.ewma_latency = 0.9 * self.ewma_latency + 0.1 * seconds
+            
+            self._samples += 1
+            if self._samples % self.window:
+                return
+            
+            target_rate = self.target_concurrency / max(self.ewma_latency, 1e-3)
+            if target_rate < self.rate:
+                self._set_rate(target_rate)
+            elif not self._rate_limited_in_window:
+                self._set_rate(min(target_rate, self.rate + self.min_rate))
+            self._rate_limited_in_window = False
         
-        self.last_request_time = time.time()
+        logger.debug(
+            "AutoThrottle: latência média {:.2f}s → {:.1f} req/min",
+            self.ewma_latency, self.requests_per_minute
+        )
+    
+    def on_rate_limited(self):
+        """Servidor respondeu 429: corta a taxa pela metade (uma vez por cooldown)."""
+        with self._lock:
+            self._rate_limited_in_window = True
+            now = time.monotonic()
+            if now - self._last_cut < self.cooldown:
+                return
+            self._last_cut = now
+            self._set_rate(self.rate / 2)
+        logger.warning("AutoThrottle: rate limited → {:.1f} req/min", self.requests_per_minute)
 
 
 # ============================================================================
 # USER AGENT ROTATION
 # ============================================================================
 
+_USER_AGENTS: Tuple[str, ...] = (
+    # Chrome on Windows
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    # Firefox on Windows
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0',
+    # Chrome on Mac
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    # Safari on Mac
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.1 Safari/605.1.15',
+    # Edge on Windows
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36 Edg/120.0.0.0',
+)
+
+
 def get_random_user_agent() -> str:
     """
     Retorna um User-Agent aleatório para evitar detecção de bots.
@@ -465,22 +1239,7 @@ def get_random_user_agent() -> str:
     Returns:
         String de User-Agent
     """
-    import random
-    
-    user_agents = [
-        # Chrome on Windows
-        'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-        # Firefox on Windows
-        'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0',
-        # Chrome on Mac
-        'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-        # Safari on Mac
-        'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.1 Safari/605.1.15',
-        # Edge on Windows
-        'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36 Edg/120.0.0.0'
-    ]
-    
-    return random.choice(user_agents)
+    return random.choice(_USER_AGENTS)
 
 
 # ============================================================================
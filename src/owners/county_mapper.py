@@ -19,15 +19,197 @@ Author: BellaTerra Intelligence Team
 Date: December 2025
 """
 
+import asyncio
+import contextvars
 import json
 import os
+import pickle
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Tuple, Dict
+from types import MappingProxyType
+from typing import Optional, Tuple, Dict, List, Mapping
 from functools import lru_cache
 
-from shapely.geometry import Point, shape
+import numpy as np
+import shapely
+from shapely.geometry import shape
+from shapely.strtree import STRtree
 from loguru import logger
 
+from src.owners._county_kernels import NEEDS_REFINE, classify_batch
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+
+# Bounding box de Indiana: (min_lat, max_lat, min_lon, max_lon)
+_IN_BBOX = (37.7713, 41.7606, -88.0997, -84.7844)
+# Mesmo bbox em micrograus (int32) para o filtro vetorizado em lote
+_IN_BBOX_MICRO = (37771300, 41760600, -88099700, -84784400)
+
+# Nominatim público (reverse geocoding de fallback)
+_NOMINATIM_URL = "https://nominatim.openstreetmap.org"
+
+# Lado da grade do raster de condados sobre o bbox de Indiana
+# (256 x 256 células ≈ 1.5 km; 64 KB com uint8)
+_RASTER_SIZE = 256
+
+# Tamanho mínimo de lote para ordenar os pontos pela curva de Hilbert
+_HILBERT_SORT_MIN_POINTS = 10_000
+_HILBERT_ORDER = 16
+
+# Cache em disco das respostas do Nominatim (chave: célula da grade)
+_GEOCODE_CACHE_PATH = Path.home() / ".cache" / "bellaterra" / "county_geocode.db"
+
+# Resolução da grade usada como chave do cache de identify_county:
+# 1/10000 de grau ≈ 11 m de latitude
+_CACHE_GRID_PER_DEGREE = 10_000
+
+# Versão do formato do cache em disco do índice de condados
+_INDEX_CACHE_VERSION = 3
+
+# Campos comuns de nome de condado em GeoJSON, em ordem de preferência
+_NAME_KEYS = ('NAME', 'name', 'COUNTY', 'NAMELSAD')
+
+
+# Mapeamento de condados para sistemas (amostra dos principais)
+# TODO: Completar com todos os 92 condados
+_COUNTY_SYSTEMS = MappingProxyType({
+    'Marion County': MappingProxyType({
+        'assessor_system': 'Beacon/Schneider Corp',
+        'assessor_url': 'https://beacon.schneidercorp.com/Application.aspx?AppID=231&LayerID=3267&PageTypeID=2&PageID=1574',
+        'has_online_records': True,
+        'population': 977203,  # Maior condado (Indianapolis)
+        'notes': 'Sistema Beacon - requer cuidado com rate limiting'
+    }),
+    'Lake County': MappingProxyType({
+        'assessor_system': 'Beacon/Schneider Corp',
+        'assessor_url': 'https://beacon.schneidercorp.com/Application.aspx?AppID=1018&LayerID=21002&PageTypeID=2&PageID=9480',
+        'has_online_records': True,
+        'population': 485493,
+        'notes': 'Segundo maior condado - sistema Beacon'
+    }),
+    'Allen County': MappingProxyType({
+        'assessor_system': 'Custom GIS',
+        'assessor_url': 'https://maps.acgov.org/Html5Viewer/?viewer=public',
+        'has_online_records': True,
+        'population': 385410,
+        'notes': 'Sistema GIS próprio - Fort Wayne'
+    }),
+    'Hamilton County': MappingProxyType({
+        'assessor_system': 'Beacon/Schneider Corp',
+        'assessor_url': 'https://beacon.schneidercorp.com/Application.aspx?AppID=163&LayerID=2403&PageTypeID=2&PageID=1231',
+        'has_online_records': True,
+        'population': 347467,
+        'notes': 'Condado rico (subúrbio de Indy) - dados completos'
+    }),
+    'St. Joseph County': MappingProxyType({
+        'assessor_system': 'Beacon/Schneider Corp',
+        'assessor_url': 'https://beacon.schneidercorp.com/Application.aspx?AppID=1008&LayerID=20748&PageTypeID=2&PageID=9392',
+        'has_online_records': True,
+        'population': 272912,
+        'notes': 'South Bend - sistema Beacon'
+    }),
+    # Condados menores com sistemas diferentes
+    'Brown County': MappingProxyType({
+        'assessor_system': 'Vanguard Appraisals',
+        'assessor_url': 'http://www.vanguardappraisals.com/brown/',
+        'has_online_records': True,
+        'population': 15092,
+        'notes': 'Condado rural - sistema Vanguard'
+    }),
+    'Orange County': MappingProxyType({
+        'assessor_system': 'Manual/Phone',
+        'assessor_url': None,
+        'has_online_records': False,
+        'population': 19867,
+        'notes': 'Sem sistema online - requer contato telefônico'
+    })
+})
+
+
+def _grid_cell(lat: float, lon: float) -> int:
+    """Célula (~10 m) da grade de cache como um único inteiro de 64 bits."""
+    grid = _CACHE_GRID_PER_DEGREE
+    return (round((lat + 90) * grid) << 32) | round((lon + 180) * grid)
+
+
+def _polygon_from_rings(rings: List) -> shapely.Polygon:
+    """Polígono direto dos anéis GeoJSON (casca + buracos) via arrays float64."""
+    shell = np.asarray(rings[0], dtype=np.float64)
+    holes = [shapely.linearrings(np.asarray(r, dtype=np.float64)) for r in rings[1:]]
+    return shapely.polygons(shell, holes=holes or None)
+
+
+def _geometry_from_geojson(geometry: Dict):
+    """
+    Constrói a geometria do condado a partir do dicionário GeoJSON.
+    
+    Polygon/MultiPolygon (o caso de limites de condados) vão direto das
+    coordenadas para o GEOS com os construtores vetorizados do Shapely 2,
+    sem o despacho genérico de shape(); outros tipos caem em shape().
+    """
+    geometry_type = geometry['type']
+    if geometry_type == 'Polygon':
+        return _polygon_from_rings(geometry['coordinates'])
+    if geometry_type == 'MultiPolygon':
+        return shapely.multipolygons([_polygon_from_rings(p) for p in geometry['coordinates']])
+    return shape(geometry)
+
+
+def _raster_cells(lats: np.ndarray, lons: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(linhas, colunas) das células do raster de condados para um lote."""
+    min_lat, max_lat, min_lon, max_lon = _IN_BBOX
+    last = _RASTER_SIZE - 1
+    rows = np.clip(((lats - min_lat) / (max_lat - min_lat) * _RASTER_SIZE).astype(np.intp), 0, last)
+    cols = np.clip(((lons - min_lon) / (max_lon - min_lon) * _RASTER_SIZE).astype(np.intp), 0, last)
+    return rows, cols
+
+
+def _hilbert_index(lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """
+    Posição de cada ponto na curva de Hilbert sobre o bbox de Indiana.
+    
+    Versão vetorizada do algoritmo clássico xy2d numa grade 2^16 x 2^16.
+    """
+    n = 1 << _HILBERT_ORDER
+    min_lat, max_lat, min_lon, max_lon = _IN_BBOX
+    x = ((lons - min_lon) / (max_lon - min_lon) * (n - 1)).astype(np.int64)
+    y = ((lats - min_lat) / (max_lat - min_lat) * (n - 1)).astype(np.int64)
+    x = np.clip(x, 0, n - 1)
+    y = np.clip(y, 0, n - 1)
+    
+    d = np.zeros(len(x), dtype=np.int64)
+    s = n >> 1
+    while s > 0:
+        rx = (x & s) > 0
+        ry = (y & s) > 0
+        d += s * s * ((3 * rx) ^ ry)
+        
+        # Rotacionar o quadrante
+        flip = ~ry & rx
+        x = np.where(flip, n - 1 - x, x)
+        y = np.where(flip, n - 1 - y, y)
+        x, y = np.where(ry, x, y), np.where(ry, y, x)
+        s >>= 1
+    
+    return d
+
+
+def _extract_county_name(props: Dict) -> Optional[str]:
+    """Resolve o nome padronizado do condado (ex: "Marion County") das propriedades."""
+    for key in _NAME_KEYS:
+        name = props.get(key)
+        if name:
+            return name if name.endswith('County') else f"{name} County"
+    return None
+
 
 class CountyMapper:
     """
@@ -37,13 +219,24 @@ class CountyMapper:
     Implementa cache para otimizar consultas repetidas.
     """
     
-    def __init__(self, geojson_path: Optional[str] = None):
+    def __init__(
+        self,
+        geojson_path: Optional[str] = None,
+        nominatim_url: str = _NOMINATIM_URL,
+        nominatim_rps: float = 1.0,
+        geocode_cache_path: Optional[str] = None
+    ):
         """
         Inicializa o mapeador de condados.
         
         Args:
             geojson_path: Caminho para arquivo GeoJSON com limites de condados.
                          Se None, usa o arquivo padrão em data/geo/indiana_counties.geojson
+            nominatim_url: URL do Nominatim usado no fallback de reverse geocoding
+            nominatim_rps: Limite de requisições/segundo ao Nominatim (1.0 no
+                           serviço público; instâncias próprias aceitam mais)
+            geocode_cache_path: Banco SQLite com respostas já geocodificadas.
+                                Se None, usa ~/.cache/bellaterra/county_geocode.db
         """
         if geojson_path is None:
             # Caminho padrão relativo ao projeto
@@ -51,7 +244,34 @@ class CountyMapper:
             geojson_path = project_root / "data" / "geo" / "indiana_counties.geojson"
         
         self.geojson_path = Path(geojson_path)
-        self.counties_data = None
+        self.counties_loaded = False
+        
+        self.nominatim_url = nominatim_url
+        self.nominatim_rps = nominatim_rps
+        self._nominatim_next_slot = 0.0
+        # Protege o próximo slot entre chamadas, loops e threads
+        self._nominatim_lock = threading.Lock()
+        
+        # Conexão aberta sob demanda no primeiro fallback
+        self.geocode_cache_path = Path(geocode_cache_path or _GEOCODE_CACHE_PATH)
+        self._geocode_conn = None
+        self._geocode_lock = threading.Lock()
+        
+        # Índice espacial (construído uma vez em _load_counties)
+        self._polys = []
+        self._names = []
+        self._names_array = np.empty(0, dtype=object)
+        self._polys_array = np.empty(0, dtype=object)
+        self._raster = None
+        self._tree = None
+        
+        # Cache por instância (morre junto com o mapper, ao contrário de
+        # @lru_cache no método, que prende `self` no cache da classe)
+        self._identify_cached = lru_cache(maxsize=10000)(self._identify_county_impl)
+        
+        # Bounding boxes em layout SoA (um array por coordenada)
+        self._minx = self._miny = self._maxx = self._maxy = np.empty(0)
+        
         self._load_counties()
     
     def _load_counties(self):
@@ -69,25 +289,198 @@ class CountyMapper:
                 "3. Salvar em data/geo/indiana_counties.geojson\n"
                 "Usando fallback com geopy..."
             )
-            self.counties_data = None
+            self.counties_loaded = False
             return
         
         try:
-            with open(self.geojson_path, 'r', encoding='utf-8') as f:
-                geojson = json.load(f)
-            
-            # Validar estrutura do GeoJSON
-            if 'features' not in geojson:
-                raise ValueError("GeoJSON inválido: campo 'features' não encontrado")
+            cached = self._read_index_cache()
+            if cached is not None:
+                names, polys, bounds = cached
+            else:
+                polys, names = self._parse_features()
+                bounds = shapely.bounds(polys)
+                self._write_index_cache(names, polys, bounds)
             
-            self.counties_data = geojson['features']
-            logger.info(f"✅ Carregados {len(self.counties_data)} condados de Indiana")
+            self._build_index(polys, names, bounds)
+            self.counties_loaded = True
+            logger.info(f"✅ Carregados {len(polys)} condados de Indiana")
             
         except Exception as e:
             logger.error(f"Erro ao carregar GeoJSON: {e}")
-            self.counties_data = None
+            self.counties_loaded = False
+    
+    def _parse_features(self) -> Tuple[List, List[str]]:
+        """
+        Constrói os polígonos e nomes dos condados a partir do GeoJSON.
+        
+        Toda a validação acontece aqui, uma vez por feature: geometrias
+        vazias ou sem nome são descartadas e inválidas são corrigidas, de
+        modo que o caminho de consulta não precisa de tratamento de erro.
+        
+        Returns:
+            Tupla (polígonos, nomes) em listas paralelas
+        """
+        polys = []
+        names = []
+        for feature in self._iter_features():
+            feature_id = feature.get('id', '?')
+            try:
+                polygon = _geometry_from_geojson(feature['geometry'])
+            except Exception as e:
+                logger.warning(f"Erro ao processar feature do condado {feature_id}: {e}")
+                continue
+            
+            if polygon.is_empty:
+                logger.warning(f"Feature do condado {feature_id} sem geometria - ignorada")
+                continue
+            
+            if not polygon.is_valid:
+                logger.warning(f"Geometria inválida no condado {feature_id} - corrigindo com make_valid")
+                polygon = shapely.make_valid(polygon)
+            
+            # Nome resolvido e padronizado uma única vez, no carregamento
+            name = _extract_county_name(feature.get('properties') or {})
+            if name is None:
+                logger.warning(f"Feature do condado {feature_id} sem campo de nome - ignorada")
+                continue
+            
+            polys.append(polygon)
+            names.append(name)
+        
+        if not polys:
+            raise ValueError("GeoJSON inválido: nenhuma feature de condado encontrada")
+        
+        return polys, names
+    
+    def _build_index(self, polys: List, names: List[str], bounds: np.ndarray):
+        """
+        Monta as estruturas de consulta a partir dos polígonos já construídos.
+        
+        Consultas individuais filtram pelos bounds SoA; consultas em lote
+        usam a R-tree (STRtree). Em ambos os casos o `contains` só roda
+        nos 1-2 candidatos.
+        """
+        self._polys = polys
+        self._names = names
+        # Mesmos nomes como array para o caminho em lote (identify_counties)
+        self._names_array = np.array(names, dtype=object)
+        # Polígonos preparados (in-place) indexam as arestas uma vez,
+        # tornando cada `contains_xy` sub-linear no número de vértices
+        self._polys_array = np.array(polys, dtype=object)
+        shapely.prepare(self._polys_array)
+        
+        bounds = np.asarray(bounds, dtype=np.float64).reshape(-1, 4)
+        self._minx, self._miny, self._maxx, self._maxy = bounds.T.copy()
+        
+        try:
+            self._tree = STRtree(polys)
+        except Exception as e:
+            logger.warning(f"STRtree indisponível ({e}) - consultas em lote serão feitas ponto a ponto")
+            self._tree = None
+        
+        self._raster = self._build_raster()
+    
+    def _build_raster(self) -> Optional[np.ndarray]:
+        """
+        Rasteriza os condados numa grade sobre o bbox de Indiana (~1.5 km).
+        
+        Cada célula guarda 1 + índice do condado que a contém por inteiro,
+        ou 0 se a célula cruza uma divisa (precisa de refinamento). A
+        maioria dos pontos cai em células internas e é resolvida com uma
+        leitura no array, sem GEOS.
+        """
+        if self._tree is None or len(self._polys) >= np.iinfo(np.uint8).max:
+            return None
+        
+        size = _RASTER_SIZE
+        min_lat, max_lat, min_lon, max_lon = _IN_BBOX
+        xs = np.linspace(min_lon, max_lon, size + 1)
+        ys = np.linspace(min_lat, max_lat, size + 1)
+        x0, y0 = np.meshgrid(xs[:-1], ys[:-1])
+        x1, y1 = np.meshgrid(xs[1:], ys[1:])
+        cells = shapely.box(x0.ravel(), y0.ravel(), x1.ravel(), y1.ravel())
+        
+        # Célula inteiramente dentro de um condado → valor direto
+        cell_idx, tree_idx = self._tree.query(cells, predicate='within')
+        
+        raster = np.zeros(size * size, dtype=np.uint8)
+        raster[cell_idx] = tree_idx + 1
+        return raster.reshape(size, size)
+    
+    @property
+    def _index_cache_path(self) -> Path:
+        """Cache do índice ao lado do GeoJSON (ex: indiana_counties.cache.pkl)."""
+        return self.geojson_path.with_suffix('.cache.pkl')
+    
+    def _read_index_cache(self) -> Optional[Tuple[List[str], List, np.ndarray]]:
+        """
+        Lê o índice serializado se ele for mais novo que o GeoJSON.
+        
+        Reidratar polígonos a partir de WKB evita reprocessar o GeoJSON e
+        reconstruir cada polígono a cada inicialização do processo.
+        
+        Returns:
+            Tupla (nomes, polígonos, bounds) ou None se o cache não for válido
+        """
+        cache_path = self._index_cache_path
+        try:
+            if cache_path.stat().st_mtime < self.geojson_path.stat().st_mtime:
+                return None
+            
+            with open(cache_path, 'rb') as f:
+                version, names, wkb_list, bounds = pickle.load(f)
+            
+            if version != _INDEX_CACHE_VERSION:
+                return None
+            
+            polys = list(shapely.from_wkb(wkb_list))
+            logger.debug(f"Índice de condados carregado do cache: {cache_path}")
+            return names, polys, bounds
+        
+        except FileNotFoundError:
+            return None
+        
+        except Exception as e:
+            logger.warning(f"Cache de condados inválido ({cache_path}): {e}")
+            return None
+    
+    def _write_index_cache(self, names: List[str], polys: List, bounds: np.ndarray):
+        """Serializa nomes, polígonos (WKB) e bounds para a próxima inicialização."""
+        cache_path = self._index_cache_path
+        try:
+            wkb_list = [shapely.to_wkb(p) for p in polys]
+            with open(cache_path, 'wb') as f:
+                pickle.dump(
+                    (_INDEX_CACHE_VERSION, names, wkb_list, bounds), f,
+                    protocol=pickle.HIGHEST_PROTOCOL
+                )
+        except Exception as e:
+            # Cache é só otimização - falhar aqui não impede o carregamento
+            logger.warning(f"Não foi possível salvar cache de condados ({cache_path}): {e}")
+    
+    def _iter_features(self):
+        """
+        Itera as features do GeoJSON uma a uma.
+        
+        Com ijson o arquivo é lido em streaming ('features.item'), então o
+        FeatureCollection inteiro nunca fica materializado em memória - só
+        os polígonos e bounds construídos a partir dele. Sem ijson, cai
+        para json.load.
+        """
+        if IJSON_AVAILABLE:
+            with open(self.geojson_path, 'rb') as f:
+                yield from ijson.items(f, 'features.item', use_float=True)
+            return
+        
+        with open(self.geojson_path, 'r', encoding='utf-8') as f:
+            geojson = json.load(f)
+        
+        # Validar estrutura do GeoJSON
+        if 'features' not in geojson:
+            raise ValueError("GeoJSON inválido: campo 'features' não encontrado")
+        
+        yield from geojson['features']
     
-    @lru_cache(maxsize=1000)
     def identify_county(self, lat: float, lon: float) -> Optional[str]:
         """
         Identifica o condado de Indiana baseado em coordenadas.
@@ -104,14 +497,98 @@ class CountyMapper:
             >>> mapper.identify_county(39.7684, -86.1581)  # Indianapolis
             'Marion County'
         """
+        # Quantizar numa grade de ~10 m: pontos vizinhos (ex: centróides de
+        # lotes do mesmo parque) caem na mesma entrada do cache
+        grid = _CACHE_GRID_PER_DEGREE
+        return self._identify_cached(round(lat * grid) / grid, round(lon * grid) / grid)
+    
+    async def aidentify_county(self, lat: float, lon: float) -> Optional[str]:
+        """
+        identify_county para código assíncrono: roda numa thread de trabalho,
+        sem bloquear o loop no point-in-polygon nem no fallback Nominatim.
+        """
+        return await asyncio.to_thread(self.identify_county, lat, lon)
+    
+    def _identify_county_impl(self, lat: float, lon: float) -> Optional[str]:
+        """Implementação sem cache de identify_county."""
         # Se GeoJSON disponível e coordenadas em Indiana, usa point-in-polygon
-        if self.counties_data is not None and self._is_in_indiana(lat, lon):
+        if self.counties_loaded and self._is_in_indiana(lat, lon):
             return self._identify_with_geojson(lat, lon)
         
         # Para todos os outros casos: usar geopy (funciona para qualquer estado)
         return self._identify_with_geopy(lat, lon)
     
-    def _is_in_indiana(self, lat: float, lon: float) -> bool:
+    def identify_counties(self, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+        """
+        Identifica condados para um lote de coordenadas de uma só vez.
+        
+        Faz uma única consulta vetorizada na STRtree (uma travessia
+        Python→GEOS para o lote inteiro) em vez de N chamadas a
+        identify_county. Pontos sem condado no GeoJSON ficam como None.
+        Sem GeoJSON/STRtree, cai para identify_county ponto a ponto.
+        
+        Args:
+            lats: Array de latitudes
+            lons: Array de longitudes
+        
+        Returns:
+            Array (dtype=object) com o nome do condado de cada ponto
+        """
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+        out = np.full(len(lats), None, dtype=object)
+        
+        if not self.counties_loaded or self._tree is None:
+            for i, (lat, lon) in enumerate(zip(lats.tolist(), lons.tolist())):
+                out[i] = self.identify_county(lat, lon)
+            return out
+        
+        if classify_batch is not None and self._raster is not None:
+            # Kernel JIT (Numba): bbox de Indiana + leitura do raster numa
+            # única passada paralela sobre o lote
+            codes = classify_batch(lats, lons, self._raster, *_IN_BBOX)
+            resolved = np.nonzero(codes >= 0)[0]
+            out[resolved] = self._names_array[codes[resolved]]
+            inside = np.nonzero(codes == NEEDS_REFINE)[0]
+        else:
+            # Descartar pontos fora de Indiana com comparações inteiras
+            # (micrograus) antes de tocar no GEOS
+            min_lat, max_lat, min_lon, max_lon = _IN_BBOX_MICRO
+            lat_u = (lats * 1e6).astype(np.int32)
+            lon_u = (lons * 1e6).astype(np.int32)
+            inside = np.nonzero(np.logical_and.reduce([
+                lat_u >= min_lat, lat_u <= max_lat,
+                lon_u >= min_lon, lon_u <= max_lon
+            ]))[0]
+            
+            if self._raster is not None and len(inside):
+                # Pontos em células internas do raster já estão resolvidos
+                rows, cols = _raster_cells(lats[inside], lons[inside])
+                values = self._raster[rows, cols]
+                resolved = values > 0
+                out[inside[resolved]] = self._names_array[values[resolved].astype(np.intp) - 1]
+                inside = inside[~resolved]
+        
+        # Lotes grandes: consultar em ordem de Hilbert para que pontos
+        # vizinhos visitem os mesmos nós da árvore em sequência. Como o
+        # resultado é espalhado via `inside`, não é preciso desfazer a ordem.
+        if len(inside) >= _HILBERT_SORT_MIN_POINTS:
+            inside = inside[np.argsort(_hilbert_index(lats[inside], lons[inside]))]
+        
+        # STRtree devolve pares (ponto, condado) cujos bboxes se cruzam;
+        # contains_xy refina todos os pares numa única chamada ao GEOS
+        lats, lons = lats[inside], lons[inside]
+        points = shapely.points(lons, lats)  # Shapely usa (lon, lat)
+        point_idx, tree_idx = self._tree.query(points)
+        hits = shapely.contains_xy(
+            self._polys_array[tree_idx], lons[point_idx], lats[point_idx]
+        )
+        out[inside[point_idx[hits]]] = self._names_array[tree_idx[hits]]
+        
+        return out
+    
+    @staticmethod
+    def _is_in_indiana(lat: float, lon: float, _b: Tuple[float, ...] = _IN_BBOX) -> bool:
         """
         Verifica se coordenadas estão aproximadamente dentro de Indiana.
         
@@ -120,104 +597,243 @@ class CountyMapper:
         - Sul: 37.7713° (fronteira com Kentucky)
         - Leste: -84.7844° (fronteira com Ohio)
         - Oeste: -88.0997° (fronteira com Illinois)
-        """
-        IN_BBOX = {
-            'min_lat': 37.7713,
-            'max_lat': 41.7606,
-            'min_lon': -88.0997,
-            'max_lon': -84.7844
-        }
         
-        return (IN_BBOX['min_lat'] <= lat <= IN_BBOX['max_lat'] and
-                IN_BBOX['min_lon'] <= lon <= IN_BBOX['max_lon'])
+        O bbox vem ligado como argumento padrão (lookup local em vez de
+        global); lotes não passam por aqui - identify_counties faz o mesmo
+        teste vetorizado.
+        """
+        return _b[0] <= lat <= _b[1] and _b[2] <= lon <= _b[3]
     
     def _identify_with_geojson(self, lat: float, lon: float) -> Optional[str]:
         """
         Identifica condado usando GeoJSON (método mais preciso).
         
-        Complexidade: O(n) onde n = 92 condados (aceitável)
+        Caminho rápido: leitura da célula no raster pré-computado. Nas
+        células de divisa, filtro por bounding box vetorizado sobre os arrays SoA (1-3
+        candidatos) + refinamento com shapely.contains_xy nos polígonos
+        preparados - sem alocar um Point por consulta.
         """
-        point = Point(lon, lat)  # Shapely usa (lon, lat)
+        if self._raster is not None:
+            min_lat, max_lat, min_lon, max_lon = _IN_BBOX
+            last = _RASTER_SIZE - 1
+            row = min(max(int((lat - min_lat) / (max_lat - min_lat) * _RASTER_SIZE), 0), last)
+            col = min(max(int((lon - min_lon) / (max_lon - min_lon) * _RASTER_SIZE), 0), last)
+            value = self._raster[row, col]
+            if value:
+                county_name = self._names[value - 1]
+                logger.debug(f"Condado identificado: {county_name} para ({lat}, {lon})")
+                return county_name
         
-        for feature in self.counties_data:
-            try:
-                # Criar polígono do condado
-                polygon = shape(feature['geometry'])
-                
-                # Verificar se ponto está dentro do polígono
-                if polygon.contains(point):
-                    # Extrair nome do condado das propriedades
-                    props = feature.get('properties', {})
-                    
-                    # Tentar diferentes campos comuns em GeoJSON de condados
-                    county_name = (
-                        props.get('NAME') or 
-                        props.get('name') or 
-                        props.get('COUNTY') or
-                        props.get('NAMELSAD')
-                    )
-                    
-                    if county_name:
-                        # Padronizar formato: "Marion County"
-                        if not county_name.endswith('County'):
-                            county_name = f"{county_name} County"
-                        
-                        logger.debug(f"Condado identificado: {county_name} para ({lat}, {lon})")
-                        return county_name
-            
-            except Exception as e:
-                logger.warning(f"Erro ao processar feature do condado: {e}")
-                continue
+        # Célula de divisa (ou sem raster): refinar com os polígonos
+        mask = (
+            (self._minx <= lon) & (lon <= self._maxx) &
+            (self._miny <= lat) & (lat <= self._maxy)
+        )
+        
+        for idx in np.nonzero(mask)[0]:
+            # Shapely usa (x=lon, y=lat)
+            if shapely.contains_xy(self._polys_array[idx], lon, lat):
+                county_name = self._names[idx]
+                logger.debug(f"Condado identificado: {county_name} para ({lat}, {lon})")
+                return county_name
         
         logger.warning(f"Nenhum condado encontrado para ({lat}, {lon})")
         return None
     
     def _identify_with_geopy(self, lat: float, lon: float) -> Optional[str]:
         """
-        Fallback: usa geopy para reverse geocoding (requer internet).
+        Fallback: reverse geocoding via Nominatim (requer internet).
         
         ⚠️ LIMITAÇÕES:
         - Requer conexão com internet
-        - Nominatim tem rate limit: 1 req/sec
+        - Nominatim público tem rate limit: 1 req/sec
         - Menos preciso que GeoJSON para limites exatos
         
-        Uso apenas quando GeoJSON não disponível.
+        Uso apenas quando GeoJSON não disponível. Para muitos pontos, use
+        _identify_with_geopy_batch diretamente (compartilha o limite de
+        taxa entre requisições concorrentes).
         """
         try:
-            from geopy.geocoders import Nominatim
-            from time import sleep
-            
-            # User agent obrigatório para Nominatim
-            geolocator = Nominatim(user_agent="bellaterra_mhp_intelligence/1.0")
+            batch = self._identify_with_geopy_batch([(lat, lon)])
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                return asyncio.run(batch)[0]
             
-            # Rate limiting para respeitar ToS do Nominatim
-            sleep(1.1)  # Garantir < 1 req/sec
+            # Chamado de dentro de um loop (ex.: orquestrador assíncrono):
+            # asyncio.run não pode aninhar, então roda o lote numa thread
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                return executor.submit(contextvars.copy_context().run, asyncio.run, batch).result()[0]
+        
+        except ImportError:
+            logger.error("aiohttp não instalado. Instale com: pip install aiohttp")
+            return None
+    
+    async def _identify_with_geopy_batch(
+        self,
+        coords: List[Tuple[float, float]],
+        base_url: Optional[str] = None,
+        rps: Optional[float] = None
+    ) -> List[Optional[str]]:
+        """
+        Reverse geocoding concorrente de vários pontos via Nominatim.
+        
+        As requisições são disparadas em paralelo, mas cada uma só sai
+        após reservar um slot no limitador de taxa da instância - o
+        orçamento de `rps` é compartilhado por todos os chamadores em vez
+        de cada ponto dormir 1.1s em série.
+        
+        Args:
+            coords: Lista de (lat, lon)
+            base_url: URL do Nominatim (padrão: self.nominatim_url). Use uma
+                      instância própria para liberar taxas maiores.
+            rps: Requisições por segundo (padrão: self.nominatim_rps)
+        
+        Returns:
+            Lista com o nome do condado (ou None) de cada coordenada
+        """
+        results: List[Optional[str]] = [None] * len(coords)
+        cells = [_grid_cell(lat, lon) for lat, lon in coords]
+        
+        # Só consultar o Nominatim para células ainda não geocodificadas
+        cached = self._geocode_cache_get(cells)
+        pending = []
+        for i, cell in enumerate(cells):
+            if cell in cached:
+                results[i] = cached[cell]
+            else:
+                pending.append(i)
+        
+        if not pending:
+            return results
+        
+        import aiohttp
+        
+        url = f"{(base_url or self.nominatim_url).rstrip('/')}/reverse"
+        interval = 1.0 / (rps or self.nominatim_rps)
+        async def wait_for_slot():
+            # Reserva sob o threading.Lock da instância (sem await dentro):
+            # o próximo slot livre vale entre chamadas, loops e threads
+            with self._nominatim_lock:
+                now = time.monotonic()
+                wait = self._nominatim_next_slot - now
+                self._nominatim_next_slot = max(now, self._nominatim_next_slot) + interval
+            if wait > 0:
+                await asyncio.sleep(wait)
+        
+        async def reverse(session, lat: float, lon: float) -> Optional[str]:
+            await wait_for_slot()
+            try:
+                params = {'format': 'jsonv2', 'lat': lat, 'lon': lon, 'zoom': 10}
+                async with session.get(url, params=params) as response:
+                    response.raise_for_status()
+                    data = await response.json()
+            except Exception as e:
+                logger.error(f"Erro no fallback Nominatim ({lat}, {lon}): {e}")
+                return None
             
-            location = geolocator.reverse(f"{lat}, {lon}", exactly_one=True, language='en')
+            county = (data.get('address') or {}).get('county')
+            if not county:
+                return None
             
-            if location and location.raw.get('address'):
-                address = location.raw['address']
-                county = address.get('county')
-                
-                if county:
-                    # Padronizar formato
-                    if not county.endswith('County'):
-                        county = f"{county} County"
-                    
-                    logger.info(f"Condado identificado via geopy: {county}")
-                    return county
+            # Padronizar formato
+            if not county.endswith('County'):
+                county = f"{county} County"
             
-            return None
+            logger.info(f"Condado identificado via Nominatim: {county}")
+            return county
         
-        except ImportError:
-            logger.error("geopy não instalado. Instale com: pip install geopy")
-            return None
+        headers = {
+            # User agent obrigatório para Nominatim
+            'User-Agent': "bellaterra_mhp_intelligence/1.0",
+            'Accept-Language': 'en'
+        }
+        timeout = aiohttp.ClientTimeout(total=30)
+        async with aiohttp.ClientSession(headers=headers, timeout=timeout) as session:
+            counties = await asyncio.gather(
+                *(reverse(session, *coords[i]) for i in pending)
+            )
         
-        except Exception as e:
-            logger.error(f"Erro no fallback geopy: {e}")
-            return None
+        found = {}
+        for i, county in zip(pending, counties):
+            results[i] = county
+            if county:
+                found[cells[i]] = county
+        self._geocode_cache_put(found)
+        
+        return results
+    
+    def _geocode_db(self) -> Optional[sqlite3.Connection]:
+        """Abre (uma vez) o cache SQLite do reverse geocoding."""
+        if self._geocode_conn is None:
+            try:
+                self.geocode_cache_path.parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(self.geocode_cache_path, check_same_thread=False)
+                # WAL: vários workers podem ler enquanto outro escreve
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS cache (cell INTEGER PRIMARY KEY, county TEXT)"
+                )
+                conn.commit()
+                self._geocode_conn = conn
+            except sqlite3.Error as e:
+                logger.warning(f"Cache de geocoding indisponível ({self.geocode_cache_path}): {e}")
+                self._geocode_conn = False
+        
+        return self._geocode_conn or None
+    
+    def _geocode_cache_get(self, cells: List[int]) -> Dict[int, str]:
+        """Busca no cache em disco os condados já conhecidos para as células."""
+        with self._geocode_lock:
+            conn = self._geocode_db()
+            if conn is None:
+                return {}
+            try:
+                unique = list(set(cells))
+                found = {}
+                # Respeitar o limite de parâmetros por query do SQLite
+                for i in range(0, len(unique), 500):
+                    chunk = unique[i:i + 500]
+                    placeholders = ','.join('?' * len(chunk))
+                    found.update(conn.execute(
+                        f"SELECT cell, county FROM cache WHERE cell IN ({placeholders})", chunk
+                    ))
+                return found
+            except sqlite3.Error as e:
+                logger.warning(f"Erro ao ler cache de geocoding: {e}")
+                return {}
+    
+    def _geocode_cache_put(self, entries: Dict[int, str]):
+        """Grava no cache em disco as respostas novas do Nominatim."""
+        if not entries:
+            return
+        
+        with self._geocode_lock:
+            conn = self._geocode_db()
+            if conn is None:
+                return
+            try:
+                with conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO cache (cell, county) VALUES (?, ?)",
+                        entries.items()
+                    )
+            except sqlite3.Error as e:
+                logger.warning(f"Erro ao gravar cache de geocoding: {e}")
     
-    def get_county_info(self, county_name: str) -> Dict[str, any]:
+    def county_geometries(self) -> List[Tuple[str, str]]:
+        """
+        Pares (nome, WKB em hex) dos condados carregados do GeoJSON.
+        
+        Usado por scripts/load_counties.py para popular a tabela counties
+        do PostGIS (join espacial do orchestrator).
+        """
+        if not self.counties_loaded:
+            return []
+        
+        return list(zip(self._names, shapely.to_wkb(self._polys, hex=True)))
+    
+    def get_county_info(self, county_name: str) -> Mapping[str, any]:
         """
         Retorna informações sobre um condado específico.
         
@@ -225,78 +841,28 @@ class CountyMapper:
             county_name: Nome do condado (ex: "Marion County")
         
         Returns:
-            Dicionário com informações do condado:
+            Mapeamento (somente leitura para condados conhecidos) com
+            informações do condado:
             - assessor_system: Sistema usado pelo County Assessor
             - assessor_url: URL do sistema de registros
             - has_online_records: Se tem registros públicos online
             - notes: Observações sobre o sistema
         """
-        # Mapeamento de condados para sistemas (amostra dos principais)
-        # TODO: Completar com todos os 92 condados
-        COUNTY_SYSTEMS = {
-            'Marion County': {
-                'assessor_system': 'Beacon/Schneider Corp',
-                'assessor_url': 'https://beacon.schneidercorp.com/Application.aspx?AppID=231&LayerID=3267&PageTypeID=2&PageID=1574',
-                'has_online_records': True,
-                'population': 977203,  # Maior condado (Indianapolis)
-                'notes': 'Sistema Beacon - requer cuidado com rate limiting'
-            },
-            'Lake County': {
-                'assessor_system': 'Beacon/Schneider Corp',
-                'assessor_url': 'https://beacon.schneidercorp.com/Application.aspx?AppID=1018&LayerID=21002&PageTypeID=2&PageID=9480',
-                'has_online_records': True,
-                'population': 485493,
-                'notes': 'Segundo maior condado - sistema Beacon'
-            },
-            'Allen County': {
-                'assessor_system': 'Custom GIS',
-                'assessor_url': 'https://maps.acgov.org/Html5Viewer/?viewer=public',
-                'has_online_records': True,
-                'population': 385410,
-                'notes': 'Sistema GIS próprio - Fort Wayne'
-            },
-            'Hamilton County': {
-                'assessor_system': 'Beacon/Schneider Corp',
-                'assessor_url': 'https://beacon.schneidercorp.com/Application.aspx?AppID=163&LayerID=2403&PageTypeID=2&PageID=1231',
-                'has_online_records': True,
-                'population': 347467,
-                'notes': 'Condado rico (subúrbio de Indy) - dados completos'
-            },
-            'St. Joseph County': {
-                'assessor_system': 'Beacon/Schneider Corp',
-                'assessor_url': 'https://beacon.schneidercorp.com/Application.aspx?AppID=1008&LayerID=20748&PageTypeID=2&PageID=9392',
-                'has_online_records': True,
-                'population': 272912,
-                'notes': 'South Bend - sistema Beacon'
-            },
-            # Condados menores com sistemas diferentes
-            'Brown County': {
-                'assessor_system': 'Vanguard Appraisals',
-                'assessor_url': 'http://www.vanguardappraisals.com/brown/',
-                'has_online_records': True,
-                'population': 15092,
-                'notes': 'Condado rural - sistema Vanguard'
-            },
-            'Orange County': {
-                'assessor_system': 'Manual/Phone',
-                'assessor_url': None,
-                'has_online_records': False,
-                'population': 19867,
-                'notes': 'Sem sistema online - requer contato telefônico'
-            }
-        }
-        
         # Normalizar nome do condado
         if not county_name.endswith('County'):
             county_name = f"{county_name} County"
         
         # Retornar info se disponível, senão genérico
-        return COUNTY_SYSTEMS.get(county_name, {
+        info = _COUNTY_SYSTEMS.get(county_name)
+        if info is not None:
+            return info
+        
+        return {
             'assessor_system': 'Unknown',
             'assessor_url': None,
             'has_online_records': None,
             'notes': f'Sistema para {county_name} não mapeado ainda'
-        })
+        }
     
     def get_statistics(self) -> Dict[str, any]:
         """
@@ -311,9 +877,9 @@ class CountyMapper:
             'counties_with_custom_gis': 25,
             'counties_with_vanguard': 15,
             'counties_manual_only': 12,
-            'geojson_loaded': self.counties_data is not None,
+            'geojson_loaded': self.counties_loaded,
             'geojson_path': str(self.geojson_path),
-            'cache_size': self.identify_county.cache_info().currsize if hasattr(self.identify_county, 'cache_info') else 0
+            'cache_size': self._identify_cached.cache_info().currsize
         }
 
 
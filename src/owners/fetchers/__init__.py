@@ -1,15 +1,21 @@
 """
 Fetchers for different county assessor systems.
-"""
 
-from src.owners.fetchers.generic_fetcher import (
-    GenericWebSearchFetcher,
-    MockFetcher,
-    get_fetcher_for_county
-)
+Re-exports are resolved lazily (PEP 562) so importing this package does not
+load generic_fetcher and its HTTP dependencies until a fetcher is used.
+"""
 
 __all__ = [
     'GenericWebSearchFetcher',
     'MockFetcher',
     'get_fetcher_for_county'
 ]
+
+
+def __getattr__(name):
+    if name in __all__:
+        from src.owners.fetchers import generic_fetcher
+        value = getattr(generic_fetcher, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -28,22 +28,225 @@ Author: BellaTerra Intelligence Team
 Date: December 2025
 """
 
+import asyncio
+import dataclasses
+import functools
+import hashlib
+import json
 import os
+import random
+import sqlite3
+import threading
 import time
-from typing import Optional, Dict, List
+from pathlib import Path
+from typing import ClassVar, Optional, Dict, List, NamedTuple, Tuple
 import re
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from loguru import logger
 
+try:
+    # google-re2: DFA de tempo linear, sem backtracking catastrófico nas
+    # classes gulosas [A-Z\s&,\.]+ (API compatível com `re`)
+    import re2 as _regex
+    RE2_AVAILABLE = True
+except ImportError:
+    _regex = re
+    RE2_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
 from src.owners.base_fetcher import (
+    HTTPX_AVAILABLE,
     CountyAssessorFetcher,
     FetchResult,
+    LookupCache,
     OwnerRecord,
     PropertyClassCode,
     RateLimiter
 )
 
+if HTTPX_AVAILABLE:
+    import httpx
+
+
+# Padrões de extração (compilados uma vez no import do módulo).
+# Os padrões de proprietário rodam case-sensitive sobre o texto já em
+# minúsculas (ver _ascii_lower): sem case folding no motor de regex, e no
+# re2 as classes não dobram de tamanho no DFA.
+_OWNER_PATTERNS = tuple(
+    _regex.compile(pattern) for pattern in (
+        rb'owner[:\s]+([a-z\s&,.]+)',
+        rb'taxpayer[:\s]+([a-z\s&,.]+)',
+        rb'property owner[:\s]+([a-z\s&,.]+)',
+        rb'mailing name[:\s]+([a-z\s&,.]+)',
+    )
+)
+
+# A-Z -> a-z em bytes (bytes.translate roda em C, sem tabela Unicode)
+_LOWER_TABLE = bytes.maketrans(bytes(range(65, 91)), bytes(range(97, 123)))
+
+# Pontuação trocada por espaço nos endereços usados em queries
+_QUERY_PUNCT_TABLE = str.maketrans({',': ' ', ';': ' ', '\n': ' ', '\r': ' '})
+
+# Âncoras que todo padrão de proprietário exige (em minúsculas); "Property
+# Owner" já está coberto por "owner"
+_OWNER_ANCHORS = (b'owner', b'taxpayer', b'mailing name')
+
+
+def _ascii_lower(text: str) -> bytes:
+    """
+    Minúsculas ASCII do texto, como bytes.
+    
+    'replace' troca cada caractere não-ASCII por um único '?', então os
+    offsets continuam iguais aos de `text` e um span casado em bytes pode
+    ser usado direto para fatiar o texto original (preservando a caixa).
+    """
+    return text.encode('ascii', 'replace').translate(_LOWER_TABLE)
+
+
+def _has_owner_anchor(needle: bytes) -> bool:
+    """
+    Pré-filtro barato: o texto contém alguma âncora dos padrões de dono?
+    
+    `in` sobre bytes usa a busca de substring em C do CPython (memchr +
+    two-way), então snippets sem nenhuma âncora são descartados numa
+    varredura linear, sem passar pelo motor de regex.
+    
+    Args:
+        needle: Texto já convertido por _ascii_lower
+    """
+    return any(anchor in needle for anchor in _OWNER_ANCHORS)
+
+
+# Formato: [Número] [Rua], [Cidade], [Estado] [ZIP]
+_ADDRESS_PATTERN = _regex.compile(
+    r'(\d+\s+[A-Za-z\s]+),\s*([A-Za-z\s]+),\s*([A-Z]{2})\s*(\d{5}(?:-\d{4})?)'
+)
+
+# Sufixos de rua (em minúsculas) usados como âncora do endereço: com
+# pyahocorasick o snippet é varrido uma vez e o regex só roda numa janela
+# ao redor de cada sufixo encontrado
+_STREET_SUFFIXES = (
+    'st', 'ave', 'rd', 'blvd', 'ln', 'dr', 'ct', 'way', 'pl', 'ter', 'hwy', 'pkwy'
+)
+_ADDRESS_WINDOW_BEFORE = 60  # número + nome da rua
+_ADDRESS_WINDOW_AFTER = 40   # ", Cidade, UF 12345-6789"
+
+if AHOCORASICK_AVAILABLE:
+    _SUFFIX_AC = ahocorasick.Automaton()
+    for _suffix in _STREET_SUFFIXES:
+        _SUFFIX_AC.add_word(_suffix, len(_suffix))
+    _SUFFIX_AC.make_automaton()
+else:
+    _SUFFIX_AC = None
+
+def _json_loads(content):
+    """Decodifica JSON direto dos bytes da resposta (orjson quando disponível)."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+class _SearchItem(NamedTuple):
+    """Resultado do Google já reduzido aos campos usados (acesso por atributo)."""
+    snippet: str
+    title: str
+    link: str
+
+
+def _parse_items(raw_items) -> List[_SearchItem]:
+    """Converte os itens JSON do Google em _SearchItem uma única vez."""
+    return [
+        _SearchItem(item.get('snippet', ''), item.get('title', ''), item.get('link', ''))
+        for item in raw_items
+    ]
+
+
+# Cache em disco das buscas do Google (sobrevive entre execuções)
+_SEARCH_CACHE_PATH = Path.home() / ".cache" / "bellaterra" / "google_search.db"
+_SEARCH_CACHE_TTL = 7 * 86400  # 7 dias
+
+
+class PersistentSearchCache:
+    """
+    Cache SQLite de resultados do Google Custom Search.
+    
+    Reexecuções do pipeline reaproveitam buscas já pagas em vez de gastar
+    quota de novo. Entradas expiram após `ttl_seconds`. Falhas de disco
+    só geram warning - o cache é apenas otimização.
+    """
+    
+    def __init__(self, path: Path = _SEARCH_CACHE_PATH, ttl_seconds: float = _SEARCH_CACHE_TTL):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self._conn = None
+        self._lock = threading.Lock()
+    
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """Abre (uma vez) o banco; retorna None se indisponível."""
+        if self._conn is None:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(self.path, check_same_thread=False)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS search_cache "
+                    "(key TEXT PRIMARY KEY, items TEXT NOT NULL, fetched_at REAL NOT NULL)"
+                )
+                conn.commit()
+                self._conn = conn
+            except sqlite3.Error as e:
+                logger.warning(f"Cache de buscas indisponível ({self.path}): {e}")
+                self._conn = False
+        
+        return self._conn or None
+    
+    def get(self, key: str) -> Optional[List[Dict]]:
+        """Retorna os itens cacheados (ou None se ausentes/expirados)."""
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return None
+            try:
+                row = conn.execute(
+                    "SELECT items, fetched_at FROM search_cache WHERE key = ?", (key,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.warning(f"Erro ao ler cache de buscas: {e}")
+                return None
+        
+        if row is None or time.time() - row[1] > self.ttl_seconds:
+            return None
+        return _json_loads(row[0])
+    
+    def set(self, key: str, items: List[Dict]):
+        """Grava (ou substitui) os itens de uma busca."""
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return
+            try:
+                with conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO search_cache (key, items, fetched_at) VALUES (?, ?, ?)",
+                        (key, json.dumps(items), time.time())
+                    )
+            except sqlite3.Error as e:
+                logger.warning(f"Erro ao gravar cache de buscas: {e}")
+
 
 class GenericWebSearchFetcher(CountyAssessorFetcher):
     """
@@ -57,17 +260,34 @@ class GenericWebSearchFetcher(CountyAssessorFetcher):
     Depois extrai informações dos resultados usando regex.
     """
     
+    # Sessão HTTP compartilhada por todas as instâncias (mesmo host):
+    # keep-alive evita um handshake TCP+TLS por busca
+    _session: ClassVar[Optional[requests.Session]] = None
+    _session_lock: ClassVar[threading.Lock] = threading.Lock()
+    
+    # Token buckets por API key: a quota do Custom Search é da chave, não do
+    # condado - todas as instâncias (uma por condado) dividem o mesmo bucket
+    _quota_limiters: ClassVar[Dict[str, RateLimiter]] = {}
+    _quota_lock: ClassVar[threading.Lock] = threading.Lock()
+    
     def __init__(
         self,
         county_name: str,
         google_api_key: Optional[str] = None,
-        search_engine_id: Optional[str] = None
+        search_engine_id: Optional[str] = None,
+        search_cache_path: Optional[str] = None,
+        queries_per_day: float = 100,
+        burst: int = 10
     ):
         """
         Args:
             county_name: Nome do condado
             google_api_key: API key do Google Custom Search (ou usa .env)
             search_engine_id: ID do Custom Search Engine (ou usa .env)
+            search_cache_path: Banco SQLite do cache de buscas. Se None, usa
+                               ~/.cache/bellaterra/google_search.db
+            queries_per_day: Quota diária do Custom Search (taxa média)
+            burst: Buscas permitidas em sequência antes de aplicar a taxa
         """
         super().__init__(county_name=county_name, system_type="Generic Web Search")
         
@@ -84,16 +304,59 @@ class GenericWebSearchFetcher(CountyAssessorFetcher):
                 "Para obter: https://developers.google.com/custom-search/v1/overview"
             )
         
-        # Rate limiter (100 queries/dia = ~4/hora para durar 24h)
-        self.rate_limiter = RateLimiter(requests_per_minute=4)
+        # Token bucket casando com a quota real do Google: bursts curtos
+        # de até `burst` buscas, reabastecido a 100/dia (~1 a cada 14 min).
+        # Só é consumido em cache miss, logo antes da requisição HTTP
+        self.rate_limiter = self._quota_limiter(self.api_key or '', queries_per_day, burst)
+        
+        # Templates de query especializados para este condado: só endereço e
+        # parcel ID variam por chamada (chaves escapadas para o str.format)
+        county = self.county_name.replace('{', '{{').replace('}', '}}')
+        self._query_with_parcel = f'"{{pid}}" "{{addr}}" {county} indiana owner'.format
+        self._query_plain = f'"{{addr}}" {county} county assessor indiana property owner'.format
         
-        # Cache de buscas (evitar queries duplicadas)
-        self._search_cache: Dict[str, List[Dict]] = {}
+        # Cache de buscas (evitar queries duplicadas): memória + disco
+        # (LRU limitado com TTL: workers longos não acumulam JSON sem fim)
+        self._search_cache = LookupCache(maxsize=10_000, ttl_seconds=_SEARCH_CACHE_TTL)
+        self._disk_cache = PersistentSearchCache(search_cache_path or _SEARCH_CACHE_PATH)
+    
+    @classmethod
+    def _quota_limiter(cls, api_key: str, queries_per_day: float, burst: int) -> RateLimiter:
+        """Bucket compartilhado da API key (criado pela primeira instância que a usa)."""
+        with cls._quota_lock:
+            limiter = cls._quota_limiters.get(api_key)
+            if limiter is None:
+                limiter = RateLimiter(requests_per_minute=queries_per_day / 1440, capacity=burst)
+                cls._quota_limiters[api_key] = limiter
+            return limiter
     
     def _get_base_url(self) -> str:
         """URL base da API do Google Custom Search."""
         return "https://www.googleapis.com/customsearch/v1"
     
+    @classmethod
+    def get_session(cls) -> requests.Session:
+        """Retorna a requests.Session com pool de conexões (criada no primeiro uso)."""
+        if cls._session is None:
+            with cls._session_lock:
+                if cls._session is None:
+                    session = requests.Session()
+                    session.mount('https://', HTTPAdapter(
+                        pool_connections=4,
+                        pool_maxsize=8,
+                        # Só falhas de conexão: 429/5xx sobem para
+                        # _http_error_result e o retry (com Retry-After)
+                        # fica com o orquestrador
+                        max_retries=Retry(
+                            total=3,
+                            backoff_factor=0.5,
+                            allowed_methods=['GET']
+                        )
+                    ))
+                    cls._session = session
+        
+        return cls._session
+    
     def lookup_owner(
         self,
         address: str,
@@ -118,15 +381,57 @@ class GenericWebSearchFetcher(CountyAssessorFetcher):
         
         logger.info(f"🔍 Buscando proprietário para: {address} ({self.county_name})")
         
-        # Respeitar rate limit
-        self.rate_limiter.wait()
-        
         # Construir query
         query = self._build_search_query(address, parcel_id)
         
         # Buscar (com cache)
-        search_results = self._search(query)
+        try:
+            search_results = self._search(query)
+        except Exception as e:
+            return self._http_error_result(e)
+        
+        return self._owner_result(search_results, address, lat, lon, parcel_id)
+    
+    async def _lookup_owner_io(
+        self,
+        address: str,
+        lat: float,
+        lon: float,
+        parcel_id: Optional[str] = None
+    ) -> FetchResult:
+        """
+        Versão assíncrona de lookup_owner (usada por lookup_owner_async).
+        
+        A busca vai pelo httpx.AsyncClient compartilhado (HTTP/2 quando
+        disponível), então lookup_many sobrepõe as buscas numa única
+        conexão em vez de bloquear uma thread por RTT. O rate limiter é o
+        mesmo token bucket do caminho síncrono (consumido só em cache miss).
+        """
+        if not self.api_key or not self.search_engine_id:
+            return FetchResult(
+                success=False,
+                error_message="Google Custom Search API não configurado"
+            )
         
+        logger.info(f"🔍 Buscando proprietário para: {address} ({self.county_name})")
+        
+        query = self._build_search_query(address, parcel_id)
+        try:
+            search_results = await self._search_async(query)
+        except Exception as e:
+            return self._http_error_result(e)
+        
+        return self._owner_result(search_results, address, lat, lon, parcel_id)
+    
+    def _owner_result(
+        self,
+        search_results: List[_SearchItem],
+        address: str,
+        lat: float,
+        lon: float,
+        parcel_id: Optional[str]
+    ) -> FetchResult:
+        """Parseia os resultados de uma busca por endereço e monta o FetchResult."""
         if not search_results:
             self._increment_stats(success=False)
             return FetchResult(
@@ -165,8 +470,10 @@ class GenericWebSearchFetcher(CountyAssessorFetcher):
         
         logger.info(f"🔍 Buscando por Parcel ID: {normalized_id}")
         
-        self.rate_limiter.wait()
-        search_results = self._search(query)
+        try:
+            search_results = self._search(query)
+        except Exception as e:
+            return self._http_error_result(e)
         
         if not search_results:
             self._increment_stats(success=False)
@@ -207,20 +514,21 @@ class GenericWebSearchFetcher(CountyAssessorFetcher):
         - Incluir "indiana" para localizar
         - Usar operador site: se conhecemos URL do condado
         """
-        # Limpar endereço (remover vírgulas, etc)
-        clean_address = address.replace(',', ' ').strip()
+        # Limpar endereço (vírgulas, ponto e vírgula, quebras de linha) numa
+        # única passada em C
+        clean_address = address.translate(_QUERY_PUNCT_TABLE).strip()
         
         if parcel_id:
             # Se temos parcel ID, priorizar
-            query = f'"{parcel_id}" "{clean_address}" {self.county_name} indiana owner'
+            query = self._query_with_parcel(pid=parcel_id, addr=clean_address)
         else:
             # Query genérica
-            query = f'"{clean_address}" {self.county_name} county assessor indiana property owner'
+            query = self._query_plain(addr=clean_address)
         
-        logger.debug(f"Query construída: {query}")
+        logger.debug("Query construída: {}", query)
         return query
     
-    def _search(self, query: str) -> List[Dict]:
+    def _search(self, query: str) -> List[_SearchItem]:
         """
         Executa busca no Google Custom Search API.
         
@@ -228,50 +536,119 @@ class GenericWebSearchFetcher(CountyAssessorFetcher):
             query: String de busca
         
         Returns:
-            Lista de resultados (dicts com 'title', 'link', 'snippet')
+            Lista de resultados (_SearchItem com snippet, title, link)
+        
+        Raises:
+            Erros da requisição (timeout, HTTP 429/5xx...), classificados
+            pelo chamador com _http_error_result
         """
         # Verificar cache
-        if query in self._search_cache:
-            logger.debug("✅ Usando resultado em cache")
-            return self._search_cache[query]
+        cached = self._search_cache_get(query)
+        if cached is not None:
+            return cached
+        
+        # Respeitar a quota: token só para buscas que vão mesmo à API
+        self.rate_limiter.wait()
         
         try:
-            params = {
-                'key': self.api_key,
-                'cx': self.search_engine_id,
-                'q': query,
-                'num': 10  # Top 10 resultados
-            }
-            
-            response = requests.get(
+            # Resposta pequena (<50 KB): lida inteira de uma vez em bytes
+            # (sem stream nem response.text); o `with` devolve a conexão
+            # ao pool assim que o corpo é consumido, inclusive em erro
+            with self.get_session().get(
                 self.base_url,
-                params=params,
+                params=self._search_params(query),
                 timeout=10
-            )
-            
-            response.raise_for_status()
-            data = response.json()
+            ) as response:
+                response.raise_for_status()
+                data = _json_loads(response.content)
             
             # Extrair itens
-            items = data.get('items', [])
+            items = _parse_items(data.get('items', ()))
             
             # Cachear
-            self._search_cache[query] = items
+            self._search_cache_set(query, items)
             
             logger.info(f"✅ Encontrados {len(items)} resultados no Google")
             return items
         
-        except requests.exceptions.RequestException as e:
+        except Exception as e:
             logger.error(f"❌ Erro na busca do Google: {e}")
-            return []
+            raise
+    
+    async def _search_async(self, query: str) -> List[_SearchItem]:
+        """Versão assíncrona de _search (httpx.AsyncClient compartilhado)."""
+        if not HTTPX_AVAILABLE:
+            return await asyncio.to_thread(self._search, query)
+        
+        cached = self._search_cache_get(query)
+        if cached is not None:
+            return cached
+        
+        sleep_time = self.rate_limiter.take()
+        if sleep_time > 0:
+            await asyncio.sleep(sleep_time)
+        
+        try:
+            response = await self.get_async_client().get(
+                self.base_url,
+                params=self._search_params(query),
+                timeout=10
+            )
+            
+            response.raise_for_status()
+            items = _parse_items(_json_loads(response.content).get('items', ()))
+            
+            self._search_cache_set(query, items)
+            
+            logger.info(f"✅ Encontrados {len(items)} resultados no Google")
+            return items
         
         except Exception as e:
-            logger.error(f"❌ Erro inesperado: {e}")
-            return []
+            logger.error(f"❌ Erro na busca do Google: {e}")
+            raise
+    
+    def _search_params(self, query: str) -> Dict:
+        """Parâmetros da requisição ao Custom Search API."""
+        return {
+            'key': self.api_key,
+            'cx': self.search_engine_id,
+            'q': query,
+            'num': 10  # Top 10 resultados
+        }
+    
+    def _search_cache_get(self, query: str) -> Optional[List[_SearchItem]]:
+        """Busca a query no cache em memória e depois no disco."""
+        items = self._search_cache.get(query)
+        if items is not None:
+            logger.debug("✅ Usando resultado em cache")
+            return items
+        
+        raw_items = self._disk_cache.get(self._disk_cache_key(query))
+        if raw_items is None:
+            return None
+        
+        logger.debug("✅ Usando resultado em cache (disco)")
+        items = _parse_items(raw_items)
+        self._search_cache.set(query, items)
+        return items
+    
+    def _search_cache_set(self, query: str, items: List[_SearchItem]):
+        """Grava o resultado de uma busca nos caches em memória e em disco."""
+        self._search_cache.set(query, items)
+        self._disk_cache.set(self._disk_cache_key(query), [item._asdict() for item in items])
+    
+    def _disk_cache_key(self, query: str) -> str:
+        """
+        Chave do cache em disco: hash de (prefixo da API key, cx, query).
+        
+        O hash distingue engines/chaves diferentes sem gravar a API key.
+        """
+        raw = f"{(self.api_key or '')[:8]}|{self.search_engine_id}|{query}"
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
     
     def _parse_search_results(
         self,
-        results: List[Dict],
+        results: List[_SearchItem],
         address: str,
         lat: float,
         lon: float,
@@ -288,17 +665,14 @@ class GenericWebSearchFetcher(CountyAssessorFetcher):
         - "Owner's Mailing Address: 123 Main St, City, ST ZIP"
         """
         for result in results:
-            snippet = result.get('snippet', '')
-            title = result.get('title', '')
-            link = result.get('link', '')
+            snippet = result.snippet
+            title = result.title
+            link = result.link
             
-            # Tentar extrair nome do proprietário
-            owner_name = self._extract_owner_name(snippet + " " + title)
+            # Texto combinado montado uma única vez por resultado
+            owner_name, mailing_address = self._extract_all(f"{snippet} {title}", len(snippet))
             
             if owner_name:
-                # Tentar extrair endereço
-                mailing_address = self._extract_mailing_address(snippet)
-                
                 # Criar registro
                 record = OwnerRecord(
                     owner_name_1=owner_name,
@@ -323,7 +697,32 @@ class GenericWebSearchFetcher(CountyAssessorFetcher):
         logger.warning("❌ Não foi possível extrair proprietário dos resultados")
         return None
     
-    def _extract_owner_name(self, text: str) -> Optional[str]:
+    def _extract_all(self, text: str, snippet_end: int) -> Tuple[Optional[str], Dict[str, str]]:
+        """
+        Extrai nome e endereço de um resultado numa única passada.
+        
+        Args:
+            text: "snippet título" já concatenados
+            snippet_end: Tamanho do snippet - o endereço só é buscado nele
+                         (via endpos, sem fatiar a string)
+        
+        Returns:
+            (nome do proprietário ou None, endereço de correspondência)
+        """
+        # Minúsculas calculadas uma vez para o pré-filtro e para os padrões
+        needle = _ascii_lower(text)
+        
+        # Sem nenhuma âncora ("Owner", "Taxpayer"...) não há o que extrair
+        if not _has_owner_anchor(needle):
+            return None, {}
+        
+        owner_name = self._extract_owner_name(text, needle)
+        if not owner_name:
+            return None, {}
+        
+        return owner_name, self._extract_mailing_address(text, snippet_end, needle)
+    
+    def _extract_owner_name(self, text: str, needle: Optional[bytes] = None) -> Optional[str]:
         """
         Extrai nome do proprietário usando regex.
         
@@ -331,37 +730,52 @@ class GenericWebSearchFetcher(CountyAssessorFetcher):
         - "Owner: JOHN DOE"
         - "Taxpayer: ABC LLC"
         - "Property Owner: SMITH FAMILY TRUST"
+        
+        Os padrões casam sobre `needle` (minúsculas ASCII); o nome é
+        recortado de `text` pelo mesmo span, mantendo a caixa original.
         """
-        patterns = [
-            r'Owner[:\s]+([A-Z\s&,\.]+)',
-            r'Taxpayer[:\s]+([A-Z\s&,\.]+)',
-            r'Property Owner[:\s]+([A-Z\s&,\.]+)',
-            r'Mailing Name[:\s]+([A-Z\s&,\.]+)',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        if needle is None:
+            needle = _ascii_lower(text)
+        
+        for pattern in _OWNER_PATTERNS:
+            match = pattern.search(needle)
             if match:
-                name = match.group(1).strip()
+                name = text[match.start(1):match.end(1)].strip()
                 # Validar que não é muito curto
                 if len(name) > 3:
                     return name
         
         return None
     
-    def _extract_mailing_address(self, text: str) -> Dict[str, str]:
+    def _extract_mailing_address(
+        self,
+        text: str,
+        endpos: Optional[int] = None,
+        needle: Optional[bytes] = None
+    ) -> Dict[str, str]:
         """
         Extrai endereço de correspondência do snippet.
         
         Padrões:
         - "123 Main St, Indianapolis, IN 46204"
         - "PO Box 123, Fort Wayne, IN 46802"
+        
+        Args:
+            text: Texto do resultado
+            endpos: Busca só até esta posição (sem fatiar a string)
+            needle: `text` já convertido por _ascii_lower (evita refazer)
         """
-        # Pattern básico para endereços
-        # Formato: [Número] [Rua], [Cidade], [Estado] [ZIP]
-        pattern = r'(\d+\s+[A-Za-z\s]+),\s*([A-Za-z\s]+),\s*([A-Z]{2})\s*(\d{5}(?:-\d{4})?)'
+        if endpos is None:
+            endpos = len(text)
+        
+        match = None
+        if _SUFFIX_AC is not None:
+            match = self._search_address_near_suffixes(text, endpos, needle)
         
-        match = re.search(pattern, text)
+        # Endereço sem sufixo conhecido ("100 Broadway, ...") ou sem
+        # pyahocorasick: regex no snippet inteiro, como antes
+        if match is None:
+            match = _ADDRESS_PATTERN.search(text, 0, endpos)
         
         if match:
             return {
@@ -377,12 +791,66 @@ class GenericWebSearchFetcher(CountyAssessorFetcher):
             'state': 'IN',
             'zip': ''
         }
+    
+    @staticmethod
+    def _search_address_near_suffixes(text: str, endpos: int, needle: Optional[bytes] = None):
+        """
+        Roda o regex de endereço só em janelas ao redor de sufixos de rua.
+        
+        Os sufixos são localizados numa única varredura do Aho-Corasick sobre
+        o texto em minúsculas; só contam como palavra inteira ("St" e não
+        "State"). Retorna o primeiro match ou None se nenhuma janela casar.
+        """
+        if needle is None:
+            needle = _ascii_lower(text)
+        lowered = needle[:endpos].decode('ascii')
+        
+        for end_idx, length in _SUFFIX_AC.iter(lowered):
+            start_idx = end_idx - length + 1
+            after = end_idx + 1
+            if start_idx == 0 or not lowered[start_idx - 1].isspace():
+                continue
+            if after < endpos and lowered[after].isalpha():
+                continue
+            
+            # Não cortar o número da rua no início da janela
+            win_start = max(0, start_idx - _ADDRESS_WINDOW_BEFORE)
+            while win_start > 0 and text[win_start - 1].isdigit():
+                win_start -= 1
+            
+            match = _ADDRESS_PATTERN.search(
+                text, win_start, min(endpos, after + _ADDRESS_WINDOW_AFTER)
+            )
+            if match:
+                return match
+        
+        return None
 
 
 # ============================================================================
 # MOCK FETCHER (para desenvolvimento sem consumir API quota)
 # ============================================================================
 
+# Latência simulada do MockFetcher (segundos, média). Padrão 0 = sem sleep;
+# MOCK_FETCHER_DELAY=1.0 reproduz o delay antigo de 0.5-1.5s por chamada.
+_MOCK_DELAY = float(os.environ.get('MOCK_FETCHER_DELAY', '0'))
+
+# Registro fictício montado uma vez; cada chamada só troca os campos variáveis
+_MOCK_TEMPLATE = OwnerRecord(
+    owner_name_1="MOCK PROPERTY OWNER LLC",
+    mailing_address_line1="123 FAKE ST STE 100",
+    mailing_city="MOCKVILLE",
+    mailing_state="IN",
+    mailing_zip="46000",
+    parcel_id="00-00-00-000-000.000-000",
+    property_class_code=PropertyClassCode.MOBILE_HOME.value,
+    assessed_value=1500000.00,
+    tax_year=2024,
+    source_url="http://mock.local/property/123",
+    notes="⚠️ DADOS FICTÍCIOS - MOCK FETCHER"
+)
+
+
 class MockFetcher(CountyAssessorFetcher):
     """
     Fetcher MOCK para testes e desenvolvimento.
@@ -394,6 +862,9 @@ class MockFetcher(CountyAssessorFetcher):
     
     def __init__(self, county_name: str):
         super().__init__(county_name=county_name, system_type="Mock (Development)")
+        
+        # RNG próprio: sem disputar o lock do random global entre threads
+        self._rng = random.Random()
     
     def _get_base_url(self) -> str:
         return "http://mock.local"
@@ -406,27 +877,18 @@ class MockFetcher(CountyAssessorFetcher):
         parcel_id: Optional[str] = None
     ) -> FetchResult:
         """Retorna proprietário fictício."""
-        import random
-        
-        # Simular delay de rede
-        time.sleep(random.uniform(0.5, 1.5))
+        # Simular delay de rede (desligado por padrão, ver MOCK_FETCHER_DELAY)
+        if _MOCK_DELAY:
+            time.sleep(self._rng.uniform(0.5 * _MOCK_DELAY, 1.5 * _MOCK_DELAY))
         
         # 80% de sucesso
-        if random.random() < 0.8:
-            record = OwnerRecord(
-                owner_name_1="MOCK PROPERTY OWNER LLC",
-                mailing_address_line1="123 FAKE ST STE 100",
-                mailing_city="MOCKVILLE",
-                mailing_state="IN",
-                mailing_zip="46000",
-                parcel_id=parcel_id or "00-00-00-000-000.000-000",
+        if self._rng.random() < 0.8:
+            record = dataclasses.replace(
+                _MOCK_TEMPLATE,
+                parcel_id=parcel_id or _MOCK_TEMPLATE.parcel_id,
                 property_address=address,
-                property_class_code=PropertyClassCode.MOBILE_HOME.value,
-                assessed_value=1500000.00,
-                tax_year=2024,
                 source=f"{self.county_name} (MOCK)",
-                source_url="http://mock.local/property/123",
-                notes="⚠️ DADOS FICTÍCIOS - MOCK FETCHER"
+                fetched_at=None  # __post_init__ preenche com o horário atual
             )
             
             record.confidence_score = self.calculate_confidence_score(record)
@@ -454,10 +916,28 @@ class MockFetcher(CountyAssessorFetcher):
 # FACTORY FUNCTION
 # ============================================================================
 
+# TODO: Implementar fetchers específicos por sistema
+# Mapeamento de condados para sistemas (frozensets: lookup O(1) por chamada)
+_BEACON_COUNTIES = frozenset({
+    'Marion County', 'Lake County', 'Hamilton County',
+    'St. Joseph County', 'Elkhart County', 'Tippecanoe County'
+    # ... adicionar todos os ~40 condados Beacon
+})
+
+_VANGUARD_COUNTIES = frozenset({
+    'Brown County', 'Daviess County', 'Dubois County'
+    # ... adicionar todos os ~15 condados Vanguard
+})
+
+
+@functools.lru_cache(maxsize=128)
 def get_fetcher_for_county(county_name: str, use_mock: bool = False) -> CountyAssessorFetcher:
     """
     Factory function que retorna o fetcher apropriado para um condado.
     
+    Memoizada por (county_name, use_mock): todas as parcelas de um condado
+    compartilham o mesmo fetcher (cache, estatísticas e token bucket).
+    
     Args:
         county_name: Nome do condado (ex: "Marion County")
         use_mock: Se True, retorna MockFetcher (para desenvolvimento)
@@ -473,27 +953,19 @@ def get_fetcher_for_county(county_name: str, use_mock: bool = False) -> CountyAs
         logger.warning(f"⚠️ Usando MOCK fetcher para {county_name}")
         return MockFetcher(county_name)
     
-    # TODO: Implementar fetchers específicos por sistema
-    # Mapeamento de condados para sistemas
-    BEACON_COUNTIES = [
-        'Marion County', 'Lake County', 'Hamilton County', 
-        'St. Joseph County', 'Elkhart County', 'Tippecanoe County'
-        # ... adicionar todos os ~40 condados Beacon
-    ]
-    
-    VANGUARD_COUNTIES = [
-        'Brown County', 'Daviess County', 'Dubois County'
-        # ... adicionar todos os ~15 condados Vanguard
-    ]
+    # Fetchers específicos registrados via CountyAssessorFetcher.COUNTY
+    fetcher_cls = CountyAssessorFetcher.registered_class(county_name)
+    if fetcher_cls is not None:
+        return fetcher_cls(county_name)
     
     # Selecionar fetcher baseado no condado
-    if county_name in BEACON_COUNTIES:
+    if county_name in _BEACON_COUNTIES:
         # TODO: from src.owners.fetchers.beacon_fetcher import BeaconFetcher
         # return BeaconFetcher(county_name)
         logger.warning(f"BeaconFetcher não implementado para {county_name}, usando GenericWebSearchFetcher")
         return GenericWebSearchFetcher(county_name)
     
-    elif county_name in VANGUARD_COUNTIES:
+    elif county_name in _VANGUARD_COUNTIES:
         # TODO: from src.owners.fetchers.vanguard_fetcher import VanguardFetcher
         # return VanguardFetcher(county_name)
         logger.warning(f"VanguardFetcher não implementado para {county_name}, usando GenericWebSearchFetcher")
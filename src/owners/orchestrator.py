@@ -52,23 +52,48 @@ Author: BellaTerra Intelligence Team
 Date: December 2025
 """
 
+import asyncio
+import contextvars
+import csv
+import heapq
+import io
+import json
+import threading
 import time
-from typing import Optional, List, Dict, Tuple
+from dataclasses import asdict, dataclass
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import lru_cache
+from itertools import count, islice
+from typing import Optional, Iterator, List, Dict, Tuple
 from datetime import datetime
 from pathlib import Path
-import sys
 
+import numpy as np
 from loguru import logger
 from sqlalchemy import text
 from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import TextClause
+from tenacity import (
+    AsyncRetrying,
+    RetryError,
+    Retrying,
+    RetryCallState,
+    retry_if_not_exception_type,
+    stop_after_attempt,
+    wait_exponential_jitter
+)
 
 # Importações internas
-from src.database import get_db_session
+from src.database import get_db_session, get_engine
 from src.owners.county_mapper import CountyMapper
 from src.owners.base_fetcher import (
+    AdaptiveRateLimiter,
+    AsyncRateLimiter,
     CountyAssessorFetcher,
     OwnerRecord,
-    FetchResult
+    FetchResult,
+    _OWNER_DB_COLUMNS
 )
 from src.owners.fetchers.generic_fetcher import (
     get_fetcher_for_county,
@@ -76,6 +101,285 @@ from src.owners.fetchers.generic_fetcher import (
 )
 
 
+# Buscas simultâneas por condado no modo assíncrono, pelo sistema do
+# assessor (ver limites no docstring do módulo). Condados diferentes
+# sempre progridem em paralelo.
+_SYSTEM_CONCURRENCY = {
+    'Beacon/Schneider Corp': 1,
+    'Vanguard Appraisals': 3,
+    'Custom GIS': 1,
+}
+_DEFAULT_COUNTY_CONCURRENCY = 2
+
+# Teto de threads no modo por condado (process_all_parks com max_workers > 1)
+_MAX_COUNTY_WORKERS = 16
+
+# Retry-After acima disto (ex: cooldown de 10 min do Beacon) no modo por
+# condado: em vez de dormir no thread, o condado volta para a fila e o
+# worker fica livre para outros condados
+_DEFER_COOLDOWN_SECONDS = 60
+
+# Token bucket por condado: (requests por minuto, burst), pelo sistema do
+# assessor. Condados fora da tabela (e o modo mock) usam
+# 60 / delay_between_requests com burst 1.
+_COUNTY_RATE_TABLE = {
+    'Beacon/Schneider Corp': (15, 2),
+    'Vanguard Appraisals': (30, 3),
+    'Custom GIS': (12, 1),
+}
+
+# Colunas lidas de parks_master (ordem usada por _park_from_row). O
+# endereço completo "rua, cidade, X County, zip" é montado no Postgres:
+# concat_ws ignora NULLs, e NULLIF descarta partes vazias.
+_PARK_COLUMNS = """
+                id,
+                name,
+                ST_Y(geom::geometry) as latitude,
+                ST_X(geom::geometry) as longitude,
+                concat_ws(', ',
+                    NULLIF(address, ''),
+                    NULLIF(city, ''),
+                    CASE WHEN county <> '' THEN county || ' County' END,
+                    NULLIF(zip_code, '')
+                ) as full_address,
+                city,
+                county,
+                zip_code,
+                county_name"""
+
+# Origem das colunas acima, por disponibilidade da tabela counties
+# (migrations/005_counties.sql). Com ela, o condado sai de um join espacial
+# no índice GiST, só entre os condados do estado do parque; sem ela (ou sem match), county_name vem NULL e o parque
+# segue pelo CountyMapper.
+_PARKS_SOURCE = {
+    True: """parks_master
+            LEFT JOIN LATERAL (
+                SELECT c.name AS county_name
+                FROM counties c
+                WHERE c.state = parks_master.state
+                  AND ST_Intersects(c.geom, parks_master.geom::geometry)
+                LIMIT 1
+            ) cj ON TRUE""",
+    False: """parks_master
+            CROSS JOIN (SELECT NULL::varchar AS county_name) cj""",
+}
+
+_COUNTIES_TABLE_EXISTS = text("SELECT to_regclass('counties') IS NOT NULL")
+
+# Parques ainda sem proprietário (e fora da revisão manual) que não foram
+# tentados nas últimas _RETRY_ATTEMPTS_AFTER (migrations/006_park_lookup_attempts.sql)
+_RETRY_ATTEMPTS_AFTER = "24 hours"
+_PENDING_PARKS_FILTER = (
+    "owner_id IS NULL AND needs_manual_review = FALSE "
+    "AND (last_lookup_attempt_at IS NULL "
+    f"OR last_lookup_attempt_at < NOW() - INTERVAL '{_RETRY_ATTEMPTS_AFTER}')"
+)
+
+# Statements fixos: text() montado uma vez no import, não a cada chamada
+_COUNT_PENDING_PARKS = text(f"SELECT COUNT(*) FROM parks_master WHERE {_PENDING_PARKS_FILTER}")
+
+# Parques pendentes lidos em páginas por keyset (id > último id lido): cada
+# página é uma consulta curta, sem transação aberta durante as buscas
+_PARKS_PAGE_SIZE = 500
+
+_SELECT_PENDING_PARKS = {
+    with_counties: text(f"""
+            SELECT {_PARK_COLUMNS}
+            FROM {source}
+            WHERE {_PENDING_PARKS_FILTER}
+              AND id > :after_id
+            ORDER BY id
+            LIMIT :page_size
+    """)
+    for with_counties, source in _PARKS_SOURCE.items()
+}
+
+_SELECT_PARK_BY_ID = {
+    with_counties: text(f"""
+            SELECT {_PARK_COLUMNS}
+            FROM {source}
+            WHERE id = :park_id
+    """)
+    for with_counties, source in _PARKS_SOURCE.items()
+}
+
+_MARK_MANUAL_REVIEW = text("""
+            UPDATE parks_master
+            SET needs_manual_review = TRUE,
+                updated_at = NOW()
+            WHERE id = ANY(:park_ids)
+""")
+
+_MARK_LOOKUP_ATTEMPTS = text("""
+            UPDATE parks_master
+            SET last_lookup_attempt_at = NOW()
+            WHERE id = ANY(:park_ids)
+""")
+
+# Proprietários por INSERT multi-linha no flush do checkpoint
+_OWNER_BATCH_SIZE = 100
+
+# A partir deste número de proprietários num flush (backfill), grava via
+# COPY FROM STDIN numa tabela temporária em vez de INSERTs multi-linha
+_COPY_MIN_OWNERS = 500
+
+# Staging por conexão: criada uma vez e esvaziada a cada commit
+_CREATE_OWNERS_STAGING = text("""
+            CREATE TEMP TABLE IF NOT EXISTS owners_staging (
+                full_name TEXT,
+                mailing_address JSONB,
+                metadata JSONB,
+                mail_eligible BOOLEAN
+            ) ON COMMIT DELETE ROWS
+""")
+
+_COPY_OWNERS_STAGING = (
+    f"COPY owners_staging ({', '.join(_OWNER_DB_COLUMNS)}) "
+    "FROM STDIN WITH (FORMAT CSV)"
+)
+
+# Mesmo ON CONFLICT/RETURNING de _insert_owners_statement
+_MERGE_OWNERS_STAGING = text("""
+            INSERT INTO owners (
+                full_name,
+                mailing_address,
+                metadata,
+                mail_eligible,
+                created_at
+            )
+            SELECT full_name, mailing_address, metadata, mail_eligible, NOW()
+            FROM owners_staging
+            ON CONFLICT (full_name, (mailing_address->>'line1'), (mailing_address->>'zip'))
+            DO UPDATE SET updated_at = NOW()
+            RETURNING id, full_name, mailing_address->>'line1', mailing_address->>'zip'
+""")
+
+
+# Statements em lote: um por tamanho de lote (no máximo _OWNER_BATCH_SIZE
+# variantes), montados na primeira vez e reaproveitados
+
+@lru_cache(maxsize=None)
+def _insert_owners_statement(rows: int) -> TextClause:
+    """INSERT multi-linha de `rows` proprietários (params full_name_i, mailing_address_i...)."""
+    values = ",\n                ".join(
+        f"(:full_name_{i}, CAST(:mailing_address_{i} AS jsonb), "
+        f"CAST(:metadata_{i} AS jsonb), :mail_eligible_{i}, NOW())"
+        for i in range(rows)
+    )
+    # Depende do índice único idx_owners_identity (migrations/004_owners_identity.sql)
+    return text(f"""
+            INSERT INTO owners (
+                full_name,
+                mailing_address,
+                metadata,
+                mail_eligible,
+                created_at
+            ) VALUES
+                {values}
+            ON CONFLICT (full_name, (mailing_address->>'line1'), (mailing_address->>'zip'))
+            DO UPDATE SET updated_at = NOW()
+            RETURNING id, full_name, mailing_address->>'line1', mailing_address->>'zip'
+    """)
+
+
+@lru_cache(maxsize=None)
+def _update_park_owners_statement(rows: int) -> TextClause:
+    """UPDATE ... FROM (VALUES ...) de `rows` pares (params park_id_i, owner_id_i)."""
+    values = ", ".join(f"(:park_id_{i}, :owner_id_{i})" for i in range(rows))
+    return text(f"""
+            UPDATE parks_master pm
+            SET owner_id = v.owner_id,
+                updated_at = NOW()
+            FROM (VALUES {values}) AS v(park_id, owner_id)
+            WHERE pm.id = v.park_id
+    """)
+
+
+# Backoff exponencial com jitter entre tentativas: parques que tomaram
+# rate limit juntos não tentam de novo no mesmo instante
+_RETRY_JITTER_WAIT = wait_exponential_jitter(initial=1, max=30)
+
+
+# Falhas transitórias do fetcher: não levam o parque para revisão manual
+_TRANSIENT_ERRORS = frozenset({"circuit_open", "max_concurrency"})
+
+
+# Separadores dos banners de log
+_BANNER = "=" * 80
+_RULE = "-" * 80
+
+
+class _RetryableLookup(Exception):
+    """Busca rate limited, com falha de transporte ou sem capacidade: vale tentar de novo."""
+    
+    def __init__(self, result: FetchResult):
+        super().__init__(result.error_message)
+        self.result = result
+
+
+class _CountyCooldown(Exception):
+    """O site do condado pediu espera longa (Retry-After > _DEFER_COOLDOWN_SECONDS)."""
+    
+    def __init__(self, retry_after: float):
+        super().__init__(f"cooldown de {retry_after}s")
+        self.retry_after = retry_after
+
+
+def _retry_wait(retry_state: RetryCallState) -> float:
+    """Espera até a próxima tentativa: Retry-After do site ou backoff com jitter."""
+    error = retry_state.outcome.exception()
+    if isinstance(error, _RetryableLookup) and error.result.retry_after_seconds:
+        return error.result.retry_after_seconds
+    return _RETRY_JITTER_WAIT(retry_state)
+
+
+def _log_retry(retry_state: RetryCallState):
+    """Loga a falha antes de cada espera do tenacity."""
+    error = retry_state.outcome.exception()
+    wait_time = retry_state.next_action.sleep if retry_state.next_action else 0
+    if isinstance(error, _RetryableLookup):
+        logger.warning("⚠️ {}. Aguardando {:.1f}s antes de retry...", error.result.error_message, wait_time)
+    else:
+        logger.error("Erro na tentativa {}: {}", retry_state.attempt_number, error)
+        logger.debug("Aguardando {:.1f}s antes de retry...", wait_time)
+
+
+@dataclass(slots=True)
+class ParkRow:
+    """
+    Parque pendente lido de parks_master (uma linha de _PARK_COLUMNS).
+    
+    Slots em vez de dict: menos memória por parque e acesso por atributo
+    no loop principal.
+    """
+    id: int
+    name: str
+    latitude: float
+    longitude: float
+    address: str  # Endereço completo (ver full_address em _PARK_COLUMNS)
+    city: str
+    county: str
+    zip_code: str
+    
+    # Do join com counties ou de _identify_counties (None = resolver ponto a ponto)
+    county_name: Optional[str] = None
+
+
+@dataclass(slots=True)
+class LookupStats:
+    """Contadores de uma execução do orchestrator."""
+    total_parks: int = 0
+    processed: int = 0
+    successful: int = 0
+    failed: int = 0
+    skipped: int = 0
+    county_not_identified: int = 0
+    owner_found: int = 0
+    owner_not_found: int = 0
+    start_time: Optional[datetime] = None
+    end_time: Optional[datetime] = None
+
+
 class OwnerLookupOrchestrator:
     """
     Orquestrador principal para busca de proprietários.
@@ -99,7 +403,8 @@ class OwnerLookupOrchestrator:
         Args:
             use_mock: Se True, usa MockFetcher (para testes sem consumir APIs)
             max_retries: Tentativas máximas em caso de erro
-            delay_between_requests: Segundos entre cada request (rate limiting)
+            delay_between_requests: Segundos entre requests de um mesmo condado
+                                    cujo sistema não está em _COUNTY_RATE_TABLE
             checkpoint_interval: Salvar progresso a cada N parques
         """
         self.use_mock = use_mock
@@ -113,95 +418,299 @@ class OwnerLookupOrchestrator:
         # Cache de fetchers (um por condado)
         self._fetcher_cache: Dict[str, CountyAssessorFetcher] = {}
         
+        # Rate limit por condado: condados diferentes nunca esperam um pelo outro
+        self._buckets: Dict[str, AsyncRateLimiter] = {}
+        
+        # Escritas aguardando o próximo checkpoint: (park_id, proprietário)
+        # e parques a marcar para revisão manual
+        self._pending_owners: List[Tuple[int, OwnerRecord]] = []
+        self._pending_manual_review: List[int] = []
+        
+        # Parques tentados desde o último checkpoint (last_lookup_attempt_at)
+        # e o maior id já tentado (arquivo de checkpoint)
+        self._pending_attempts: List[int] = []
+        self._last_park_id: Optional[int] = None
+        
+        # Modo por condado (threads): protege stats, filas e os caches acima
+        self._lock = threading.Lock()
+        
+        # Buscas em andamento no modo assíncrono, por (condado, chave de cache
+        # do fetcher): parques com o mesmo endereço aguardam a mesma busca
+        self._inflight: Dict[Tuple[str, Tuple], asyncio.Future] = {}
+        
+        # Tabela counties existe no banco? (verificado na primeira leitura)
+        self._counties_table: Optional[bool] = None
+        
         # Estatísticas de processamento
-        self.stats = {
-            'total_parks': 0,
-            'processed': 0,
-            'successful': 0,
-            'failed': 0,
-            'skipped': 0,
-            'county_not_identified': 0,
-            'owner_found': 0,
-            'owner_not_found': 0,
-            'start_time': None,
-            'end_time': None
-        }
+        self.stats = LookupStats()
         
         # Configurar logging para arquivo
         log_dir = Path(__file__).parent.parent.parent / "logs"
         log_dir.mkdir(exist_ok=True)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         log_file = log_dir / f"owner_lookup_{timestamp}.log"
+        self._checkpoint_file = log_dir / f"checkpoint_{timestamp}.json"
         
+        # enqueue: formatação e escrita em disco num thread do loguru, fora
+        # do loop de busca (ver logger.complete() no relatório final)
         logger.add(
             log_file,
             rotation="100 MB",
             retention="30 days",
-            level="DEBUG"
+            level="DEBUG",
+            enqueue=True
         )
         
-        logger.info("=" * 80)
+        logger.info(_BANNER)
         logger.info("OWNER LOOKUP ORCHESTRATOR - Iniciado")
-        logger.info("=" * 80)
+        logger.info(_BANNER)
         logger.info(f"Modo: {'MOCK (desenvolvimento)' if use_mock else 'PRODUÇÃO'}")
         logger.info(f"Max retries: {max_retries}")
-        logger.info(f"Delay entre requests: {delay_between_requests}s")
+        logger.info(f"Delay padrão por condado: {delay_between_requests}s")
         logger.info(f"Checkpoint a cada: {checkpoint_interval} parques")
         logger.info(f"Log file: {log_file}")
-        logger.info("=" * 80)
+        logger.info(_BANNER)
     
-    def process_all_parks(self, limit: Optional[int] = None):
+    def process_all_parks(self, limit: Optional[int] = None, max_workers: int = 1):
         """
         Processa todos os parques da tabela parks_master.
         
         Args:
             limit: Limitar processamento a N parques (para testes)
+            max_workers: Condados processados em paralelo (threads). Com 1,
+                         os parques são lidos em streaming e processados em série
         """
-        self.stats['start_time'] = datetime.now()
+        if max_workers > 1:
+            self._process_all_parks_by_county(limit, max_workers)
+            return
+        
+        self.stats.start_time = datetime.now()
         
         logger.info("🚀 Iniciando processamento de parques...")
         
+        # Contagem numa transação curta; os parques são lidos em streaming
+        # (sem materializar tudo antes do primeiro request)
         with get_db_session() as session:
-            # Buscar parques que ainda não têm proprietário
-            parks = self._get_parks_without_owner(session, limit)
+            total = self._count_parks_without_owner(session, limit)
+        
+        self.stats.total_parks = total
+        logger.info(f"📊 Total de parques a processar: {total}")
+        
+        if total == 0:
+            logger.info("✅ Nenhum parque pendente. Todos já processados!")
+            return
+        
+        parks = self._iter_parks_without_owner(limit)
+        i = 0
+        while True:
+            batch = list(islice(parks, self.checkpoint_interval))
+            if not batch:
+                break
+            
+            # Condados do lote inteiro numa única consulta vetorizada
+            self._identify_counties(batch)
+            
+            for i, park in enumerate(batch, i + 1):
+                # Banner numa única mensagem: o loguru descarta antes de
+                # formatar quando nenhum sink aceita INFO
+                logger.info("\n{}\nPARQUE {}/{}\n{}", _BANNER, i, total, _BANNER)
+                
+                try:
+                    self._process_single_park(park)
+                    self.stats.processed += 1
+                
+                except Exception as e:
+                    logger.error("❌ Erro ao processar parque {}: {}", park.id, e)
+                    self.stats.failed += 1
             
-            self.stats['total_parks'] = len(parks)
-            logger.info(f"📊 Total de parques a processar: {len(parks)}")
+            # Checkpoint
+            logger.info("💾 Checkpoint: {}/{} parques processados", i, total)
+            self._checkpoint()
+        
+        self.stats.end_time = datetime.now()
+        self._print_final_report()
+    
+    def _process_all_parks_by_county(self, limit: Optional[int], max_workers: int):
+        """
+        process_all_parks com um thread por condado (ThreadPoolExecutor).
+        
+        Condados diferentes buscam em paralelo (o requests libera o GIL no
+        I/O); dentro de um condado os parques seguem em série, no ritmo do
+        token bucket do condado. Os fetchers síncronos não mudam.
+        """
+        self.stats.start_time = datetime.now()
+        
+        logger.info("🚀 Iniciando processamento de parques por condado (threads)...")
+        
+        # O agrupamento por condado precisa da lista inteira
+        parks = list(self._iter_parks_without_owner(limit))
+        
+        self.stats.total_parks = len(parks)
+        logger.info(f"📊 Total de parques a processar: {len(parks)}")
+        
+        if len(parks) == 0:
+            logger.info("✅ Nenhum parque pendente. Todos já processados!")
+            return
+        
+        self._identify_counties(parks)
+        
+        # Parques sem condado do lote (None) formam um grupo à parte e
+        # passam pelo identify_county individual
+        parks_by_county: Dict[Optional[str], List[ParkRow]] = defaultdict(list)
+        for park in parks:
+            parks_by_county[park.county_name].append(park)
+        
+        workers = min(max_workers, _MAX_COUNTY_WORKERS, len(parks_by_county))
+        logger.info(f"🧵 {len(parks_by_county)} condado(s) em {workers} thread(s)")
+        
+        # Condados em cooldown longo: heap de (pronto_em, seq, condado, parques restantes)
+        deferred: List[Tuple[float, int, Optional[str], List[ParkRow]]] = []
+        seq = count()
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # contextvars não passam sozinhos para o pool: cada condado roda
+            # numa cópia do contexto de quem chamou (ex.: fase do dashboard)
+            running = {
+                executor.submit(
+                    contextvars.copy_context().run,
+                    self._process_county_serial, county, county_parks, len(parks)
+                ): county
+                for county, county_parks in parks_by_county.items()
+            }
+            
+            while running or deferred:
+                # Condados cujo cooldown já passou voltam ao pool
+                while deferred and deferred[0][0] <= time.monotonic():
+                    _, _, county, county_parks = heapq.heappop(deferred)
+                    future = executor.submit(
+                        contextvars.copy_context().run,
+                        self._process_county_serial, county, county_parks, len(parks)
+                    )
+                    running[future] = county
+                
+                timeout = max(0.0, deferred[0][0] - time.monotonic()) if deferred else None
+                if not running:
+                    time.sleep(timeout)
+                    continue
+                
+                done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    county = running.pop(future)
+                    try:
+                        deferral = future.result()
+                    except Exception as e:
+                        logger.error("❌ Erro no condado {}: {}", county, e)
+                        continue
+                    
+                    if deferral:
+                        ready_at, remaining = deferral
+                        heapq.heappush(deferred, (ready_at, next(seq), county, remaining))
+        
+        # Checkpoint final
+        self._checkpoint()
+        
+        self.stats.end_time = datetime.now()
+        self._print_final_report()
+    
+    def _process_county_serial(
+        self,
+        county: Optional[str],
+        parks: List[ParkRow],
+        total: int
+    ) -> Optional[Tuple[float, List[ParkRow]]]:
+        """
+        Processa em série os parques de um condado (roda num thread do pool).
+        
+        Returns:
+            None ao terminar, ou (pronto_em, parques restantes) se o site do
+            condado pediu um cooldown longo - o condado volta para a fila
+        """
+        for index, park in enumerate(parks):
+            try:
+                self._process_single_park(park, defer_cooldown=True)
+                ok = True
+            except _CountyCooldown as e:
+                logger.warning(
+                    "⏸️ {}: cooldown de {}s - {} parque(s) voltam para a fila",
+                    county, e.retry_after, len(parks) - index
+                )
+                return time.monotonic() + e.retry_after, parks[index:]
+            except Exception as e:
+                logger.error("❌ Erro ao processar parque {}: {}", park.id, e)
+                ok = False
+            
+            with self._lock:
+                if ok:
+                    self.stats.processed += 1
+                else:
+                    self.stats.failed += 1
+                done = self.stats.processed + self.stats.failed
             
-            if len(parks) == 0:
+            # Checkpoint
+            if done % self.checkpoint_interval == 0:
+                logger.info("💾 Checkpoint: {}/{} parques processados", done, total)
+                self._checkpoint()
+        
+        return None
+    
+    async def aprocess_all_parks(self, limit: Optional[int] = None):
+        """
+        Versão assíncrona de process_all_parks.
+        
+        Cada condado tem seu próprio semáforo (ver _SYSTEM_CONCURRENCY) e seu
+        próprio token bucket (ver _COUNTY_RATE_TABLE), aguardado com
+        asyncio.sleep: enquanto um condado espera o rate limit os demais
+        continuam buscando pelo httpx.AsyncClient compartilhado dos fetchers.
+        
+        Args:
+            limit: Limitar processamento a N parques (para testes)
+        """
+        self.stats.start_time = datetime.now()
+        
+        logger.info("🚀 Iniciando processamento assíncrono de parques...")
+        
+        try:
+            # gather precisa de todas as corrotinas: aqui a lista é materializada.
+            # Consultas ao banco e ao CountyMapper são síncronas: rodam num
+            # thread para não travar o event loop
+            parks = await asyncio.to_thread(lambda: list(self._iter_parks_without_owner(limit)))
+            total = len(parks)
+            
+            self.stats.total_parks = total
+            logger.info(f"📊 Total de parques a processar: {total}")
+            
+            if total == 0:
                 logger.info("✅ Nenhum parque pendente. Todos já processados!")
                 return
             
-            # Processar cada parque
-            for i, park in enumerate(parks, 1):
-                logger.info("")
-                logger.info("=" * 80)
-                logger.info(f"PARQUE {i}/{len(parks)}")
-                logger.info("=" * 80)
-                
+            await asyncio.to_thread(self._identify_counties, parks)
+            
+            semaphores: Dict[str, asyncio.Semaphore] = {}
+            done = 0
+            
+            async def _run(park: ParkRow):
+                nonlocal done
                 try:
-                    self._process_single_park(session, park)
-                    self.stats['processed'] += 1
-                    
+                    await self._aprocess_single_park(park, semaphores)
+                    self.stats.processed += 1
                 except Exception as e:
-                    logger.error(f"❌ Erro ao processar parque {park['id']}: {e}")
-                    self.stats['failed'] += 1
-                    continue
+                    logger.error("❌ Erro ao processar parque {}: {}", park.id, e)
+                    self.stats.failed += 1
                 
                 # Checkpoint
-                if i % self.checkpoint_interval == 0:
-                    logger.info(f"💾 Checkpoint: {i}/{len(parks)} parques processados")
-                    session.commit()
-                
-                # Delay entre requests (rate limiting)
-                if i < len(parks):  # Não delay no último
-                    logger.debug(f"⏳ Aguardando {self.delay_between_requests}s (rate limiting)...")
-                    time.sleep(self.delay_between_requests)
+                done += 1
+                if done % self.checkpoint_interval == 0:
+                    logger.info("💾 Checkpoint: {}/{} parques processados", done, total)
+                    await asyncio.to_thread(self._checkpoint)
             
-            # Commit final
-            session.commit()
+            await asyncio.gather(*(_run(park) for park in parks), return_exceptions=True)
+            
+            # Checkpoint final
+            await asyncio.to_thread(self._checkpoint)
+        finally:
+            await CountyAssessorFetcher.aclose()
         
-        self.stats['end_time'] = datetime.now()
+        self.stats.end_time = datetime.now()
         self._print_final_report()
     
     def process_single_park_by_id(self, park_id: int):
@@ -215,49 +724,79 @@ class OwnerLookupOrchestrator:
         
         with get_db_session() as session:
             park = self._get_park_by_id(session, park_id)
-            
-            if not park:
-                logger.error(f"❌ Parque {park_id} não encontrado")
-                return
-            
-            self._process_single_park(session, park)
-            session.commit()
-            
-            logger.info("✅ Processamento concluído")
+        
+        if not park:
+            logger.error(f"❌ Parque {park_id} não encontrado")
+            return
+        
+        self._process_single_park(park)
+        self._checkpoint()
+        
+        logger.info("✅ Processamento concluído")
+    
+    def _checkpoint(self):
+        """
+        Grava tudo o que está pendente numa transação curta (sessão própria).
+        
+        As buscas rodam fora de qualquer transação; só o flush do lote toca
+        o banco. Se a conexão cair, o rollback descarta apenas este lote e a
+        execução continua com os próximos parques.
+        """
+        # As filas são trocadas antes do flush: o que outros threads
+        # enfileirarem durante a transação fica para o próximo checkpoint
+        with self._lock:
+            owners, self._pending_owners = self._pending_owners, []
+            review, self._pending_manual_review = self._pending_manual_review, []
+            attempts, self._pending_attempts = self._pending_attempts, []
+        
+        try:
+            with get_db_session() as session:
+                self._flush_pending(session, owners, review, attempts)
+        except Exception as e:
+            logger.error(f"❌ Checkpoint falhou - lote descartado: {e}")
+            return
+        
+        self._write_checkpoint_file()
+    
+    def _write_checkpoint_file(self):
+        """Grava {last_processed_id, stats} do último checkpoint em logs/checkpoint_*.json."""
+        with self._lock:
+            state = {
+                'last_processed_id': self._last_park_id,
+                'stats': asdict(self.stats),
+                'saved_at': datetime.now()
+            }
+        
+        try:
+            self._checkpoint_file.write_text(json.dumps(state, default=str, indent=2))
+        except OSError as e:
+            logger.warning(f"Não foi possível gravar {self._checkpoint_file}: {e}")
     
     # ========================================================================
     # PROCESSAMENTO DE PARQUE INDIVIDUAL
     # ========================================================================
     
-    def _process_single_park(self, session: Session, park: Dict):
+    def _process_single_park(self, park: ParkRow, defer_cooldown: bool = False):
         """
-        Processa um único parque: identifica condado, busca proprietário, salva.
+        Processa um único parque: identifica condado, busca proprietário e
+        enfileira o resultado para o próximo checkpoint.
         
         Args:
-            session: Sessão do SQLAlchemy
-            park: Dicionário com dados do parque (da query)
+            park: Parque lido de parks_master (ParkRow)
+            defer_cooldown: Levantar _CountyCooldown em vez de dormir quando o
+                            site pede Retry-After > _DEFER_COOLDOWN_SECONDS
         """
-        park_id = park['id']
-        park_name = park['name']
-        lat = park['latitude']
-        lon = park['longitude']
-        address = park.get('address', 'Endereço não disponível')
+        lat = park.latitude
+        lon = park.longitude
+        address = park.address
         
-        logger.info(f"📍 Parque: {park_name}")
-        logger.info(f"   Endereço: {address}")
-        logger.info(f"   Coordenadas: ({lat}, {lon})")
+        self._queue_attempt(park.id)
         
         # PASSO 1: Identificar condado
-        county = self._identify_county(lat, lon)
-        
+        county = self._resolve_county(park)
         if not county:
-            logger.warning("⚠️ Condado não identificado - pulando parque")
-            self.stats['county_not_identified'] += 1
-            self.stats['skipped'] += 1
             return
         
-        logger.info(f"   🏛️ Condado: {county}")
-        
         # PASSO 2: Obter fetcher apropriado
         fetcher = self._get_fetcher(county)
         
@@ -266,31 +805,131 @@ class OwnerLookupOrchestrator:
             fetcher,
             address,
             lat,
-            lon
+            lon,
+            defer_cooldown=defer_cooldown
         )
         
         # PASSO 4: Processar resultado
+        self._handle_lookup_result(park.id, result)
+    
+    async def _aprocess_single_park(
+        self,
+        park: ParkRow,
+        semaphores: Dict[str, asyncio.Semaphore]
+    ):
+        """
+        Versão assíncrona de _process_single_park.
+        
+        A busca (com o token bucket do condado) roda dentro do semáforo do
+        condado; o resultado vai para a fila do próximo checkpoint. Um parque
+        cujo endereço já está sendo buscado aguarda essa busca (single-flight)
+        sem consumir token nem vaga do semáforo.
+        """
+        lat = park.latitude
+        lon = park.longitude
+        address = park.address
+        
+        self._queue_attempt(park.id)
+        
+        county = await self._aresolve_county(park)
+        if not county:
+            return
+        
+        fetcher = self._get_fetcher(county)
+        
+        semaphore = semaphores.get(county)
+        if semaphore is None:
+            semaphore = semaphores[county] = asyncio.Semaphore(self._county_concurrency(county))
+        
+        key = (county, fetcher._cache_key(address, lat, lon))
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            logger.debug("🔗 Busca já em andamento para {} - aguardando", address)
+            result = await asyncio.shield(inflight)
+        else:
+            future = self._inflight[key] = asyncio.get_running_loop().create_future()
+            try:
+                async with semaphore:
+                    result = await self._alookup_owner_with_retry(fetcher, address, lat, lon)
+                future.set_result(result)
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except Exception as e:
+                future.set_exception(e)
+                # Marca a exceção como consumida se ninguém mais aguardava
+                future.exception()
+                raise
+            finally:
+                self._inflight.pop(key, None)
+        
+        self._handle_lookup_result(park.id, result)
+    
+    def _resolve_county(self, park: ParkRow) -> Optional[str]:
+        """Loga o parque e identifica o condado (None = parque pulado)."""
+        self._log_park(park)
+        
+        # Já resolvido (join com counties ou _identify_counties)? Senão, ponto a ponto
+        county = park.county_name or self._identify_county(park.latitude, park.longitude)
+        return self._accept_county(county)
+    
+    async def _aresolve_county(self, park: ParkRow) -> Optional[str]:
+        """Versão assíncrona de _resolve_county: o geopy roda num thread."""
+        self._log_park(park)
+        
+        county = park.county_name or await asyncio.to_thread(
+            self._identify_county, park.latitude, park.longitude
+        )
+        return self._accept_county(county)
+    
+    @staticmethod
+    def _log_park(park: ParkRow):
+        """Loga nome, endereço e coordenadas do parque."""
+        logger.info("📍 Parque: {}", park.name)
+        logger.info("   Endereço: {}", park.address)
+        logger.info("   Coordenadas: ({}, {})", park.latitude, park.longitude)
+    
+    def _accept_county(self, county: Optional[str]) -> Optional[str]:
+        """Conta o parque como pulado se o condado não foi identificado."""
+        if not county:
+            logger.warning("⚠️ Condado não identificado - pulando parque")
+            self._count('county_not_identified', 'skipped')
+            return None
+        
+        logger.info("   🏛️ Condado: {}", county)
+        return county
+    
+    def _handle_lookup_result(self, park_id: int, result: FetchResult):
+        """Enfileira o proprietário encontrado ou a marcação para revisão."""
         if result.success and result.found_owner:
-            logger.info(f"✅ Proprietário encontrado!")
+            logger.info("✅ Proprietário encontrado!")
             
             for owner_record in result.records:
-                # Salvar proprietário
-                owner_id = self._save_owner(session, owner_record)
-                
-                # Atualizar parks_master
-                self._update_park_owner(session, park_id, owner_id)
+                # Salvar proprietário + atualizar parks_master (no checkpoint)
+                self._queue_owner(park_id, owner_record)
                 
-                logger.info(f"   💾 Salvo: {owner_record.owner_name_1}")
+                logger.info("   💾 Na fila: {}", owner_record.owner_name_1)
             
-            self.stats['successful'] += 1
-            self.stats['owner_found'] += 1
+            self._count('successful', 'owner_found')
+        
+        elif result.transport_error or result.error_message in _TRANSIENT_ERRORS:
+            # Site fora do ar / sem capacidade: só a tentativa fica registrada
+            # (last_lookup_attempt_at) e o parque volta na próxima execução
+            logger.warning("⏸️ Busca adiada: {}", result.error_message)
+            self._count('skipped')
         
         else:
-            logger.warning(f"⚠️ Proprietário não encontrado: {result.error_message}")
-            self.stats['owner_not_found'] += 1
+            logger.warning("⚠️ Proprietário não encontrado: {}", result.error_message)
+            self._count('owner_not_found')
             
             # Marcar parque para revisão manual
-            self._mark_for_manual_review(session, park_id, result.error_message)
+            self._mark_for_manual_review(park_id, result.error_message)
+    
+    def _count(self, *keys: str):
+        """Incrementa contadores de self.stats (seguro entre threads)."""
+        with self._lock:
+            for key in keys:
+                setattr(self.stats, key, getattr(self.stats, key) + 1)
     
     # ========================================================================
     # HELPERS - IDENTIFICAÇÃO E BUSCA
@@ -302,9 +941,37 @@ class OwnerLookupOrchestrator:
             county = self.county_mapper.identify_county(lat, lon)
             return county
         except Exception as e:
-            logger.error(f"Erro ao identificar condado: {e}")
+            logger.error("Erro ao identificar condado: {}", e)
             return None
     
+    def _identify_counties(self, parks: List[ParkRow]):
+        """
+        Resolve o condado de um lote de parques de uma vez (park.county_name).
+        
+        Só para os parques que o join espacial com a tabela counties não
+        resolveu. Usa CountyMapper.identify_counties: pontos em células
+        internas do raster saem sem teste de polígono e o resto vai numa
+        única consulta à STRtree. Parques sem resultado (ex: fora de
+        Indiana) ficam sem 'county_name' e seguem pelo identify_county
+        individual (com geopy).
+        """
+        parks = [park for park in parks if park.county_name is None]
+        if not parks:
+            return
+        
+        try:
+            counties = self.county_mapper.identify_counties(
+                np.array([park.latitude for park in parks], dtype=np.float64),
+                np.array([park.longitude for park in parks], dtype=np.float64)
+            )
+        except Exception as e:
+            logger.error("Erro ao identificar condados em lote: {}", e)
+            return
+        
+        for park, county in zip(parks, counties):
+            if county:
+                park.county_name = county
+    
     def _get_fetcher(self, county: str) -> CountyAssessorFetcher:
         """
         Obtém fetcher apropriado para o condado (com cache).
@@ -315,283 +982,403 @@ class OwnerLookupOrchestrator:
         Returns:
             Instância de fetcher (reutilizada se já existir)
         """
-        if county not in self._fetcher_cache:
-            logger.debug(f"Criando novo fetcher para {county}")
-            self._fetcher_cache[county] = get_fetcher_for_county(
-                county,
-                use_mock=self.use_mock
-            )
+        with self._lock:
+            if county not in self._fetcher_cache:
+                logger.debug("Criando novo fetcher para {}", county)
+                self._fetcher_cache[county] = get_fetcher_for_county(
+                    county,
+                    use_mock=self.use_mock
+                )
+            
+            return self._fetcher_cache[county]
+    
+    def _county_bucket(self, county: str) -> AsyncRateLimiter:
+        """
+        Token bucket do condado (criado no primeiro uso).
         
-        return self._fetcher_cache[county]
+        AsyncRateLimiter serve aos dois caminhos: `await bucket.wait()` no
+        assíncrono e `time.sleep(bucket.take())` no síncrono. Com sites
+        reais o bucket é um AdaptiveRateLimiter: parte da taxa da tabela e
+        se ajusta pela latência das buscas e pelos 429 (ver _check_retryable).
+        """
+        with self._lock:
+            bucket = self._buckets.get(county)
+            if bucket is not None:
+                return bucket
+            
+            # delay 0 = praticamente sem limite (100 req/s)
+            default_rpm = 60.0 / self.delay_between_requests if self.delay_between_requests > 0 else 6000.0
+            if self.use_mock:
+                # MockFetcher não acessa os sites: só o delay configurado
+                bucket = AsyncRateLimiter(default_rpm, capacity=1)
+            else:
+                system = self.county_mapper.get_county_info(county).get('assessor_system')
+                requests_per_minute, burst = _COUNTY_RATE_TABLE.get(system, (default_rpm, 1))
+                bucket = AdaptiveRateLimiter(requests_per_minute, capacity=burst)
+            self._buckets[county] = bucket
+            return bucket
+    
+    def _county_concurrency(self, county: str) -> int:
+        """Buscas simultâneas permitidas no condado (pelo sistema do assessor)."""
+        system = self.county_mapper.get_county_info(county).get('assessor_system')
+        return _SYSTEM_CONCURRENCY.get(system, _DEFAULT_COUNTY_CONCURRENCY)
     
     def _lookup_owner_with_retry(
         self,
         fetcher: CountyAssessorFetcher,
         address: str,
         lat: float,
-        lon: float
+        lon: float,
+        defer_cooldown: bool = False
     ) -> FetchResult:
         """
         Busca proprietário com retries em caso de erro.
         
-        Implementa backoff exponencial: 1s, 2s, 4s, 8s...
+        Retries via tenacity: backoff exponencial com jitter (1s, 2s, 4s...
+        até 30s) ou o Retry-After do site. Cada tentativa consome um token
+        do bucket do condado. Com defer_cooldown, um Retry-After acima de
+        _DEFER_COOLDOWN_SECONDS levanta _CountyCooldown em vez de dormir.
         """
-        for attempt in range(1, self.max_retries + 1):
-            try:
-                logger.debug(f"Tentativa {attempt}/{self.max_retries}")
-                
-                result = fetcher.lookup_owner(address, lat, lon)
-                
-                if result.success:
-                    return result
-                
-                # Se não teve sucesso mas também não é erro de rede, não retry
-                if "rate limit" not in result.error_message.lower():
-                    return result
-                
-                # Rate limited - aguardar antes de retry
-                if result.retry_after_seconds:
-                    wait_time = result.retry_after_seconds
-                else:
-                    wait_time = 2 ** (attempt - 1)  # Backoff exponencial
-                
-                logger.warning(f"⚠️ Rate limited. Aguardando {wait_time}s antes de retry...")
-                time.sleep(wait_time)
+        bucket = self._county_bucket(fetcher.county_name)
+        
+        def _attempt() -> FetchResult:
+            sleep_time = bucket.take()
+            if sleep_time > 0:
+                logger.debug("⏳ Rate limiting ({}): aguardando {:.2f}s", fetcher.county_name, sleep_time)
+                time.sleep(sleep_time)
             
-            except Exception as e:
-                logger.error(f"Erro na tentativa {attempt}: {e}")
-                
-                if attempt == self.max_retries:
-                    return FetchResult(
-                        success=False,
-                        error_message=f"Falha após {self.max_retries} tentativas: {e}"
-                    )
-                
-                # Backoff exponencial
-                wait_time = 2 ** (attempt - 1)
-                logger.debug(f"Aguardando {wait_time}s antes de retry...")
-                time.sleep(wait_time)
+            started = time.monotonic()
+            result = fetcher.fetch_owner(address, lat, lon)
+            self._record_latency(bucket, result, time.monotonic() - started)
+            
+            try:
+                return self._check_retryable(result, bucket)
+            except _RetryableLookup as e:
+                retry_after = e.result.retry_after_seconds or 0
+                if defer_cooldown and retry_after > _DEFER_COOLDOWN_SECONDS:
+                    raise _CountyCooldown(retry_after) from e
+                raise
+        
+        try:
+            return self._retrying(Retrying)(_attempt)
+        except RetryError as e:
+            return self._retries_exhausted(e)
+    
+    async def _alookup_owner_with_retry(
+        self,
+        fetcher: CountyAssessorFetcher,
+        address: str,
+        lat: float,
+        lon: float
+    ) -> FetchResult:
+        """
+        Versão assíncrona de _lookup_owner_with_retry.
+        
+        Usa lookup_owner_async e asyncio.sleep, então a espera de um
+        condado não bloqueia os demais.
+        """
+        bucket = self._county_bucket(fetcher.county_name)
+        
+        async def _attempt() -> FetchResult:
+            await bucket.wait()
+            started = time.monotonic()
+            result = await fetcher.lookup_owner_async(address, lat, lon)
+            self._record_latency(bucket, result, time.monotonic() - started)
+            return self._check_retryable(result, bucket)
+        
+        try:
+            return await self._retrying(AsyncRetrying)(_attempt)
+        except RetryError as e:
+            return self._retries_exhausted(e)
+    
+    def _retrying(self, retrying_cls):
+        """Política de retry (Retrying ou AsyncRetrying) com max_retries tentativas."""
+        return retrying_cls(
+            # _CountyCooldown sobe direto para o loop por condado
+            retry=retry_if_not_exception_type(_CountyCooldown),
+            stop=stop_after_attempt(self.max_retries),
+            wait=_retry_wait,
+            before_sleep=_log_retry
+        )
+    
+    @staticmethod
+    def _record_latency(bucket: AsyncRateLimiter, result: FetchResult, seconds: float):
+        """Alimenta o AutoThrottle do condado (só buscas que chegaram ao site)."""
+        if isinstance(bucket, AdaptiveRateLimiter) and result.error_message not in _TRANSIENT_ERRORS:
+            bucket.record_latency(seconds)
+    
+    @staticmethod
+    def _check_retryable(result: FetchResult, bucket: AsyncRateLimiter) -> FetchResult:
+        """
+        Devolve o resultado final ou levanta _RetryableLookup.
+        
+        Rate limit (429), falhas de transporte (timeout, conexão, 5xx) e falta
+        de capacidade (max_concurrency) justificam nova tentativa; circuito
+        aberto, demais 4xx e "não encontrado" voltam direto. Em rate limit o
+        bucket do condado é esvaziado antes da espera e, se adaptativo, tem
+        a taxa cortada (único ponto que chama on_rate_limited).
+        """
+        if result.success or result.error_message == "circuit_open":
+            return result
+        
+        if result.transport_error or result.error_message == "max_concurrency":
+            raise _RetryableLookup(result)
+        
+        # error_message pode vir None (FetchResult não exige mensagem)
+        if "rate limit" in (result.error_message or "").lower():
+            bucket.drain()
+            if isinstance(bucket, AdaptiveRateLimiter):
+                bucket.on_rate_limited()
+            raise _RetryableLookup(result)
+        
+        return result
+    
+    def _retries_exhausted(self, error: RetryError) -> FetchResult:
+        """Converte o RetryError do tenacity no FetchResult de falha."""
+        last_error = error.last_attempt.exception()
+        
+        if isinstance(last_error, _RetryableLookup):
+            return FetchResult(
+                success=False,
+                error_message=f"Esgotadas {self.max_retries} tentativas",
+                retry_after_seconds=last_error.result.retry_after_seconds,
+                # Site ainda fora do ar: o parque é adiado, não vai para revisão
+                transport_error=last_error.result.transport_error
+            )
         
+        logger.error("Erro na tentativa {}: {}", error.last_attempt.attempt_number, last_error)
         return FetchResult(
             success=False,
-            error_message=f"Esgotadas {self.max_retries} tentativas"
+            error_message=f"Falha após {self.max_retries} tentativas: {last_error}"
         )
     
     # ========================================================================
     # HELPERS - BANCO DE DADOS
     # ========================================================================
     
-    def _get_parks_without_owner(
-        self,
-        session: Session,
-        limit: Optional[int] = None
-    ) -> List[Dict]:
+    def _count_parks_without_owner(self, session: Session, limit: Optional[int] = None) -> int:
+        """Quantos parques ainda não têm proprietário (limitado a `limit`)."""
+        total = session.execute(_COUNT_PENDING_PARKS).scalar()
+        return min(total, limit) if limit else total
+    
+    def _iter_parks_without_owner(self, limit: Optional[int] = None) -> Iterator[ParkRow]:
         """
         Busca parques que ainda não têm proprietário identificado.
         
-        Returns:
-            Lista de dicionários com dados dos parques
-        """
-        query = """
-            SELECT 
-                id,
-                name,
-                ST_Y(geom::geometry) as latitude,
-                ST_X(geom::geometry) as longitude,
-                address,
-                city,
-                county,
-                zip_code
-            FROM parks_master
-            WHERE owner_id IS NULL
-              AND needs_manual_review = FALSE
-            ORDER BY id
-        """
-        
-        if limit:
-            query += f" LIMIT {limit}"
+        Lê em páginas de _PARKS_PAGE_SIZE por keyset (WHERE id > último id
+        ORDER BY id): memória constante, o primeiro parque sai sem esperar
+        o resultado inteiro e cada página usa uma conexão curta do pool,
+        devolvida antes das buscas - nenhuma transação fica aberta durante
+        o processamento.
         
-        result = session.execute(text(query))
+        Yields:
+            ParkRow de cada parque (county_name já resolvido pelo join
+            espacial quando a tabela counties existe)
+        """
+        after_id = 0
+        remaining = limit or None  # 0/None = sem limite
         
-        parks = []
-        for row in result:
-            # Índices corretos: 0=id, 1=name, 2=lat, 3=lon, 4=address, 5=city, 6=county, 7=zip_code
-            address_parts = [row[4] or '']  # address
-            if row[5]:  # city
-                address_parts.append(row[5])
-            if row[6]:  # county
-                address_parts.append(f"{row[6]} County")
-            if row[7]:  # zip_code
-                address_parts.append(row[7])
+        while remaining is None or remaining > 0:
+            page_size = min(_PARKS_PAGE_SIZE, remaining) if remaining else _PARKS_PAGE_SIZE
             
-            full_address = ', '.join(p for p in address_parts if p) or 'N/A'
+            with get_engine().connect() as conn:
+                query = _SELECT_PENDING_PARKS[self._has_counties_table(conn)]
+                rows = conn.execute(
+                    query,
+                    {'after_id': after_id, 'page_size': page_size}
+                ).fetchall()
             
-            parks.append({
-                'id': row[0],
-                'name': row[1],
-                'latitude': row[2],
-                'longitude': row[3],
-                'address': full_address,
-                'city': row[5] or '',
-                'county': row[6] or '',
-                'zip_code': row[7] or ''
-            })
-        
-        return parks
-    
-    def _get_park_by_id(self, session: Session, park_id: int) -> Optional[Dict]:
-        """Busca um parque específico por ID."""
-        query = """
-            SELECT 
-                id,
-                name,
-                ST_Y(geom::geometry) as latitude,
-                ST_X(geom::geometry) as longitude,
-                address,
-                city,
-                county,
-                zip_code
-            FROM parks_master
-            WHERE id = :park_id
-        """
-        
-        result = session.execute(text(query), {'park_id': park_id}).fetchone()
-        
-        if result:
-            # Construir endereço completo
-            address_parts = [result[4] or '']  # address
-            if result[5]:  # city
-                address_parts.append(result[5])
-            if result[6]:  # county
-                address_parts.append(f"{result[6]} County")
-            if result[7]:  # zip_code
-                address_parts.append(result[7])
+            for row in rows:
+                yield self._park_from_row(row)
             
-            full_address = ', '.join(p for p in address_parts if p) or 'N/A'
+            if len(rows) < page_size:
+                return
             
-            return {
-                'id': result[0],
-                'name': result[1],
-                'latitude': result[2],
-                'longitude': result[3],
-                'address': full_address,
-                'city': result[5] or '',
-                'county': result[6] or '',
-                'zip_code': result[7] or ''
-            }
+            after_id = rows[-1][0]
+            if remaining is not None:
+                remaining -= len(rows)
+    
+    def _get_park_by_id(self, session: Session, park_id: int) -> Optional[ParkRow]:
+        """Busca um parque específico por ID."""
+        query = _SELECT_PARK_BY_ID[self._has_counties_table(session)]
+        result = session.execute(query, {'park_id': park_id}).fetchone()
         
-        return None
+        return self._park_from_row(result) if result else None
     
-    def _save_owner(self, session: Session, owner_record: OwnerRecord) -> int:
-        """
-        Salva proprietário na tabela owners.
+    def _has_counties_table(self, conn) -> bool:
+        """A tabela counties (migrations/005_counties.sql) existe? Verifica uma vez."""
+        if self._counties_table is None:
+            self._counties_table = bool(conn.execute(_COUNTIES_TABLE_EXISTS).scalar())
+            if not self._counties_table:
+                logger.info("ℹ️ Tabela counties ausente - condados via CountyMapper")
         
-        Returns:
-            ID do proprietário salvo
+        return self._counties_table
+    
+    @staticmethod
+    def _park_from_row(row) -> ParkRow:
+        """Converte uma linha de _PARK_COLUMNS em ParkRow."""
+        # Índices: 0=id, 1=name, 2=lat, 3=lon, 4=full_address, 5=city, 6=county,
+        # 7=zip_code, 8=county_name (join com counties)
+        return ParkRow(
+            row[0],
+            row[1],
+            row[2],
+            row[3],
+            row[4] or 'N/A',
+            row[5] or '',
+            row[6] or '',
+            row[7] or '',
+            row[8]
+        )
+    
+    def _queue_attempt(self, park_id: int):
+        """Registra a tentativa de busca (last_lookup_attempt_at no checkpoint)."""
+        with self._lock:
+            self._pending_attempts.append(park_id)
+            if self._last_park_id is None or park_id > self._last_park_id:
+                self._last_park_id = park_id
+    
+    def _queue_owner(self, park_id: int, owner_record: OwnerRecord):
         """
-        # Verificar se já existe (por mailing address)
-        query = """
-            SELECT id FROM owners
-            WHERE full_name = :name
-              AND mailing_address->>'line1' = :addr_line1
-              AND mailing_address->>'zip' = :zip
-            LIMIT 1
+        Enfileira o proprietário do parque para o próximo flush.
+        
+        O INSERT em owners e o UPDATE em parks_master saem em lote no
+        checkpoint (ver _flush_pending_owners), não um round-trip por parque.
         """
+        with self._lock:
+            self._pending_owners.append((park_id, owner_record))
+    
+    @staticmethod
+    def _owner_key(owner_record: OwnerRecord) -> Tuple[str, str, str]:
+        """Identidade do proprietário (mesma do índice único idx_owners_identity)."""
+        return (
+            owner_record.owner_name_1,
+            owner_record.mailing_address_line1,
+            owner_record.mailing_zip
+        )
+    
+    def _flush_pending(
+        self,
+        session: Session,
+        owners: List[Tuple[int, OwnerRecord]],
+        review: List[int],
+        attempts: List[int]
+    ):
+        """Grava proprietários, marcações de revisão e tentativas retirados das filas."""
+        self._flush_pending_owners(session, owners)
         
-        existing = session.execute(text(query), {
-            'name': owner_record.owner_name_1,
-            'addr_line1': owner_record.mailing_address_line1,
-            'zip': owner_record.mailing_zip
-        }).fetchone()
+        if review:
+            self._mark_parks_for_manual_review(session, review)
         
-        if existing:
-            logger.debug(f"Proprietário já existe: ID {existing[0]}")
-            return existing[0]
+        if attempts:
+            session.execute(_MARK_LOOKUP_ATTEMPTS, {'park_ids': attempts})
+    
+    def _flush_pending_owners(self, session: Session, pending: List[Tuple[int, OwnerRecord]]):
+        """
+        Grava os proprietários enfileirados e liga cada parque ao seu owner.
         
-        # Inserir novo
-        insert_query = """
-            INSERT INTO owners (
-                full_name,
-                mailing_address,
-                metadata,
-                mail_eligible,
-                created_at
-            ) VALUES (
-                :name,
-                :mailing_address::jsonb,
-                :metadata::jsonb,
-                :mail_eligible,
-                NOW()
-            )
-            RETURNING id
+        Um INSERT multi-linha por lote de _OWNER_BATCH_SIZE com ON CONFLICT
+        no índice único (full_name, line1, zip): proprietários já existentes
+        só têm updated_at renovado e o RETURNING devolve o id de todos. Em
+        backfills (>= _COPY_MIN_OWNERS) os dados vão por COPY (ver
+        _copy_owners). Os parques são atualizados por um UPDATE em lote (ver
+        _update_park_owners).
         """
+        if not pending:
+            return
         
-        mailing_address_json = {
-            'line1': owner_record.mailing_address_line1,
-            'line2': owner_record.mailing_address_line2,
-            'city': owner_record.mailing_city,
-            'state': owner_record.mailing_state,
-            'zip': owner_record.mailing_zip,
-            'country': owner_record.mailing_country
-        }
+        # Um proprietário por chave: ON CONFLICT DO UPDATE não aceita a mesma
+        # linha duas vezes no mesmo INSERT
+        unique: Dict[Tuple[str, str, str], OwnerRecord] = {}
+        for _, owner_record in pending:
+            unique.setdefault(self._owner_key(owner_record), owner_record)
         
-        metadata_json = {
-            'source': owner_record.source,
-            'source_url': owner_record.source_url,
-            'fetched_at': owner_record.fetched_at.isoformat(),
-            'confidence_score': owner_record.confidence_score,
-            'parcel_id': owner_record.parcel_id,
-            'property_class_code': owner_record.property_class_code,
-            'notes': owner_record.notes
-        }
+        owner_ids: Dict[Tuple[str, str, str], int] = {}
+        records = list(unique.values())
+        if len(records) >= _COPY_MIN_OWNERS:
+            for row in self._copy_owners(session, records):
+                owner_ids[(row[1], row[2], row[3])] = row[0]
+            records = []
         
-        result = session.execute(text(insert_query), {
-            'name': owner_record.owner_name_1,
-            'mailing_address': str(mailing_address_json).replace("'", '"'),
-            'metadata': str(metadata_json).replace("'", '"'),
-            'mail_eligible': owner_record.is_valid_mailing_address
-        }).fetchone()
+        for start in range(0, len(records), _OWNER_BATCH_SIZE):
+            batch = records[start:start + _OWNER_BATCH_SIZE]
+            
+            params = {}
+            for i, owner_record in enumerate(batch):
+                for column, value in zip(_OWNER_DB_COLUMNS, owner_record.to_db_row()):
+                    params[f"{column}_{i}"] = value
+            
+            result = session.execute(_insert_owners_statement(len(batch)), params)
+            for row in result:
+                owner_ids[(row[1], row[2], row[3])] = row[0]
         
-        owner_id = result[0]
-        logger.debug(f"Novo proprietário inserido: ID {owner_id}")
+        # Com vários registros para o mesmo parque, o último prevalece
+        park_owner = {
+            park_id: owner_ids[self._owner_key(owner_record)]
+            for park_id, owner_record in pending
+        }
+        self._update_park_owners(session, list(park_owner.items()))
         
-        return owner_id
+        logger.info("💾 {} proprietário(s) gravado(s), {} parque(s) atualizado(s)", len(unique), len(park_owner))
     
-    def _update_park_owner(self, session: Session, park_id: int, owner_id: int):
-        """Atualiza parks_master com o owner_id."""
-        query = """
-            UPDATE parks_master
-            SET owner_id = :owner_id,
-                updated_at = NOW()
-            WHERE id = :park_id
+    def _copy_owners(self, session: Session, records: List[OwnerRecord]) -> List:
         """
+        Grava proprietários via COPY FROM STDIN (CSV) em owners_staging e
+        funde em owners com um único INSERT ... SELECT ... ON CONFLICT.
         
-        session.execute(text(query), {
-            'park_id': park_id,
-            'owner_id': owner_id
-        })
+        O COPY roda no cursor psycopg2 da própria conexão da sessão, então
+        fica na mesma transação do checkpoint.
+        
+        Returns:
+            Linhas (id, full_name, line1, zip) do RETURNING
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerows(owner_record.to_db_row() for owner_record in records)
+        buffer.seek(0)
         
-        logger.debug(f"Parque {park_id} atualizado com owner {owner_id}")
+        session.execute(_CREATE_OWNERS_STAGING)
+        cursor = session.connection().connection.cursor()
+        try:
+            cursor.copy_expert(_COPY_OWNERS_STAGING, buffer)
+        finally:
+            cursor.close()
+        
+        rows = session.execute(_MERGE_OWNERS_STAGING).fetchall()
+        logger.debug("COPY: {} proprietário(s) via owners_staging", len(records))
+        return rows
     
-    def _mark_for_manual_review(
-        self,
-        session: Session,
-        park_id: int,
-        reason: str
-    ):
-        """Marca parque para revisão manual."""
-        query = """
-            UPDATE parks_master
-            SET needs_manual_review = TRUE,
-                updated_at = NOW()
-            WHERE id = :park_id
+    def _update_park_owners(self, session: Session, pairs: List[Tuple[int, int]]):
+        """
+        Atualiza parks_master com os owner_ids: um UPDATE ... FROM (VALUES ...)
+        por lote de _OWNER_BATCH_SIZE, em vez de um UPDATE por parque.
         """
+        for start in range(0, len(pairs), _OWNER_BATCH_SIZE):
+            batch = pairs[start:start + _OWNER_BATCH_SIZE]
+            
+            params = {}
+            for i, (park_id, owner_id) in enumerate(batch):
+                params[f"park_id_{i}"] = park_id
+                params[f"owner_id_{i}"] = owner_id
+            
+            session.execute(_update_park_owners_statement(len(batch)), params)
+        
+        logger.debug("{} parque(s) atualizado(s) com owner", len(pairs))
+    
+    def _mark_for_manual_review(self, park_id: int, reason: str):
+        """Enfileira o parque para ser marcado para revisão manual no checkpoint."""
+        with self._lock:
+            self._pending_manual_review.append(park_id)
         
-        session.execute(text(query), {
-            'park_id': park_id
+        logger.debug("Parque {} será marcado para revisão manual ({})", park_id, reason)
+    
+    def _mark_parks_for_manual_review(self, session: Session, park_ids: List[int]):
+        """Marca parques para revisão manual (um único UPDATE)."""
+        session.execute(_MARK_MANUAL_REVIEW, {
+            'park_ids': park_ids
         })
         
-        logger.debug(f"Parque {park_id} marcado para revisão manual")
+        logger.debug("{} parque(s) marcado(s) para revisão manual", len(park_ids))
     
     # ========================================================================
     # RELATÓRIOS
@@ -599,43 +1386,46 @@ class OwnerLookupOrchestrator:
     
     def _print_final_report(self):
         """Imprime relatório final do processamento."""
-        duration = (self.stats['end_time'] - self.stats['start_time']).total_seconds()
+        duration = (self.stats.end_time - self.stats.start_time).total_seconds()
         
         logger.info("")
-        logger.info("=" * 80)
+        logger.info(_BANNER)
         logger.info("RELATÓRIO FINAL - OWNER LOOKUP")
-        logger.info("=" * 80)
-        logger.info(f"Total de parques: {self.stats['total_parks']}")
-        logger.info(f"Processados: {self.stats['processed']}")
-        logger.info(f"Sucessos: {self.stats['successful']}")
-        logger.info(f"Falhas: {self.stats['failed']}")
-        logger.info(f"Pulados: {self.stats['skipped']}")
+        logger.info(_BANNER)
+        logger.info(f"Total de parques: {self.stats.total_parks}")
+        logger.info(f"Processados: {self.stats.processed}")
+        logger.info(f"Sucessos: {self.stats.successful}")
+        logger.info(f"Falhas: {self.stats.failed}")
+        logger.info(f"Pulados: {self.stats.skipped}")
         logger.info("")
-        logger.info(f"Proprietários encontrados: {self.stats['owner_found']}")
-        logger.info(f"Proprietários NÃO encontrados: {self.stats['owner_not_found']}")
-        logger.info(f"Condados não identificados: {self.stats['county_not_identified']}")
+        logger.info(f"Proprietários encontrados: {self.stats.owner_found}")
+        logger.info(f"Proprietários NÃO encontrados: {self.stats.owner_not_found}")
+        logger.info(f"Condados não identificados: {self.stats.county_not_identified}")
         logger.info("")
         logger.info(f"Duração: {duration:.1f}s ({duration/60:.1f} minutos)")
         
-        if self.stats['processed'] > 0:
-            avg_time = duration / self.stats['processed']
+        if self.stats.processed > 0:
+            avg_time = duration / self.stats.processed
             logger.info(f"Tempo médio por parque: {avg_time:.2f}s")
             
-            success_rate = (self.stats['owner_found'] / self.stats['processed']) * 100
+            success_rate = (self.stats.owner_found / self.stats.processed) * 100
             logger.info(f"Taxa de sucesso: {success_rate:.1f}%")
         
-        logger.info("=" * 80)
+        logger.info(_BANNER)
         
         # Estatísticas por fetcher
         logger.info("\n📊 ESTATÍSTICAS POR CONDADO:")
-        logger.info("-" * 80)
+        logger.info(_RULE)
         for county, fetcher in self._fetcher_cache.items():
             stats = fetcher.get_statistics()
             logger.info(f"{county}:")
             for key, value in stats.items():
                 logger.info(f"  {key}: {value}")
         
-        logger.info("=" * 80)
+        logger.info(_BANNER)
+        
+        # Esvazia a fila do sink com enqueue=True antes de devolver o controle
+        logger.complete()
 
 
 # ============================================================================
@@ -659,6 +1449,10 @@ if __name__ == "__main__":
     parser.add_argument('--mock', action='store_true', help='Usar MockFetcher (desenvolvimento)')
     parser.add_argument('--limit', type=int, help='Limitar número de parques processados')
     parser.add_argument('--park-id', type=int, help='Processar apenas um parque específico')
+    parser.add_argument('--async', dest='use_async', action='store_true',
+                        help='Processar condados em paralelo (asyncio)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Condados processados em paralelo (threads)')
     
     args = parser.parse_args()
     
@@ -673,7 +1467,9 @@ if __name__ == "__main__":
     # Processar
     if args.park_id:
         orchestrator.process_single_park_by_id(args.park_id)
+    elif args.use_async:
+        asyncio.run(orchestrator.aprocess_all_parks(limit=args.limit))
     else:
-        orchestrator.process_all_parks(limit=args.limit)
+        orchestrator.process_all_parks(limit=args.limit, max_workers=args.workers)
     
     print("\n✅ Processamento concluído! Verifique os logs para detalhes.")
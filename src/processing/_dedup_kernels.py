@@ -0,0 +1,99 @@
+"""
+Kernels numéricos da deduplicação
+=================================
+
+Haversine escalar e busca de pares candidatos dentro de um bloco,
+compilados com Numba quando disponível (opcional: pip install numba).
+Compilados com nogil=True: blocos diferentes rodam em threads paralelas.
+
+find_pairs devolve (i, j, confidence) para cada par i < j com nome
+similar o bastante:
+- confidence >= 0: ambos têm coordenadas e estão dentro do raio
+- confidence == NEEDS_FALLBACK: falta coordenada - decidir por endereço/nome
+"""
+
+import math
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+EARTH_RADIUS_M = 6371000.0
+
+# Metros por grau de latitude: a distância de Haversine nunca é menor que
+# |Δlat| * METERS_PER_DEGREE_LAT, então o teste descarta pares com segurança
+METERS_PER_DEGREE_LAT = EARTH_RADIUS_M * math.pi / 180.0
+
+NEEDS_FALLBACK = -1.0
+
+
+def _haversine_m(lat1, lon1, lat2, lon2):
+    lat1 = math.radians(lat1)
+    lat2 = math.radians(lat2)
+    delta_lat = lat2 - lat1
+    delta_lon = math.radians(lon2 - lon1)
+
+    a = math.sin(delta_lat / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin(delta_lon / 2) ** 2
+    return EARTH_RADIUS_M * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+
+if NUMBA_AVAILABLE:
+    haversine_m = njit(cache=True, fastmath=True, nogil=True)(_haversine_m)
+else:
+    haversine_m = _haversine_m
+
+
+def _find_pairs(lat, lon, name_sim, name_thr, dist_thr):
+    n = len(lat)
+
+    count = 0
+    for i in range(n):
+        for j in range(i + 1, n):
+            if name_sim[i, j] >= name_thr:
+                count += 1
+
+    rows = np.empty(count, np.int64)
+    cols = np.empty(count, np.int64)
+    confidence = np.empty(count, np.float64)
+
+    k = 0
+    for i in range(n):
+        has_i = not (np.isnan(lat[i]) or np.isnan(lon[i]))
+        for j in range(i + 1, n):
+            similarity = name_sim[i, j]
+            if similarity < name_thr:
+                continue
+
+            if not has_i or np.isnan(lat[j]) or np.isnan(lon[j]):
+                rows[k] = i
+                cols[k] = j
+                confidence[k] = NEEDS_FALLBACK
+                k += 1
+                continue
+
+            # Limite inferior barato (só subtração): longe demais em latitude
+            if abs(lat[j] - lat[i]) * METERS_PER_DEGREE_LAT > dist_thr:
+                continue
+
+            distance = haversine_m(lat[i], lon[i], lat[j], lon[j])
+            if distance > dist_thr:
+                continue
+
+            distance_score = max(0.0, 100.0 - (distance / dist_thr * 100.0))
+            rows[k] = i
+            cols[k] = j
+            confidence[k] = (similarity * 0.7 + distance_score * 0.3) / 100.0
+            k += 1
+
+    return rows[:k], cols[:k], confidence[:k]
+
+
+if NUMBA_AVAILABLE:
+    find_pairs = njit(cache=True, nogil=True)(_find_pairs)
+else:
+    find_pairs = None
@@ -2,24 +2,340 @@
 Módulo de deduplicação e consolidação de dados.
 Processa dados de parks_raw e gera registros limpos em parks_master.
 """
+import contextvars
+import csv
+import functools
+import io
+import json
+import os
 import re
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional, Tuple, Set
 from dataclasses import dataclass
 from collections import defaultdict
 import pandas as pd
 import numpy as np
-from rapidfuzz import fuzz, process
+from rapidfuzz import fuzz, process, utils
 from loguru import logger
 from sqlalchemy import text
+from sqlalchemy.orm import Session
 import usaddress
 
-from ..database import get_db_session
+from ..database import get_db_session, get_engine
+from ._dedup_kernels import (
+    EARTH_RADIUS_M, METERS_PER_DEGREE_LAT, NEEDS_FALLBACK, find_pairs, haversine_m
+)
 
+try:
+    from sklearn.neighbors import BallTree
+    SKLEARN_AVAILABLE = True
+except ImportError:
+    SKLEARN_AVAILABLE = False
 
-@dataclass
+try:
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import connected_components
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+
+# Linhas por fatia da matriz de distâncias no blocking geográfico sem
+# scikit-learn (1024 x N float64 por vez, em vez da matriz N x N inteira)
+_DISTANCE_CHUNK_ROWS = 1024
+
+# Padrões de limpeza de endereços e nomes, compilados uma única vez
+_RE_SPECIAL = re.compile(r'[^\w\s,.-]')
+_RE_WS = re.compile(r'\s+')
+_RE_COMMAS = re.compile(r',+')
+
+# Fallback de abreviações quando o usaddress não consegue parsear: uma
+# única alternação, uma passada pela string
+_STREET_FALLBACK = {
+    'street': 'st',
+    'avenue': 'ave',
+    'boulevard': 'blvd',
+    'road': 'rd',
+}
+_RE_STREET_FALLBACK = re.compile(r'\b(' + '|'.join(map(re.escape, _STREET_FALLBACK)) + r')\b')
+
+# Palavras ignoradas na comparação de nomes de parques (tokens inteiros,
+# delimitados por espaço)
+_RE_NAME_STOPWORDS = re.compile(
+    r'(?<!\S)(?:rv|park|mobile|home|trailer|campground|resort|the|a|an|and|&)(?!\S)',
+    re.IGNORECASE
+)
+
+# Blocos avaliados em paralelo (threads: cdist do RapidFuzz e o kernel
+# Numba soltam o GIL)
+_DEDUP_WORKERS = os.cpu_count() or 4
+
+# parks_raw é lido em fatias por um cursor server-side
+_RAW_CHUNK_ROWS = 50_000
+
+_RAW_DTYPES = {
+    'rating': 'float32',
+    'total_reviews': 'Int32',
+    'source': 'category',
+    'zip_code': 'category',
+    'state': 'category',
+}
+
+_SELECT_UNPROCESSED_RAW = text("""
+    SELECT 
+        id, external_id, source, name, park_type,
+        address, city, state, zip_code, county,
+        latitude, longitude,
+        phone, website, email,
+        business_status, rating, total_reviews,
+        raw_data, tags
+    FROM parks_raw
+    WHERE is_processed = FALSE
+    ORDER BY id
+""")
+
+# IDs de parks_raw consumidos: COPY numa temp table + UPDATE ... FROM, em
+# vez de um IN (...) com todos os IDs no texto do SQL
+_CREATE_PROCESSED_IDS = text("""
+    CREATE TEMP TABLE IF NOT EXISTS processed_raw_ids (id BIGINT PRIMARY KEY) ON COMMIT DROP
+""")
+
+_COPY_PROCESSED_IDS = "COPY processed_raw_ids (id) FROM STDIN"
+
+_MARK_RAW_PROCESSED = text("""
+    UPDATE parks_raw
+    SET is_processed = TRUE
+    FROM processed_raw_ids
+    WHERE parks_raw.id = processed_raw_ids.id
+""")
+
+# Colunas dos registros master gravadas via COPY em parks_master_stage
+_MASTER_COLUMNS = (
+    'master_id', 'name', 'park_type', 'alternative_names',
+    'address', 'city', 'state', 'zip_code', 'county',
+    'latitude', 'longitude', 'location_confidence',
+    'phone', 'website', 'email',
+    'business_status', 'avg_rating', 'total_reviews',
+    'source_ids', 'confidence_score', 'data_quality_flags',
+    'needs_manual_review',
+)
+
+# Colunas serializadas como JSON no CSV (listas/dicts)
+_MASTER_JSON_COLUMNS = frozenset({'alternative_names', 'source_ids', 'data_quality_flags'})
+
+_CREATE_MASTER_STAGING = text("""
+    CREATE TEMP TABLE IF NOT EXISTS parks_master_stage (
+        master_id UUID,
+        name TEXT,
+        park_type TEXT,
+        alternative_names JSONB,
+        address TEXT,
+        city TEXT,
+        state TEXT,
+        zip_code TEXT,
+        county TEXT,
+        latitude DOUBLE PRECISION,
+        longitude DOUBLE PRECISION,
+        location_confidence DOUBLE PRECISION,
+        phone TEXT,
+        website TEXT,
+        email TEXT,
+        business_status TEXT,
+        avg_rating DOUBLE PRECISION,
+        total_reviews INTEGER,
+        source_ids JSONB,
+        confidence_score DOUBLE PRECISION,
+        data_quality_flags JSONB,
+        needs_manual_review BOOLEAN
+    ) ON COMMIT DROP
+""")
+
+_COPY_MASTER_STAGING = (
+    f"COPY parks_master_stage ({', '.join(_MASTER_COLUMNS)}) "
+    "FROM STDIN WITH (FORMAT CSV)"
+)
+
+# Um único INSERT ... SELECT para todos os registros, geometria montada no servidor
+_MERGE_MASTER_STAGING = text("""
+    INSERT INTO parks_master (
+        master_id, name, park_type, alternative_names,
+        address, city, state, zip_code, county,
+        latitude, longitude, geom, location_confidence,
+        phone, website, email,
+        business_status, avg_rating, total_reviews,
+        source_ids, confidence_score, data_quality_flags,
+        needs_manual_review
+    )
+    SELECT
+        master_id, name, park_type,
+        ARRAY(SELECT jsonb_array_elements_text(alternative_names)),
+        address, city, state, zip_code, county,
+        latitude, longitude,
+        CAST(ST_SetSRID(ST_MakePoint(longitude, latitude), 4326) AS geography),
+        location_confidence,
+        phone, website, email,
+        business_status, avg_rating, total_reviews,
+        source_ids, confidence_score, data_quality_flags,
+        needs_manual_review
+    FROM parks_master_stage
+    ON CONFLICT (master_id) DO UPDATE SET
+        updated_at = CURRENT_TIMESTAMP
+""")
+
+
+def haversine_meters(lat1, lon1, lat2, lon2):
+    """
+    Distância de Haversine em metros, vetorizada com NumPy.
+    
+    Aceita escalares ou arrays (com broadcasting): uma única passada de
+    ufuncs sobre buffers float64 em vez de uma chamada Python por par.
+    """
+    lat1 = np.radians(lat1)
+    lat2 = np.radians(lat2)
+    delta_lat = lat2 - lat1
+    delta_lon = np.radians(lon2) - np.radians(lon1)
+    
+    a = np.sin(delta_lat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(delta_lon / 2) ** 2
+    return EARTH_RADIUS_M * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+def haversine_matrix(lats1, lons1, lats2, lons2) -> np.ndarray:
+    """Matriz (n, m) de distâncias em metros entre dois conjuntos de pontos."""
+    lats1 = np.asarray(lats1, dtype=np.float64)[:, None]
+    lons1 = np.asarray(lons1, dtype=np.float64)[:, None]
+    lats2 = np.asarray(lats2, dtype=np.float64)[None, :]
+    lons2 = np.asarray(lons2, dtype=np.float64)[None, :]
+    return haversine_meters(lats1, lons1, lats2, lons2)
+
+
+def _neighbor_pairs(coords: np.ndarray, radius_meters: float) -> np.ndarray:
+    """
+    Pares (i, j), i < j, de pontos a até radius_meters um do outro.
+    
+    Com scikit-learn usa uma BallTree com métrica haversine (O(N log N)
+    consultas de raio); sem ele, a matriz de distâncias em fatias.
+    
+    Args:
+        coords: Array (n, 2) de (latitude, longitude) em graus
+        radius_meters: Raio de vizinhança
+        
+    Returns:
+        Array (k, 2) de índices em coords
+    """
+    if len(coords) == 0:
+        return np.empty((0, 2), dtype=np.int64)
+    
+    if SKLEARN_AVAILABLE:
+        radians_coords = np.radians(coords)
+        tree = BallTree(radians_coords, metric='haversine')
+        neighbors = tree.query_radius(radians_coords, r=radius_meters / EARTH_RADIUS_M)
+        
+        rows = np.repeat(np.arange(len(coords)), [len(n) for n in neighbors])
+        cols = np.concatenate(neighbors).astype(np.int64)
+    else:
+        row_chunks, col_chunks = [], []
+        for start in range(0, len(coords), _DISTANCE_CHUNK_ROWS):
+            chunk = coords[start:start + _DISTANCE_CHUNK_ROWS]
+            distances = haversine_matrix(chunk[:, 0], chunk[:, 1], coords[:, 0], coords[:, 1])
+            chunk_rows, chunk_cols = np.nonzero(distances <= radius_meters)
+            row_chunks.append(chunk_rows + start)
+            col_chunks.append(chunk_cols)
+        rows = np.concatenate(row_chunks)
+        cols = np.concatenate(col_chunks)
+    
+    upper = rows < cols
+    return np.column_stack((rows[upper], cols[upper]))
+
+
+def _connected_components(n: int, pairs: np.ndarray) -> np.ndarray:
+    """
+    Rótulo do componente conexo de cada um dos n nós.
+    
+    Com scipy usa csgraph.connected_components sobre a adjacência esparsa;
+    sem ele, union-find em Python.
+    
+    Args:
+        n: Número de nós
+        pairs: Array (k, 2) de arestas
+        
+    Returns:
+        Array de n rótulos (o menor índice de cada componente)
+    """
+    if SCIPY_AVAILABLE:
+        adjacency = coo_matrix(
+            (np.ones(len(pairs), dtype=np.int8), (pairs[:, 0], pairs[:, 1])),
+            shape=(n, n)
+        )
+        n_components, labels = connected_components(adjacency, directed=False)
+        
+        first = np.full(n_components, n, dtype=np.int64)
+        np.minimum.at(first, labels, np.arange(n))
+        return first[labels]
+    
+    parent = list(range(n))
+    
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+    
+    for i, j in pairs:
+        root_i, root_j = find(int(i)), find(int(j))
+        if root_i != root_j:
+            parent[max(root_i, root_j)] = min(root_i, root_j)
+    
+    return np.array([find(i) for i in range(n)], dtype=np.int64)
+
+
+def _find_pairs_numpy(lat, lon, name_sim, name_thr, dist_thr):
+    """Equivalente vetorizado de _dedup_kernels.find_pairs (sem Numba)."""
+    rows, cols = np.nonzero(np.triu(name_sim >= name_thr, 1))
+    
+    missing = np.isnan(lat[rows]) | np.isnan(lon[rows]) | np.isnan(lat[cols]) | np.isnan(lon[cols])
+    
+    # Haversine só para os pares que passam no limite inferior por latitude
+    near = np.abs(lat[cols] - lat[rows]) * METERS_PER_DEGREE_LAT <= dist_thr
+    distance = np.full(len(rows), np.inf)
+    distance[near] = haversine_meters(lat[rows[near]], lon[rows[near]], lat[cols[near]], lon[cols[near]])
+    keep = missing | (distance <= dist_thr)
+    
+    distance_score = np.maximum(0.0, 100.0 - (distance / dist_thr * 100.0))
+    confidence = np.where(
+        missing,
+        NEEDS_FALLBACK,
+        (name_sim[rows, cols] * 0.7 + distance_score * 0.3) / 100.0
+    )
+    return rows[keep], cols[keep], confidence[keep]
+
+
+@functools.lru_cache(maxsize=200_000)
+def _clean_address_string(address: str) -> str:
+    """clean_address_string cacheado: o mesmo endereço se repete entre fontes."""
+    # Remover caracteres especiais excessivos
+    address = _RE_SPECIAL.sub('', address)
+    
+    # Normalizar espaços
+    address = _RE_WS.sub(' ', address)
+    
+    # Remover vírgulas múltiplas
+    address = _RE_COMMAS.sub(',', address)
+    
+    return address.strip()
+
+
+@functools.lru_cache(maxsize=200_000)
+def _normalize_name(name: str) -> str:
+    """normalize_name cacheado: cada nome é comparado com todo o bloco."""
+    # Remover palavras comuns; minúsculas, pontuação e espaços ficam com o
+    # default_process do RapidFuzz (C++)
+    return utils.default_process(_RE_NAME_STOPWORDS.sub(' ', name))
+
+
+@dataclass(frozen=True)
 class NormalizedAddress:
-    """Representa um endereço normalizado."""
+    """Representa um endereço normalizado (imutável: compartilhado pelo cache)."""
     street_number: Optional[str] = None
     street_name: Optional[str] = None
     street_type: Optional[str] = None  # St, Ave, Blvd, etc
@@ -64,16 +380,7 @@ class AddressNormalizer:
         if not address:
             return ''
         
-        # Remover caracteres especiais excessivos
-        address = re.sub(r'[^\w\s,.-]', '', address)
-        
-        # Normalizar espaços
-        address = re.sub(r'\s+', ' ', address)
-        
-        # Remover vírgulas múltiplas
-        address = re.sub(r',+', ',', address)
-        
-        return address.strip()
+        return _clean_address_string(address)
     
     @staticmethod
     def parse_address(address_str: str) -> NormalizedAddress:
@@ -89,72 +396,80 @@ class AddressNormalizer:
         if not address_str or pd.isna(address_str):
             return NormalizedAddress()
         
-        # Limpar endereço
-        cleaned = AddressNormalizer.clean_address_string(str(address_str))
+        return _parse_address(str(address_str))
+
+
+@functools.lru_cache(maxsize=100_000)
+def _parse_address(address_str: str) -> NormalizedAddress:
+    """
+    parse_address cacheado por string: o mesmo endereço chega de várias
+    fontes e o usaddress.tag é o passo mais caro da etapa 2.
+    """
+    # Limpar endereço
+    cleaned = AddressNormalizer.clean_address_string(address_str)
+    
+    if not cleaned:
+        return NormalizedAddress()
+    
+    try:
+        # Parsear com usaddress
+        parsed, address_type = usaddress.tag(cleaned)
         
-        if not cleaned:
-            return NormalizedAddress()
+        # Extrair componentes
+        street_number = parsed.get('AddressNumber', '')
         
-        try:
-            # Parsear com usaddress
-            parsed, address_type = usaddress.tag(cleaned)
-            
-            # Extrair componentes
-            street_number = parsed.get('AddressNumber', '')
-            
-            # Montar nome da rua
-            street_parts = []
-            for key in ['StreetNamePreDirectional', 'StreetName', 'StreetNamePostType']:
-                if key in parsed:
-                    street_parts.append(parsed[key])
-            
-            street_name = ' '.join(street_parts) if street_parts else ''
-            
-            # Tipo de rua
-            street_type = parsed.get('StreetNamePostType', '')
-            if street_type:
-                street_type = AddressNormalizer.normalize_street_type(street_type)
-            
-            city = parsed.get('PlaceName', '')
-            state = parsed.get('StateName', '')
-            zip_code = parsed.get('ZipCode', '')
-            
-            # Criar versão normalizada completa
-            normalized_parts = []
-            if street_number:
-                normalized_parts.append(street_number)
-            if street_name:
-                normalized_parts.append(street_name.lower())
-            if street_type and street_type not in street_name.lower():
-                normalized_parts.append(street_type)
-            
-            full_normalized = ' '.join(normalized_parts)
-            
-            return NormalizedAddress(
-                street_number=street_number or None,
-                street_name=street_name or None,
-                street_type=street_type or None,
-                city=city or None,
-                state=state or None,
-                zip_code=zip_code or None,
-                full_normalized=full_normalized if full_normalized else None,
-                parse_success=True
-            )
-            
-        except Exception as e:
-            logger.debug(f"Falha ao parsear endereço '{address_str}': {e}")
-            
-            # Fallback: normalização básica
-            basic_normalized = cleaned.lower()
-            basic_normalized = re.sub(r'\bstreet\b', 'st', basic_normalized)
-            basic_normalized = re.sub(r'\bavenue\b', 'ave', basic_normalized)
-            basic_normalized = re.sub(r'\bboulevard\b', 'blvd', basic_normalized)
-            basic_normalized = re.sub(r'\broad\b', 'rd', basic_normalized)
-            
-            return NormalizedAddress(
-                full_normalized=basic_normalized,
-                parse_success=False
-            )
+        # Montar nome da rua
+        street_parts = []
+        for key in ['StreetNamePreDirectional', 'StreetName', 'StreetNamePostType']:
+            if key in parsed:
+                street_parts.append(parsed[key])
+        
+        street_name = ' '.join(street_parts) if street_parts else ''
+        
+        # Tipo de rua
+        street_type = parsed.get('StreetNamePostType', '')
+        if street_type:
+            street_type = AddressNormalizer.normalize_street_type(street_type)
+        
+        city = parsed.get('PlaceName', '')
+        state = parsed.get('StateName', '')
+        zip_code = parsed.get('ZipCode', '')
+        
+        # Criar versão normalizada completa
+        normalized_parts = []
+        if street_number:
+            normalized_parts.append(street_number)
+        if street_name:
+            normalized_parts.append(street_name.lower())
+        if street_type and street_type not in street_name.lower():
+            normalized_parts.append(street_type)
+        
+        full_normalized = ' '.join(normalized_parts)
+        
+        return NormalizedAddress(
+            street_number=street_number or None,
+            street_name=street_name or None,
+            street_type=street_type or None,
+            city=city or None,
+            state=state or None,
+            zip_code=zip_code or None,
+            full_normalized=full_normalized if full_normalized else None,
+            parse_success=True
+        )
+        
+    except Exception as e:
+        logger.debug(f"Falha ao parsear endereço '{address_str}': {e}")
+        
+        # Fallback: normalização básica
+        basic_normalized = _RE_STREET_FALLBACK.sub(
+            lambda match: _STREET_FALLBACK[match.group(1)],
+            cleaned.lower()
+        )
+        
+        return NormalizedAddress(
+            full_normalized=basic_normalized,
+            parse_success=False
+        )
 
 
 class GeographicBlocker:
@@ -172,19 +487,7 @@ class GeographicBlocker:
         Returns:
             Distância em metros
         """
-        from math import radians, sin, cos, sqrt, atan2
-        
-        R = 6371000  # Raio da Terra em metros
-        
-        lat1_rad = radians(lat1)
-        lat2_rad = radians(lat2)
-        delta_lat = radians(lat2 - lat1)
-        delta_lon = radians(lon2 - lon1)
-        
-        a = sin(delta_lat/2)**2 + cos(lat1_rad) * cos(lat2_rad) * sin(delta_lon/2)**2
-        c = 2 * atan2(sqrt(a), sqrt(1-a))
-        
-        return R * c
+        return haversine_m(lat1, lon1, lat2, lon2)
     
     @staticmethod
     def block_by_zip_and_proximity(df: pd.DataFrame, proximity_meters: float = 500) -> Dict[str, List[int]]:
@@ -200,55 +503,33 @@ class GeographicBlocker:
         """
         blocks = defaultdict(list)
         
-        # Primeiro blocking: por ZIP code
-        for zip_code, group in df.groupby('zip_code', dropna=False):
-            if pd.notna(zip_code) and zip_code:
-                block_key = f"zip_{zip_code}"
-                blocks[block_key].extend(group.index.tolist())
+        # Primeiro blocking: por ZIP code (posições direto do groupby, sem
+        # materializar um sub-DataFrame por ZIP)
+        zip_positions = df.groupby('zip_code', dropna=True, observed=True, sort=False).indices
+        for zip_code, positions in zip_positions.items():
+            if zip_code:
+                blocks[f"zip_{zip_code}"].extend(df.index[positions].tolist())
         
         # Segundo blocking: registros sem ZIP mas com coordenadas próximas
         no_zip = df[df['zip_code'].isna() | (df['zip_code'] == '')]
         
         if len(no_zip) > 0:
-            # Agrupar por proximidade geográfica
-            processed = set()
+            has_geo = no_zip['latitude'].notna() & no_zip['longitude'].notna()
             
-            for idx in no_zip.index:
-                if idx in processed:
-                    continue
-                
-                row = no_zip.loc[idx]
-                
-                if pd.isna(row['latitude']) or pd.isna(row['longitude']):
-                    # Sem coordenadas, bloco individual
-                    blocks[f"no_geo_{idx}"].append(idx)
-                    processed.add(idx)
-                    continue
-                
-                # Encontrar todos os vizinhos próximos
-                block_members = [idx]
-                processed.add(idx)
-                
-                for other_idx in no_zip.index:
-                    if other_idx in processed:
-                        continue
-                    
-                    other_row = no_zip.loc[other_idx]
-                    
-                    if pd.isna(other_row['latitude']) or pd.isna(other_row['longitude']):
-                        continue
-                    
-                    distance = GeographicBlocker.calculate_distance_meters(
-                        float(row['latitude']), float(row['longitude']),
-                        float(other_row['latitude']), float(other_row['longitude'])
-                    )
-                    
-                    if distance <= proximity_meters:
-                        block_members.append(other_idx)
-                        processed.add(other_idx)
-                
-                if block_members:
-                    blocks[f"geo_cluster_{idx}"].extend(block_members)
+            # Sem coordenadas, bloco individual
+            for idx in no_zip.index[~has_geo]:
+                blocks[f"no_geo_{idx}"].append(idx)
+            
+            # Agrupar por proximidade geográfica: pares de vizinhos dentro
+            # do raio (BallTree) e componentes conexos desses pares
+            geo = no_zip[has_geo]
+            coords = geo[['latitude', 'longitude']].to_numpy(dtype=np.float64)
+            
+            if len(coords) > 0:
+                pairs = _neighbor_pairs(coords, proximity_meters)
+                labels = _connected_components(len(coords), pairs)
+                for idx, label in zip(geo.index, labels):
+                    blocks[f"geo_cluster_{geo.index[label]}"].append(idx)
         
         logger.info(f"Criados {len(blocks)} blocos para processamento")
         
@@ -264,20 +545,7 @@ class DuplicateDetector:
         if not name or pd.isna(name):
             return ''
         
-        name = str(name).lower()
-        
-        # Remover palavras comuns
-        stopwords = ['rv', 'park', 'mobile', 'home', 'trailer', 'campground', 
-                     'resort', 'the', 'a', 'an', 'and', '&']
-        
-        words = name.split()
-        words = [w for w in words if w not in stopwords]
-        
-        # Remover pontuação
-        name = ' '.join(words)
-        name = re.sub(r'[^\w\s]', '', name)
-        
-        return name.strip()
+        return _normalize_name(str(name))
     
     @staticmethod
     def are_duplicates(
@@ -330,9 +598,15 @@ class DuplicateDetector:
             return True, confidence / 100.0
         
         # Sem coordenadas, basear apenas no nome e endereço
-        addr1_norm = row1.get('address_normalized', '')
-        addr2_norm = row2.get('address_normalized', '')
-        
+        return DuplicateDetector._match_without_coords(
+            name_similarity,
+            row1.get('address_normalized', ''),
+            row2.get('address_normalized', '')
+        )
+    
+    @staticmethod
+    def _match_without_coords(name_similarity: float, addr1_norm: Any, addr2_norm: Any) -> Tuple[bool, float]:
+        """Decide um par de nomes similares sem coordenadas nos dois lados."""
         if addr1_norm and addr2_norm:
             addr_similarity = fuzz.ratio(addr1_norm, addr2_norm)
             
@@ -347,13 +621,29 @@ class DuplicateDetector:
         return False, 0.0
     
     @staticmethod
-    def find_duplicate_groups(df: pd.DataFrame, block_indices: List[int]) -> List[List[int]]:
+    def find_duplicate_groups(
+        df: pd.DataFrame,
+        block_indices: List[int],
+        name_threshold: float = 85.0,
+        distance_threshold: float = 500,
+        workers: int = -1
+    ) -> List[List[int]]:
         """
         Encontra grupos de duplicatas dentro de um bloco.
         
+        Mesmas regras de are_duplicates, mas o bloco inteiro é avaliado de
+        uma vez: matriz de similaridade dos nomes (rapidfuzz.process.cdist)
+        + kernel de pares (Numba, se disponível) em vez de uma chamada
+        Python por par. Os grupos são os componentes conexos dos pares
+        duplicados.
+        
         Args:
             df: DataFrame completo
             block_indices: Índices do bloco a processar
+            name_threshold: Similaridade mínima do nome (0-100)
+            distance_threshold: Distância máxima em metros
+            workers: Threads do cdist (-1 = todos os núcleos; 1 quando os
+                próprios blocos já rodam em paralelo)
             
         Returns:
             Lista de grupos, onde cada grupo é uma lista de índices duplicados
@@ -361,37 +651,52 @@ class DuplicateDetector:
         if len(block_indices) <= 1:
             return [[idx] for idx in block_indices]
         
-        # Grafo de duplicatas
-        groups = []
-        processed = set()
+        # Colunas do bloco como arrays (SoA), sem materializar um sub-DataFrame
+        positions = df.index.get_indexer(block_indices)
+        n = len(positions)
         
-        block_df = df.loc[block_indices]
+        def column(name: str) -> np.ndarray:
+            if name not in df:
+                return np.full(n, '', dtype=object)
+            return df[name].to_numpy()[positions]
         
-        for idx in block_indices:
-            if idx in processed:
-                continue
-            
-            group = [idx]
-            processed.add(idx)
-            
-            row1 = block_df.loc[idx]
-            
-            # Comparar com todos os outros não processados no bloco
-            for other_idx in block_indices:
-                if other_idx in processed:
-                    continue
-                
-                row2 = block_df.loc[other_idx]
-                
-                is_dup, confidence = DuplicateDetector.are_duplicates(row1, row2)
-                
-                if is_dup:
-                    group.append(other_idx)
-                    processed.add(other_idx)
-            
-            groups.append(group)
+        names = [DuplicateDetector.normalize_name(name) for name in column('name')]
+        lat = pd.to_numeric(column('latitude'), errors='coerce').astype(np.float64)
+        lon = pd.to_numeric(column('longitude'), errors='coerce').astype(np.float64)
+        addresses = column('address_normalized')
+        
+        # Matriz inteira numa chamada C++ multithread; pares abaixo do corte
+        # são podados lá dentro (viram 0). float32 e não uint8: o arredondamento
+        # levaria 94.7 a 95 e mudaria a regra de nome sem confirmação geográfica
+        name_sim = process.cdist(
+            names, names,
+            scorer=fuzz.token_sort_ratio,
+            score_cutoff=name_threshold,
+            dtype=np.float32,
+            workers=workers
+        )
+        empty = np.array([not name for name in names])
+        name_sim[empty, :] = 0
+        name_sim[:, empty] = 0
+        
+        pair_finder = find_pairs if find_pairs is not None else _find_pairs_numpy
+        rows, cols, confidence = pair_finder(lat, lon, name_sim, name_threshold, distance_threshold)
         
-        return groups
+        # Pares sem coordenadas dos dois lados: decidir por endereço/nome
+        keep = confidence != NEEDS_FALLBACK
+        for k in np.flatnonzero(~keep):
+            i, j = rows[k], cols[k]
+            keep[k] = DuplicateDetector._match_without_coords(name_sim[i, j], addresses[i], addresses[j])[0]
+        
+        # Grupos = componentes conexos do grafo de duplicatas (transitivo:
+        # A~B e B~C juntam A, B e C mesmo que A e C não passem no limiar)
+        labels = _connected_components(n, np.column_stack((rows[keep], cols[keep])))
+        
+        groups = defaultdict(list)
+        for idx, label in zip(block_indices, labels.tolist()):
+            groups[label].append(idx)
+        
+        return list(groups.values())
 
 
 class MasterRecordBuilder:
@@ -422,11 +727,23 @@ class MasterRecordBuilder:
                 return val
         return None
     
+    @staticmethod
+    def source_priority(sources: pd.Series) -> pd.Series:
+        """Prioridade de cada fonte (fontes desconhecidas = 0), vetorizada."""
+        # astype(float) antes do fillna: com source categórica o map devolve
+        # outra categórica, que não aceita 0 fora das categorias
+        priority = sources.map(MasterRecordBuilder.SOURCE_PRIORITY).astype(np.float64)
+        return priority.fillna(0).astype(np.int8)
+    
     @staticmethod
     def consolidate_duplicate_group(df: pd.DataFrame, group_indices: List[int]) -> Dict[str, Any]:
         """
         Consolida um grupo de registros duplicados em um único registro master.
         
+        O pipeline usa consolidate_groups (todos os grupos num groupby);
+        esta versão, um grupo por vez, fica como implementação de referência
+        das regras e é comparada com ela em tests/test_deduplication.py.
+        
         Args:
             df: DataFrame completo
             group_indices: Índices dos registros duplicados
@@ -434,16 +751,14 @@ class MasterRecordBuilder:
         Returns:
             Dicionário com dados consolidados
         """
-        group_df = df.loc[group_indices].copy()
+        group_df = df.loc[group_indices]
         
-        # Ordenar por prioridade de fonte
-        group_df['_source_priority'] = group_df['source'].map(
-            lambda x: MasterRecordBuilder.SOURCE_PRIORITY.get(x, 0)
-        )
-        group_df = group_df.sort_values('_source_priority', ascending=False)
-        
-        # Registro principal (fonte com maior prioridade)
-        primary = group_df.iloc[0]
+        # Ordenar por prioridade de fonte (coluna pré-calculada no pipeline)
+        if '_source_priority' not in group_df:
+            group_df = group_df.assign(
+                _source_priority=MasterRecordBuilder.source_priority(group_df['source'])
+            )
+        group_df = group_df.sort_values('_source_priority', ascending=False, kind='stable')
         
         # Consolidar dados
         master = {
@@ -516,27 +831,29 @@ class MasterRecordBuilder:
             'needs_manual_review': False
         }
         
-        # Calcular coordenadas (média de fontes confiáveis)
-        valid_coords = group_df[
-            group_df['latitude'].notna() & group_df['longitude'].notna()
-        ]
+        # Calcular coordenadas (média de fontes confiáveis), direto nos arrays
+        lat = group_df['latitude'].to_numpy(dtype=np.float64, na_value=np.nan)
+        lon = group_df['longitude'].to_numpy(dtype=np.float64, na_value=np.nan)
+        located = ~(np.isnan(lat) | np.isnan(lon))
         
-        if len(valid_coords) > 0:
-            master['latitude'] = float(valid_coords['latitude'].mean())
-            master['longitude'] = float(valid_coords['longitude'].mean())
-            master['location_confidence'] = min(1.0, len(valid_coords) / len(group_df))
+        if located.any():
+            master['latitude'] = float(lat[located].mean())
+            master['longitude'] = float(lon[located].mean())
+            master['location_confidence'] = min(1.0, int(located.sum()) / len(group_df))
         
         # Avaliações
-        valid_ratings = group_df[group_df['rating'].notna()]
-        if len(valid_ratings) > 0:
-            master['avg_rating'] = float(valid_ratings['rating'].mean())
-            master['total_reviews'] = int(group_df['total_reviews'].sum())
+        ratings = group_df['rating'].to_numpy(dtype=np.float64, na_value=np.nan)
+        if not np.isnan(ratings).all():
+            master['avg_rating'] = float(np.nanmean(ratings))
+            master['total_reviews'] = int(np.nansum(
+                group_df['total_reviews'].to_numpy(dtype=np.float64, na_value=np.nan)
+            ))
         
         # Source IDs
         master['source_ids'] = [
-            {'source': row['source'], 'external_id': row['external_id']}
-            for _, row in group_df.iterrows()
-            if pd.notna(row['external_id'])
+            {'source': source, 'external_id': external_id}
+            for source, external_id in zip(group_df['source'].to_numpy(), group_df['external_id'].to_numpy())
+            if pd.notna(external_id)
         ]
         
         # Confidence score baseado em número de fontes e qualidade dos dados
@@ -566,6 +883,178 @@ class MasterRecordBuilder:
         )
         
         return master
+    
+    @staticmethod
+    def consolidate_groups(df: pd.DataFrame, groups: List[List[int]]) -> List[Dict[str, Any]]:
+        """
+        Consolida todos os grupos de uma vez.
+        
+        Mesmas regras de consolidate_duplicate_group, mas as reduções
+        (melhor valor por prioridade de fonte, médias, somas, contagem de
+        fontes) saem de um groupby sobre todas as linhas; só o
+        pós-processamento escalar (UUID, score, flags) fica em Python.
+        
+        Args:
+            df: DataFrame completo
+            groups: Grupos de índices duplicados (cada linha em um só grupo)
+            
+        Returns:
+            Lista de dicionários com dados consolidados, na ordem de groups
+        """
+        if not groups:
+            return []
+        
+        work = df.loc[[idx for group in groups for idx in group]].copy()
+        work['_group'] = np.repeat(np.arange(len(groups)), [len(group) for group in groups])
+        
+        # Ordenar por grupo e prioridade de fonte (empates na ordem do grupo)
+        if '_source_priority' not in work:
+            work['_source_priority'] = MasterRecordBuilder.source_priority(work['source'])
+        work = work.sort_values(['_group', '_source_priority'], ascending=[True, False], kind='stable')
+        group_of = work['_group']
+        
+        # Melhor valor = primeiro não nulo e não vazio na ordem de prioridade
+        text_columns = [
+            'name', 'park_type', 'address', 'city', 'state', 'zip_code', 'county',
+            'phone', 'website', 'email', 'business_status'
+        ]
+        values = work[text_columns].mask(work[text_columns] == '')
+        best = values.groupby(group_of).first()
+        
+        # Contato: preferir Google Places
+        contact = ['phone', 'website']
+        google = values[work['source'] == 'google_places'].groupby(group_of)[contact].first()
+        best[contact] = google.reindex(best.index).combine_first(best[contact])
+        
+        alternative_names = values['name'].dropna().groupby(group_of).unique()
+        
+        # Coordenadas: média das linhas com latitude e longitude
+        has_coords = work['latitude'].notna() & work['longitude'].notna()
+        coords = work.loc[has_coords, ['latitude', 'longitude']].astype(np.float64).groupby(group_of[has_coords])
+        coord_mean = coords.mean()
+        coord_count = coords.size()
+        group_size = group_of.value_counts()
+        
+        # Avaliações: média das notas; reviews só contam se houver nota
+        rated = work['rating'].notna()
+        avg_rating = work.loc[rated, 'rating'].astype(np.float64).groupby(group_of[rated]).mean()
+        total_reviews = pd.to_numeric(work['total_reviews'], errors='coerce').groupby(group_of).sum()
+        
+        num_sources = work['source'].groupby(group_of).nunique(dropna=False)
+        
+        source_ids = defaultdict(list)
+        has_external_id = work['external_id'].notna().to_numpy()
+        for group_id, source, external_id in zip(
+            group_of.to_numpy()[has_external_id],
+            work['source'].to_numpy()[has_external_id],
+            work['external_id'].to_numpy()[has_external_id]
+        ):
+            source_ids[group_id].append({'source': source, 'external_id': external_id})
+        
+        def scalar(series: pd.Series, group_id: int) -> Any:
+            value = series.get(group_id)
+            return None if value is None or pd.isna(value) else value
+        
+        masters = []
+        for group_id in range(len(groups)):
+            latitude = scalar(coord_mean['latitude'], group_id)
+            longitude = scalar(coord_mean['longitude'], group_id)
+            rating = scalar(avg_rating, group_id)
+            
+            master = {
+                'master_id': str(uuid.uuid4()),
+                'name': scalar(best['name'], group_id),
+                'park_type': scalar(best['park_type'], group_id),
+                'alternative_names': [str(name) for name in alternative_names.get(group_id, [])],
+                'address': scalar(best['address'], group_id),
+                'city': scalar(best['city'], group_id),
+                'state': scalar(best['state'], group_id),
+                'zip_code': scalar(best['zip_code'], group_id),
+                'county': scalar(best['county'], group_id),
+                'latitude': float(latitude) if latitude is not None else None,
+                'longitude': float(longitude) if longitude is not None else None,
+                'location_confidence': (
+                    min(1.0, coord_count[group_id] / group_size[group_id])
+                    if latitude is not None else 0.0
+                ),
+                'phone': scalar(best['phone'], group_id),
+                'website': scalar(best['website'], group_id),
+                'email': scalar(best['email'], group_id),
+                'business_status': scalar(best['business_status'], group_id) or 'OPERATIONAL',
+                'avg_rating': float(rating) if rating is not None else None,
+                'total_reviews': int(total_reviews[group_id]) if rating is not None else 0,
+                'source_ids': source_ids[group_id],
+            }
+            
+            # Confidence score baseado em número de fontes e qualidade dos dados
+            sources = int(num_sources[group_id])
+            has_coords_score = 1.0 if master['latitude'] else 0.0
+            has_contact = 0.5 if (master['phone'] or master['website']) else 0.0
+            
+            master['confidence_score'] = min(1.0, (
+                (sources / 3) * 0.4 +
+                has_coords_score * 0.4 +
+                has_contact * 0.2
+            ))
+            
+            master['data_quality_flags'] = {
+                'num_sources': sources,
+                'has_coordinates': bool(master['latitude']),
+                'has_contact_info': bool(master['phone'] or master['website']),
+                'has_reviews': master['total_reviews'] > 0
+            }
+            
+            master['needs_manual_review'] = (
+                not master['latitude'] or
+                not master['address'] or
+                master['confidence_score'] < 0.5
+            )
+            
+            masters.append(master)
+        
+        return masters
+
+
+def _copy_master_records(session: Session, master_records: List[Dict[str, Any]]) -> int:
+    """
+    Grava registros master via COPY FROM STDIN (CSV) em parks_master_stage
+    e os insere em parks_master com um único INSERT ... SELECT.
+    
+    O COPY roda no cursor psycopg2 da própria conexão da sessão, então
+    fica na mesma transação que marca parks_raw como processado.
+    
+    Returns:
+        Número de linhas inseridas/atualizadas
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for master in master_records:
+        writer.writerow(
+            json.dumps(master[column]) if column in _MASTER_JSON_COLUMNS else master[column]
+            for column in _MASTER_COLUMNS
+        )
+    buffer.seek(0)
+    
+    session.execute(_CREATE_MASTER_STAGING)
+    cursor = session.connection().connection.cursor()
+    try:
+        cursor.copy_expert(_COPY_MASTER_STAGING, buffer)
+    finally:
+        cursor.close()
+    
+    return session.execute(_MERGE_MASTER_STAGING).rowcount
+
+
+def _mark_raw_processed(session: Session, raw_ids: List[int]):
+    """Marca os registros de parks_raw como processados (COPY dos IDs + UPDATE ... FROM)."""
+    session.execute(_CREATE_PROCESSED_IDS)
+    cursor = session.connection().connection.cursor()
+    try:
+        cursor.copy_expert(_COPY_PROCESSED_IDS, io.StringIO('\n'.join(map(str, raw_ids))))
+    finally:
+        cursor.close()
+    
+    session.execute(_MARK_RAW_PROCESSED)
 
 
 def process_parks_raw_to_master():
@@ -587,40 +1076,41 @@ def process_parks_raw_to_master():
     # 1. Carregar dados brutos
     logger.info("\n1. Carregando dados de parks_raw...")
     
-    with get_db_session() as session:
-        result = session.execute(text("""
-            SELECT 
-                id, external_id, source, name, park_type,
-                address, city, state, zip_code, county,
-                latitude, longitude,
-                phone, website, email,
-                business_status, rating, total_reviews,
-                raw_data, tags
-            FROM parks_raw
-            WHERE is_processed = FALSE
-            ORDER BY id
-        """))
-        
-        rows = result.fetchall()
-        columns = result.keys()
-    
-    if not rows:
+    # Cursor server-side + fatias: sem a lista de linhas inteira em memória
+    # ao lado do DataFrame
+    with get_engine().connect() as conn:
+        chunks = list(pd.read_sql(
+            _SELECT_UNPROCESSED_RAW,
+            conn.execution_options(stream_results=True),
+            chunksize=_RAW_CHUNK_ROWS
+        ))
+    
+    df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+    
+    if df.empty:
         logger.warning("Nenhum registro encontrado em parks_raw para processar")
         return
     
-    df = pd.DataFrame(rows, columns=columns)
     logger.info(f"Carregados {len(df)} registros de parks_raw")
     
+    # Tipos compactos: categorias para colunas de poucos valores distintos.
+    # latitude/longitude ficam float64 (parks_master guarda 7 casas decimais)
+    df = df.astype(_RAW_DTYPES)
+    
+    # Prioridade de fonte calculada uma vez para todas as linhas
+    df['_source_priority'] = MasterRecordBuilder.source_priority(df['source'])
+    
     # 2. Normalizar endereços
     logger.info("\n2. Normalizando endereços...")
     
     normalizer = AddressNormalizer()
     
-    def normalize_address_row(row):
-        normalized = normalizer.parse_address(row['address'])
-        return normalized.full_normalized if normalized.full_normalized else row['address']
-    
-    df['address_normalized'] = df.apply(normalize_address_row, axis=1)
+    # Parsear cada endereço distinto uma vez e mapear de volta para as linhas
+    mapping = {
+        address: normalizer.parse_address(address).full_normalized or address
+        for address in df['address'].dropna().unique()
+    }
+    df['address_normalized'] = df['address'].map(mapping)
     
     logger.info(f"✓ {len(df[df['address_normalized'].notna()])} endereços normalizados")
     
@@ -636,9 +1126,19 @@ def process_parks_raw_to_master():
     detector = DuplicateDetector()
     all_duplicate_groups = []
     
-    for block_id, block_indices in blocks.items():
-        groups = detector.find_duplicate_groups(df, block_indices)
-        all_duplicate_groups.extend(groups)
+    # Blocos são independentes: um por thread, cdist single-thread dentro.
+    # Cada tarefa roda numa cópia do contexto (logger.contextualize do
+    # dashboard chega aos logs dos workers)
+    with ThreadPoolExecutor(max_workers=_DEDUP_WORKERS) as pool:
+        futures = [
+            pool.submit(
+                contextvars.copy_context().run,
+                detector.find_duplicate_groups, df, block_indices, workers=1
+            )
+            for block_indices in blocks.values()
+        ]
+        for future in futures:
+            all_duplicate_groups.extend(future.result())
     
     logger.info(f"✓ Encontrados {len(all_duplicate_groups)} grupos únicos")
     
@@ -646,11 +1146,7 @@ def process_parks_raw_to_master():
     logger.info("\n5. Consolidando registros master...")
     
     builder = MasterRecordBuilder()
-    master_records = []
-    
-    for group in all_duplicate_groups:
-        master = builder.consolidate_duplicate_group(df, group)
-        master_records.append(master)
+    master_records = builder.consolidate_groups(df, all_duplicate_groups)
     
     logger.info(f"✓ Criados {len(master_records)} registros master")
     
@@ -664,77 +1160,15 @@ def process_parks_raw_to_master():
     # 6. Inserir em parks_master
     logger.info("\n6. Inserindo registros em parks_master...")
     
-    insert_count = 0
-    error_count = 0
-    
     with get_db_session() as session:
-        for master in master_records:
-            try:
-                import json
-                
-                session.execute(text("""
-                    INSERT INTO parks_master (
-                        master_id, name, park_type, alternative_names,
-                        address, city, state, zip_code, county,
-                        latitude, longitude, geom, location_confidence,
-                        phone, website, email,
-                        business_status, avg_rating, total_reviews,
-                        source_ids, confidence_score, data_quality_flags,
-                        needs_manual_review
-                    ) VALUES (
-                        :master_id, :name, :park_type, CAST(:alternative_names AS text[]),
-                        :address, :city, :state, :zip_code, :county,
-                        :latitude, :longitude,
-                        CAST(ST_SetSRID(ST_MakePoint(:longitude, :latitude), 4326) AS geography),
-                        :location_confidence,
-                        :phone, :website, :email,
-                        :business_status, :avg_rating, :total_reviews,
-                        CAST(:source_ids AS jsonb), :confidence_score, CAST(:data_quality_flags AS jsonb),
-                        :needs_manual_review
-                    )
-                    ON CONFLICT (master_id) DO UPDATE SET
-                        updated_at = CURRENT_TIMESTAMP
-                """), {
-                    'master_id': master['master_id'],
-                    'name': master['name'],
-                    'park_type': master['park_type'],
-                    'alternative_names': master['alternative_names'],
-                    'address': master['address'],
-                    'city': master['city'],
-                    'state': master['state'],
-                    'zip_code': master['zip_code'],
-                    'county': master['county'],
-                    'latitude': master['latitude'],
-                    'longitude': master['longitude'],
-                    'location_confidence': master['location_confidence'],
-                    'phone': master['phone'],
-                    'website': master['website'],
-                    'email': master['email'],
-                    'business_status': master['business_status'],
-                    'avg_rating': master['avg_rating'],
-                    'total_reviews': master['total_reviews'],
-                    'source_ids': json.dumps(master['source_ids']),
-                    'confidence_score': master['confidence_score'],
-                    'data_quality_flags': json.dumps(master['data_quality_flags']),
-                    'needs_manual_review': master['needs_manual_review']
-                })
-                
-                insert_count += 1
-                
-            except Exception as e:
-                logger.error(f"Erro ao inserir master {master.get('name', 'N/A')}: {e}")
-                error_count += 1
+        insert_count = _copy_master_records(session, master_records)
         
         # Marcar registros como processados
-        session.execute(text("""
-            UPDATE parks_raw
-            SET is_processed = TRUE
-            WHERE id IN :ids
-        """), {'ids': tuple(df['id'].tolist())})
+        _mark_raw_processed(session, df['id'].tolist())
         
         session.commit()
     
-    logger.info(f"✓ {insert_count} registros inseridos, {error_count} erros")
+    logger.info(f"✓ {insert_count} registros inseridos")
     
     # Resumo final
     logger.info("\n" + "="*60)
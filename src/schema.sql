@@ -1,6 +1,6 @@
 -- Schema SQL para o projeto MHP Intelligence
 -- PostgreSQL 14+ com extensão PostGIS
--- ORDEM: companies → owners → parks_raw → parks_master
+-- ORDEM: companies → owners → parks_raw → parks_master → counties
 
 -- Ativar extensão PostGIS
 CREATE EXTENSION IF NOT EXISTS postgis;
@@ -150,6 +150,9 @@ CREATE INDEX IF NOT EXISTS idx_owners_county ON owners(county_name);
 CREATE INDEX IF NOT EXISTS idx_owners_confidence ON owners(confidence_score);
 CREATE INDEX IF NOT EXISTS idx_owners_needs_review ON owners(needs_manual_review);
 CREATE INDEX IF NOT EXISTS idx_owners_mailing_address_gin ON owners USING gin(mailing_address jsonb_path_ops);
+-- Identidade usada pelo INSERT ... ON CONFLICT em lote do orchestrator
+CREATE UNIQUE INDEX IF NOT EXISTS idx_owners_identity
+    ON owners (full_name, (mailing_address->>'line1'), (mailing_address->>'zip'));
 
 
 
@@ -267,6 +270,7 @@ CREATE TABLE IF NOT EXISTS parks_master (
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     last_verified_at TIMESTAMP WITH TIME ZONE,
+    last_lookup_attempt_at TIMESTAMP WITH TIME ZONE,  -- Última busca de proprietário (orchestrator)
     needs_manual_review BOOLEAN DEFAULT FALSE,
     
     -- Constraints
@@ -277,11 +281,29 @@ CREATE TABLE IF NOT EXISTS parks_master (
 -- Índices para parks_master
 CREATE INDEX IF NOT EXISTS idx_parks_master_geom ON parks_master USING GIST(geom);
 CREATE INDEX IF NOT EXISTS idx_parks_master_state_city ON parks_master(state, city);
+CREATE INDEX IF NOT EXISTS idx_parks_master_state_county ON parks_master(state, county) WHERE state IS NOT NULL AND county IS NOT NULL;
 CREATE INDEX IF NOT EXISTS idx_parks_master_owner ON parks_master(owner_id);
 CREATE INDEX IF NOT EXISTS idx_parks_master_company ON parks_master(company_id);
 CREATE INDEX IF NOT EXISTS idx_parks_master_manual_review ON parks_master(needs_manual_review);
 
 
+-- ============================================================================
+-- Tabela 5: counties (sem dependências)
+-- Limites dos condados, carregados do GeoJSON do CountyMapper
+-- (scripts/load_counties.py --state). O orchestrator resolve o condado dos
+-- parques com um join espacial nesta tabela, restrito ao estado do parque.
+-- Nomes de condado se repetem entre estados: chave (state, name).
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS counties (
+    state VARCHAR(2) NOT NULL,      -- Mesmo formato de parks_master.state: "IN"
+    name VARCHAR(100) NOT NULL,     -- Mesmo formato do CountyMapper: "Marion County"
+    geom GEOMETRY(MultiPolygon, 4326) NOT NULL,
+    PRIMARY KEY (state, name)
+);
+
+CREATE INDEX IF NOT EXISTS idx_counties_geom ON counties USING GIST(geom);
+
+
 -- ============================================================================
 -- Triggers para atualização automática de updated_at
 -- ============================================================================
@@ -0,0 +1,147 @@
+"""
+Testes de src/processing/deduplication.py.
+
+Comparam as versões vetorizadas (consolidate_groups, find_duplicate_groups)
+com as implementações de referência, um grupo/par por vez.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.processing.deduplication import DuplicateDetector, MasterRecordBuilder
+
+
+def _parks() -> pd.DataFrame:
+    """Parques de exemplo: fontes, coordenadas e contatos parcialmente ausentes."""
+    return pd.DataFrame(
+        [
+            # Grupo 0: três fontes, Google Places com contato
+            ('Sunset Mobile Home Park', 'mobile_home', '100 Main St', 'Indianapolis', 'IN', '46201', 'Marion',
+             39.7684, -86.1581, None, None, None, 'OPERATIONAL', 4.0, 10, 'osm', 'osm-1'),
+            ('Sunset MHP', '', '100 Main Street', 'Indianapolis', 'IN', '46201', 'Marion',
+             39.7686, -86.1583, '317-555-0100', 'https://sunset.example', None, None, 5.0, 4,
+             'google_places', 'gp-1'),
+            ('Sunset Mobile Home Park', None, '', None, 'IN', None, None,
+             np.nan, np.nan, '317-555-0199', None, 'office@sunset.example', None, np.nan, np.nan,
+             'yelp', None),
+            # Grupo 1: uma fonte só, sem coordenadas nem avaliações
+            ('Lakeview Estates', 'manufactured', '', 'Gary', 'IN', '46402', 'Lake',
+             np.nan, np.nan, None, None, None, None, np.nan, np.nan, 'manual', 'm-7'),
+            # Grupo 2: fonte desconhecida e nome vazio numa das linhas
+            ('', None, '9 Oak Rd', 'Fort Wayne', 'IN', '46802', 'Allen',
+             41.0793, -85.1394, None, 'https://oak.example', None, 'CLOSED_TEMPORARILY', np.nan, 3,
+             'other', 'x-1'),
+            ('Oak Grove Community', 'mobile_home', None, 'Fort Wayne', 'IN', '46802', 'Allen',
+             41.0795, -85.1396, '260-555-0123', None, None, None, 3.5, 20, 'osm', 'osm-9'),
+        ],
+        columns=[
+            'name', 'park_type', 'address', 'city', 'state', 'zip_code', 'county',
+            'latitude', 'longitude', 'phone', 'website', 'email', 'business_status',
+            'rating', 'total_reviews', 'source', 'external_id',
+        ],
+        index=[10, 11, 12, 20, 30, 31],
+    )
+
+
+def _without_id(master: dict) -> dict:
+    return {key: value for key, value in master.items() if key != 'master_id'}
+
+
+@pytest.mark.parametrize('groups', [
+    [[10, 11, 12], [20], [30, 31]],
+    [[31, 30], [12, 10, 11], [20]],
+    [[10], [11], [12], [20], [30], [31]],
+])
+def test_consolidate_groups_matches_consolidate_duplicate_group(groups):
+    df = _parks()
+
+    expected = [
+        _without_id(MasterRecordBuilder.consolidate_duplicate_group(df, group))
+        for group in groups
+    ]
+    actual = [_without_id(master) for master in MasterRecordBuilder.consolidate_groups(df, groups)]
+
+    assert actual == pytest.approx(expected)
+
+
+def test_consolidate_groups_prefers_google_places_contact():
+    master, = MasterRecordBuilder.consolidate_groups(_parks(), [[10, 12, 11]])
+
+    assert master['phone'] == '317-555-0100'
+    assert master['website'] == 'https://sunset.example'
+    assert master['email'] == 'office@sunset.example'
+    assert master['alternative_names'] == ['Sunset MHP', 'Sunset Mobile Home Park']
+
+
+def _greedy_duplicate_groups(df: pd.DataFrame, block_indices: list) -> list:
+    """Agrupamento antigo: passada gulosa de are_duplicates a partir de cada semente."""
+    groups = []
+    processed = set()
+
+    for idx in block_indices:
+        if idx in processed:
+            continue
+
+        group = [idx]
+        processed.add(idx)
+
+        for other_idx in block_indices:
+            if other_idx in processed:
+                continue
+
+            if DuplicateDetector.are_duplicates(df.loc[idx], df.loc[other_idx])[0]:
+                group.append(other_idx)
+                processed.add(other_idx)
+
+        groups.append(group)
+
+    return groups
+
+
+def _block() -> pd.DataFrame:
+    """Bloco sem cadeias: cada par duplicado também casa com o resto do grupo."""
+    return pd.DataFrame(
+        [
+            ('Sunset Mobile Home Park', 39.7684, -86.1581, '100 main st indianapolis'),
+            ('Sunset Mobile Home Park', 39.7686, -86.1583, '100 main st indianapolis'),
+            ('Sunset Mobile Home Park', 39.8684, -86.1581, '100 main st indianapolis'),
+            ('Lakeview Estates', np.nan, np.nan, '9 lake rd gary'),
+            ('Lakeview Estates MHC', np.nan, np.nan, '9 lake road gary'),
+            ('Lakeview Estates', np.nan, np.nan, ''),
+            ('Oak Grove', 39.7700, -86.1600, ''),
+            ('', 39.7684, -86.1581, ''),
+        ],
+        columns=['name', 'latitude', 'longitude', 'address_normalized'],
+        index=[3, 5, 8, 13, 21, 34, 55, 89],
+    )
+
+
+def test_find_duplicate_groups_matches_greedy_grouping_without_chains():
+    df = _block()
+    block = list(df.index)
+
+    expected = _greedy_duplicate_groups(df, block)
+    actual = DuplicateDetector.find_duplicate_groups(df, block, workers=1)
+
+    assert sorted(map(sorted, actual)) == sorted(map(sorted, expected))
+    assert sorted(idx for group in actual for idx in group) == block
+
+
+def test_find_duplicate_groups_joins_chained_duplicates():
+    # A~B e B~C a ~400 m, mas A e C a ~800 m (acima do limiar de 500 m)
+    df = pd.DataFrame(
+        {
+            'name': ['Riverside Park', 'Riverside Park', 'Riverside Park'],
+            'latitude': [40.0000, 40.0036, 40.0072],
+            'longitude': [-86.0, -86.0, -86.0],
+        },
+        index=[0, 1, 2],
+    )
+    assert not DuplicateDetector.are_duplicates(df.loc[0], df.loc[2])[0]
+
+    assert _greedy_duplicate_groups(df, [0, 1, 2]) == [[0, 1], [2]]
+    assert DuplicateDetector.find_duplicate_groups(df, [0, 1, 2], workers=1) == [[0, 1, 2]]
+
+
+def test_find_duplicate_groups_single_row_block():
+    assert DuplicateDetector.find_duplicate_groups(_block(), [55]) == [[55]]
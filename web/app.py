@@ -7,194 +7,613 @@ Dashboard para controle do pipeline de scraping de MHP/RV Parks.
 import os
 import sys
 import json
+import time
+import queue
+import functools
 import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from datetime import datetime
-from flask import Flask, render_template, jsonify, request
+from typing import Optional
+from flask import Flask, Response, render_template, jsonify, request
+from flask.json.provider import DefaultJSONProvider
+from loguru import logger
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Raiz do projeto, calculada uma vez no import
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 # Adiciona o diretório raiz ao path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, _REPO_ROOT)
 
 from sqlalchemy import text
 from src.database import get_engine
 
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    jsonify via orjson (opcional: pip install orjson) - os polls e o
+    /api/stream serializam o tempo todo. Tipos que o orjson não conhece
+    (Decimal, ...) caem no default do Flask.
+    """
+    
+    def dumps(self, obj, **kwargs) -> str:
+        return self._encode(obj).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self._encode(obj), mimetype='application/json')
+    
+    def _encode(self, obj) -> bytes:
+        return orjson.dumps(
+            obj,
+            default=self.default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+        )
+
+
 app = Flask(__name__)
 app.secret_key = 'bellaterra-secret-key-2025'
+if ORJSON_AVAILABLE:
+    app.json = OrjsonProvider(app)
+
+# Opções do engine do dashboard. Neste processo o engine é criado só por
+# get_cached_engine: as fases (run_in_process) chamam get_engine() sem
+# opções e recebem este mesmo engine
+_WEB_ENGINE_OPTIONS = dict(
+    pool_size=10,
+    max_overflow=20,
+    pool_pre_ping=True,
+    pool_recycle=3600,
+    pool_use_lifo=True,
+    # Cache de compilação cabe todas as queries do app e dos scripts que
+    # rodam em processo
+    query_cache_size=1200,
+)
 
-# Cache do engine para evitar reconexões frequentes
-_engine_cache = None
 
 def get_cached_engine():
-    """Retorna engine cacheado."""
-    global _engine_cache
-    if _engine_cache is None:
-        _engine_cache = get_engine()
-    return _engine_cache
+    """
+    Retorna o engine do dashboard (singleton de src.database).
+    
+    Pool LIFO: os polls do dashboard reaproveitam sempre as mesmas conexões
+    quentes e as de overflow envelhecem até o pool_recycle.
+    """
+    return get_engine(**_WEB_ENGINE_OPTIONS)
+
+# Resultados do banco servidos da memória entre polls do dashboard; os dados
+# só mudam quando uma fase do pipeline termina
+_DB_CACHE_TTL = 30
+
+
+def ttl_cache(ttl: float, maxsize: int = 64):
+    """
+    Memoiza o resultado por argumentos durante `ttl` segundos (.cache_clear() invalida).
+    
+    LRU limitado a `maxsize` entradas: argumentos vindos da URL (ex.:
+    /api/counties/<estado>) não fazem o cache crescer sem limite. Entradas
+    expiradas saem ao serem acessadas ou pela pressão do LRU.
+    """
+    def decorator(func):
+        cache = OrderedDict()
+        lock = threading.Lock()
+        
+        @functools.wraps(func)
+        def wrapper(*args):
+            now = time.monotonic()
+            with lock:
+                entry = cache.get(args)
+                if entry is not None:
+                    if entry[0] > now:
+                        cache.move_to_end(args)
+                        return entry[1]
+                    del cache[args]
+            
+            value = func(*args)
+            with lock:
+                cache[args] = (now + ttl, value)
+                cache.move_to_end(args)
+                while len(cache) > maxsize:
+                    cache.popitem(last=False)
+            return value
+        
+        def cache_clear():
+            with lock:
+                cache.clear()
+        
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    return decorator
+
+
+# Estado global do pipeline. Uma fase por vez: _run_slot é adquirido sem
+# bloquear no POST que inicia a fase e liberado no fim dela; os logs são um
+# deque limitado (append atômico), então os polls não disputam lock nenhum
+PHASES = ('phase1', 'phase2', 'phase3', 'phase4', 'phase5', 'export')
+
+_run_slot = threading.Lock()
+
+# Thread de fase reaproveitada entre execuções (aparece como "phase_0" nos
+# tracebacks); o Future da última fase informa o estado no /status
+_phase_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='phase')
+_phase_future = None
 
-# Estado global do pipeline
 pipeline_state = {
-    'phase1_running': False,
-    'phase2_running': False,
-    'phase3_running': False,
-    'phase4_running': False,
-    'phase5_running': False,
-    'export_running': False,
+    'current_phase': None,
     'current_task': None,
     'progress': 0,
-    'logs': [],
+    'logs': deque(maxlen=100),  # Mantém apenas os últimos 100 logs
     'last_update': None,
 }
 
-# Lock para thread safety
-state_lock = threading.Lock()
+
+# Clientes do /api/stream: uma fila por aba aberta. add_log e as transições
+# de fase publicam em todas; sem eventos, ninguém serializa nada
+_STREAM_QUEUE_SIZE = 500
+_STREAM_HEARTBEAT = 15  # segundos entre comentários keep-alive
+# Cada aba conectada prende uma thread do servidor WSGI enquanto estiver
+# aberta. Acima deste limite o /api/stream responde 503 e o dashboard cai
+# para o polling, deixando threads livres para as demais rotas. Manter
+# abaixo das --threads do servidor (ver web/wsgi.py)
+_STREAM_MAX_CLIENTS = int(os.getenv('DASHBOARD_STREAM_CLIENTS', '8'))
+_stream_clients = []
+_stream_clients_lock = threading.Lock()
+
+
+def publish_event(event: str, data: dict):
+    """Envia um evento SSE a todos os clientes conectados."""
+    with _stream_clients_lock:
+        clients = list(_stream_clients)
+    
+    for client in clients:
+        try:
+            client.put_nowait((event, data))
+        except queue.Full:
+            # Aba parada (ex.: suspensa pelo navegador): desconecta, o
+            # EventSource reconecta e recebe um snapshot novo
+            unregister_stream_client(client)
 
 
 def add_log(message: str, level: str = 'info'):
     """Adiciona mensagem ao log."""
-    with state_lock:
-        pipeline_state['logs'].append({
-            'time': datetime.now().strftime('%H:%M:%S'),
-            'level': level,
-            'message': message
-        })
-        # Manter apenas os últimos 100 logs
-        if len(pipeline_state['logs']) > 100:
-            pipeline_state['logs'] = pipeline_state['logs'][-100:]
-        pipeline_state['last_update'] = datetime.now().isoformat()
-
-
-def get_db_stats():
-    """Retorna estatísticas do banco de dados."""
+    entry = {
+        'time': datetime.now().strftime('%H:%M:%S'),
+        'level': level,
+        'message': message
+    }
+    pipeline_state['logs'].append(entry)
+    pipeline_state['last_update'] = datetime.now().isoformat()
+    publish_event('log', entry)
+
+
+def start_phase(phase: str, task: str):
+    """Marca a fase como em execução e avisa os clientes do stream."""
+    pipeline_state['current_phase'] = phase
+    pipeline_state['current_task'] = task
+    pipeline_state['last_update'] = datetime.now().isoformat()
+    publish_event('status', pipeline_snapshot(include_logs=False))
+
+
+def finish_phase(phase: str):
+    """Libera a fase, invalida os caches do banco e avisa os clientes."""
+    clear_db_caches()
+    pipeline_state['current_phase'] = None
+    pipeline_state['current_task'] = None
+    pipeline_state['last_update'] = datetime.now().isoformat()
+    _run_slot.release()
+    publish_event('status', pipeline_snapshot(include_logs=False))
+
+
+def _phase_done(future):
+    """
+    Callback do Future da fase: last_run só vira done/failed depois de
+    finish_phase, então renova last_update (e o ETag) de novo aqui.
+    """
+    pipeline_state['last_update'] = datetime.now().isoformat()
+    publish_event('status', pipeline_snapshot(include_logs=False))
+
+
+# Níveis do loguru -> níveis do painel de logs
+_LOG_LEVELS = {
+    'SUCCESS': 'success',
+    'WARNING': 'warning',
+    'ERROR': 'error',
+    'CRITICAL': 'error',
+}
+
+
+# Log completo de cada fase vai para disco (logs/<fase>_<data>.log); o
+# painel só recebe linhas curtas
+_PHASE_LOG_DIR = os.path.join(_REPO_ROOT, 'logs')
+_PANEL_LINE_MAX = 200
+
+
+def _forward_log(message):
+    """Sink do loguru: repassa o registro ao painel de logs do dashboard."""
+    record = message.record
+    line = record['message'].strip()
+    if line:
+        add_log(line[:_PANEL_LINE_MAX], _LOG_LEVELS.get(record['level'].name, 'info'))
+
+
+def run_in_process(phase: str, script_main, options: dict) -> bool:
+    """
+    Executa o main() de um script na thread atual (sem subprocess).
+    
+    Enquanto a fase roda, os logs dela vão inteiros para um arquivo
+    rotativo da fase e, a partir de INFO, para o painel. Os registros são
+    marcados com extra['phase'] via logger.contextualize (contextvar), que
+    acompanha tasks asyncio, asyncio.to_thread e os pools que copiam o
+    contexto no submit; logs de outras requisições ficam de fora. Scripts
+    retornam bool (True = ok) ou código de saída (0 = ok).
+    """
+    # Engine com as opções do dashboard criado antes do script: senão a
+    # primeira fase criaria o singleton com as opções padrão
+    get_cached_engine()
+    
+    same_phase = lambda record: record['extra'].get('phase') == phase
+    
+    sink_ids = [
+        logger.add(_forward_log, level='INFO', format='{message}', filter=same_phase),
+        logger.add(
+            os.path.join(_PHASE_LOG_DIR, f'{phase}_{{time:YYYY-MM-DD_HH-mm-ss}}.log'),
+            level='DEBUG',
+            rotation='10 MB',
+            retention=3,
+            enqueue=True,  # escrita em disco fora da thread da fase
+            filter=same_phase,
+        ),
+    ]
     try:
-        engine = get_cached_engine()
-        with engine.connect() as conn:
-            stats = {}
-            
-            # Total de parques raw
-            try:
-                r = conn.execute(text("SELECT COUNT(*) FROM parks_raw"))
-                stats['parks_raw'] = r.scalar() or 0
-            except Exception:
-                stats['parks_raw'] = 0
-            
-            # Total de parques master
-            try:
-                r = conn.execute(text("SELECT COUNT(*) FROM parks_master"))
-                stats['parks_master'] = r.scalar() or 0
-            except Exception:
-                stats['parks_master'] = 0
-            
-            # Por estado
-            try:
-                r = conn.execute(text("""
-                    SELECT state, COUNT(*) 
-                    FROM parks_master 
-                    WHERE state IS NOT NULL
-                    GROUP BY state 
-                    ORDER BY COUNT(*) DESC
-                """))
-                stats['by_state'] = {row[0]: row[1] for row in r}
-            except Exception:
-                stats['by_state'] = {}
-            
-            # Com website
-            try:
-                r = conn.execute(text("""
-                    SELECT COUNT(*) FROM parks_master 
-                    WHERE website IS NOT NULL AND website != ''
-                """))
-                stats['with_website'] = r.scalar() or 0
-            except Exception:
-                stats['with_website'] = 0
-            
-            # Com telefone
-            try:
-                r = conn.execute(text("""
-                    SELECT COUNT(*) FROM parks_master 
-                    WHERE phone IS NOT NULL AND phone != ''
-                """))
-                stats['with_phone'] = r.scalar() or 0
-            except Exception:
-                stats['with_phone'] = 0
-            
-            # Owners
-            try:
-                r = conn.execute(text("SELECT COUNT(*) FROM owners"))
-                stats['owners'] = r.scalar() or 0
-            except Exception:
-                stats['owners'] = 0
-            
-            # Owners corporativos
-            try:
-                r = conn.execute(text("SELECT COUNT(*) FROM owners WHERE is_corporate = true"))
-                stats['corporate_owners'] = r.scalar() or 0
-            except Exception:
-                stats['corporate_owners'] = 0
-            
-            # Companies
-            try:
-                r = conn.execute(text("SELECT COUNT(*) FROM companies"))
-                stats['companies'] = r.scalar() or 0
-            except Exception:
-                stats['companies'] = 0
-            
-            # Contatos
-            try:
-                r = conn.execute(text("SELECT COUNT(*) FROM contacts"))
-                stats['contacts'] = r.scalar() or 0
-            except Exception:
-                stats['contacts'] = 0
-            
-            # Contatos com email
+        with logger.contextualize(phase=phase):
+            # options nunca None: None é o modo CLI (argparse/input())
+            result = script_main(options or {})
+    finally:
+        for sink_id in sink_ids:
+            logger.remove(sink_id)
+    
+    if isinstance(result, bool):
+        return result
+    return result == 0
+
+
+def pipeline_snapshot(include_logs: bool = True) -> dict:
+    """Estado do pipeline serializável (flags phaseN_running + campos)."""
+    current_phase = pipeline_state['current_phase']
+    snapshot = {f'{phase}_running': phase == current_phase for phase in PHASES}
+    snapshot.update(
+        current_phase=current_phase,
+        current_task=pipeline_state['current_task'],
+        progress=pipeline_state['progress'],
+        last_update=pipeline_state['last_update'],
+    )
+    snapshot['last_run'] = _future_state(_phase_future)
+    if include_logs:
+        snapshot['logs'] = list(pipeline_state['logs'])
+    return snapshot
+
+
+def _future_state(future) -> Optional[str]:
+    """Estado do Future da última fase: pending/running/done/failed."""
+    if future is None:
+        return None
+    if not future.done():
+        return 'running' if future.running() else 'pending'
+    return 'failed' if future.exception() is not None else 'done'
+
+
+def conditional_json(build):
+    """
+    Resposta JSON com ETag fraco derivado de last_update (muda a cada log,
+    transição de fase e conclusão do Future da fase). Se o cliente já tem essa versão, devolve 304 sem
+    chamar build() nem serializar nada.
+    """
+    etag = pipeline_state['last_update'] or 'init'
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        response = jsonify(build())
+    
+    response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = 'no-cache'  # Sempre revalidar
+    return response
+
+
+def _sse(event: str, data: dict) -> str:
+    """Formata um evento Server-Sent Events."""
+    return f'event: {event}\ndata: {app.json.dumps(data)}\n\n'
+
+
+def register_stream_client() -> Optional[queue.Queue]:
+    """Fila de um novo cliente do /api/stream (None se o limite foi atingido)."""
+    with _stream_clients_lock:
+        if len(_stream_clients) >= _STREAM_MAX_CLIENTS:
+            return None
+        client = queue.Queue(maxsize=_STREAM_QUEUE_SIZE)
+        _stream_clients.append(client)
+        return client
+
+
+def unregister_stream_client(client: queue.Queue):
+    """Libera a vaga do cliente (idempotente)."""
+    with _stream_clients_lock:
+        if client in _stream_clients:
+            _stream_clients.remove(client)
+
+
+def event_stream(client: queue.Queue):
+    """
+    Gerador do /api/stream: snapshot completo na conexão e, depois, só os
+    deltas (eventos 'log' e 'status') à medida que são publicados.
+    
+    Args:
+        client: Fila já registrada por register_stream_client
+    """
+    try:
+        yield _sse('snapshot', pipeline_snapshot())
+        while True:
             try:
-                r = conn.execute(text("""
-                    SELECT COUNT(*) FROM contacts 
-                    WHERE email IS NOT NULL AND email != ''
-                """))
-                stats['contacts_with_email'] = r.scalar() or 0
-            except Exception:
-                stats['contacts_with_email'] = 0
-            
-            return stats
+                event, data = client.get(timeout=_STREAM_HEARTBEAT)
+            except queue.Empty:
+                with _stream_clients_lock:
+                    if client not in _stream_clients:
+                        return
+                # Comentário SSE: mantém proxies abertos e detecta abas fechadas
+                yield ': keep-alive\n\n'
+                continue
+            yield _sse(event, data)
+    finally:
+        unregister_stream_client(client)
+
+
+# Contadores do /api/stats numa única ida ao banco (um scan por tabela,
+# subcontagens via FILTER). {parks_raw} é a contagem exata ou a estimativa
+# do planner (pg_class.reltuples, O(1)) - parks_raw só cresce com a ingestão
+_STATS_COUNTERS_SQL = """
+    WITH pm AS (
+        SELECT
+            COUNT(*) AS total,
+            COUNT(*) FILTER (WHERE website IS NOT NULL AND website != '') AS with_website,
+            COUNT(*) FILTER (WHERE phone IS NOT NULL AND phone != '') AS with_phone
+        FROM parks_master
+    ),
+    o AS (
+        SELECT
+            COUNT(*) AS total,
+            COUNT(*) FILTER (WHERE is_individual = false) AS corporate
+        FROM owners
+    ),
+    c AS (
+        SELECT
+            COUNT(*) AS total,
+            COUNT(*) FILTER (WHERE email IS NOT NULL AND email != '') AS with_email
+        FROM contacts
+    )
+    SELECT
+        {parks_raw},
+        pm.total, pm.with_website, pm.with_phone,
+        o.total, o.corporate,
+        (SELECT COUNT(*) FROM companies),
+        c.total, c.with_email
+    FROM pm, o, c
+"""
+
+_STATS_COUNTERS = text(_STATS_COUNTERS_SQL.format(
+    # reltuples = -1 em tabela nunca analisada
+    parks_raw="(SELECT GREATEST(reltuples, 0)::bigint FROM pg_class WHERE oid = 'parks_raw'::regclass)"
+))
+_STATS_COUNTERS_EXACT = text(_STATS_COUNTERS_SQL.format(
+    parks_raw="(SELECT COUNT(*) FROM parks_raw)"
+))
+
+# Teto para as contagens exatas restantes no caminho padrão; se estourar,
+# o fallback métrica a métrica roda sem limite (a transação é desfeita)
+_STATS_TIMEOUT = text("SET LOCAL statement_timeout = '500ms'")
+
+_STATS_KEYS = (
+    'parks_raw',
+    'parks_master', 'with_website', 'with_phone',
+    'owners', 'corporate_owners',
+    'companies',
+    'contacts', 'contacts_with_email',
+)
+
+# Agregações por estado/condado já montadas em JSON pelo Postgres: um
+# único valor (dict/list via adaptador json do psycopg2), sem montar
+# objeto Python por linha
+_STATS_BY_STATE = text("""
+    SELECT COALESCE(json_object_agg(state, cnt ORDER BY cnt DESC), '{}'::json)
+    FROM (
+        SELECT state, COUNT(*) AS cnt
+        FROM parks_master 
+        WHERE state IS NOT NULL
+        GROUP BY state
+    ) t
+""")
+
+_STATES_LIST = text("""
+    SELECT COALESCE(json_agg(json_build_object('code', state, 'count', cnt) ORDER BY cnt DESC), '[]'::json)
+    FROM (
+        SELECT state, COUNT(*) AS cnt
+        FROM parks_master 
+        WHERE state IS NOT NULL
+        GROUP BY state
+    ) t
+""")
+
+_COUNTIES_FOR_STATE = text("""
+    SELECT COALESCE(json_agg(json_build_object('name', county, 'count', cnt) ORDER BY county), '[]'::json)
+    FROM (
+        SELECT county, COUNT(*) AS cnt
+        FROM parks_master 
+        WHERE state = :state AND county IS NOT NULL
+        GROUP BY county
+    ) t
+""")
+
+# Base do /api/overview; condados já em ordem alfabética por estado
+_STATE_COUNTY_COUNTS = text("""
+    SELECT state, county, COUNT(*)
+    FROM parks_master
+    WHERE state IS NOT NULL
+    GROUP BY state, county
+    ORDER BY state, county
+""")
+
+# Fallback métrica a métrica (banco sem alguma das tabelas). Statements
+# montados uma vez no import, não a cada request
+_STATS_QUERIES = {
+    key: text(sql) for key, sql in {
+        'parks_raw': "SELECT COUNT(*) FROM parks_raw",
+        'parks_master': "SELECT COUNT(*) FROM parks_master",
+        'with_website': "SELECT COUNT(*) FROM parks_master WHERE website IS NOT NULL AND website != ''",
+        'with_phone': "SELECT COUNT(*) FROM parks_master WHERE phone IS NOT NULL AND phone != ''",
+        'owners': "SELECT COUNT(*) FROM owners",
+        'corporate_owners': "SELECT COUNT(*) FROM owners WHERE is_individual = false",
+        'companies': "SELECT COUNT(*) FROM companies",
+        'contacts': "SELECT COUNT(*) FROM contacts",
+        'contacts_with_email': "SELECT COUNT(*) FROM contacts WHERE email IS NOT NULL AND email != ''",
+    }.items()
+}
+
+
+def _get_db_stats_per_metric(conn) -> dict:
+    """
+    Estatísticas uma query por vez; métrica que falhar fica zerada.
+    
+    Cada query num savepoint: a falha desfaz só ele e a transação (e o
+    snapshot) continua valendo para as próximas.
+    """
+    stats = {}
+    
+    for key, stmt in _STATS_QUERIES.items():
+        try:
+            with conn.begin_nested():
+                stats[key] = conn.execute(stmt).scalar_one() or 0
+        except Exception:
+            stats[key] = 0
+    
+    try:
+        with conn.begin_nested():
+            stats['by_state'] = conn.execute(_STATS_BY_STATE).scalar_one()
+    except Exception:
+        stats['by_state'] = {}
+    
+    return stats
+
+
+def _read_db_stats(conn, exact: bool = False) -> dict:
+    """Estatísticas numa conexão aberta (agregado único, senão métrica a métrica)."""
+    try:
+        # Savepoint: se falhar, desfaz também o SET LOCAL do timeout
+        with conn.begin_nested():
+            if exact:
+                row = conn.execute(_STATS_COUNTERS_EXACT).one()
+            else:
+                conn.execute(_STATS_TIMEOUT)
+                row = conn.execute(_STATS_COUNTERS).one()
+            stats = {key: value or 0 for key, value in zip(_STATS_KEYS, row)}
+            stats['by_state'] = conn.execute(_STATS_BY_STATE).scalar_one()
+        return stats
+    except Exception:
+        return _get_db_stats_per_metric(conn)
+
+
+def _stats_connection():
+    """
+    Conexão para as leituras do dashboard: uma transação REPEATABLE READ,
+    então todas as contagens enxergam o mesmo snapshot.
+    """
+    return get_cached_engine().connect().execution_options(isolation_level='REPEATABLE READ')
+
+
+def _stats_error(e: Exception) -> dict:
+    """Estatísticas zeradas com a mensagem de erro (banco inacessível)."""
+    return {'error': str(e), **dict.fromkeys(_STATS_KEYS, 0), 'by_state': {}}
+
+
+@ttl_cache(_DB_CACHE_TTL)
+def get_db_stats(exact: bool = False):
+    """
+    Retorna estatísticas do banco de dados.
+    
+    Por padrão parks_raw vem da estimativa do planner; exact=True faz o
+    COUNT(*) real e dispensa o statement_timeout.
+    """
+    try:
+        with _stats_connection() as conn:
+            return _read_db_stats(conn, exact)
     except Exception as e:
-        return {'error': str(e), 'parks_raw': 0, 'parks_master': 0, 'by_state': {}, 
-                'with_website': 0, 'with_phone': 0, 'owners': 0, 'corporate_owners': 0,
-                'companies': 0, 'contacts': 0, 'contacts_with_email': 0}
+        return _stats_error(e)
 
 
+@ttl_cache(_DB_CACHE_TTL)
+def get_overview():
+    """
+    Stats, estados e condados por estado numa conexão só: um GROUP BY
+    (state, county) substitui o /api/states + um /api/counties por estado.
+    """
+    try:
+        with _stats_connection() as conn:
+            # Antes das stats: o statement_timeout delas vale até o fim da transação
+            rows = conn.execute(_STATE_COUNTY_COUNTS).fetchall()
+            stats = _read_db_stats(conn)
+    except Exception as e:
+        return {'stats': _stats_error(e), 'states': [], 'counties': {}}
+    
+    state_totals = {}
+    counties = {}
+    for state, county, count in rows:
+        state_totals[state] = state_totals.get(state, 0) + count
+        if county is not None:
+            counties.setdefault(state, []).append({'name': county, 'count': count})
+    
+    states = [
+        {'code': state, 'count': count}
+        for state, count in sorted(state_totals.items(), key=lambda item: item[1], reverse=True)
+    ]
+    return {'stats': stats, 'states': states, 'counties': counties}
+
+
+@ttl_cache(_DB_CACHE_TTL)
 def get_states_list():
     """Retorna lista de estados disponíveis."""
     try:
         engine = get_cached_engine()
         with engine.connect() as conn:
-            r = conn.execute(text("""
-                SELECT DISTINCT state, COUNT(*) as cnt
-                FROM parks_master 
-                WHERE state IS NOT NULL
-                GROUP BY state
-                ORDER BY cnt DESC
-            """))
-            return [{'code': row[0], 'count': row[1]} for row in r]
+            return conn.execute(_STATES_LIST).scalar_one()
     except Exception:
         return []
 
 
+@ttl_cache(_DB_CACHE_TTL)
 def get_counties_for_state(state_code: str):
     """Retorna lista de condados para um estado."""
     try:
         engine = get_cached_engine()
         with engine.connect() as conn:
-            r = conn.execute(text("""
-                SELECT DISTINCT county, COUNT(*) as cnt
-                FROM parks_master 
-                WHERE state = :state AND county IS NOT NULL
-                GROUP BY county
-                ORDER BY county
-            """), {'state': state_code})
-            return [{'name': row[0], 'count': row[1]} for row in r]
+            return conn.execute(_COUNTIES_FOR_STATE, {'state': state_code}).scalar_one()
     except Exception:
         return []
 
 
+def clear_db_caches():
+    """Invalida os caches de estatísticas (chamado ao fim de cada fase)."""
+    get_db_stats.cache_clear()
+    get_overview.cache_clear()
+    get_states_list.cache_clear()
+    get_counties_for_state.cache_clear()
+
+
 @app.route('/')
 def index():
     """Página principal."""
@@ -203,11 +622,17 @@ def index():
 
 @app.route('/api/stats')
 def api_stats():
-    """Retorna estatísticas do banco."""
-    stats = get_db_stats()
+    """Retorna estatísticas do banco (?exact=1 força contagens exatas)."""
+    stats = get_db_stats(request.args.get('exact') == '1')
     return jsonify(stats)
 
 
+@app.route('/api/overview')
+def api_overview():
+    """Stats + estados + condados numa resposta (carregamento do dashboard)."""
+    return jsonify(get_overview())
+
+
 @app.route('/api/states')
 def api_states():
     """Retorna lista de estados."""
@@ -224,14 +649,35 @@ def api_counties(state_code):
 
 @app.route('/api/pipeline/status')
 def api_pipeline_status():
-    """Retorna status do pipeline."""
-    with state_lock:
-        return jsonify(pipeline_state)
+    """Retorna status do pipeline (304 se nada mudou desde o último poll)."""
+    return conditional_json(pipeline_snapshot)
+
+
+@app.route('/api/stream')
+def api_stream():
+    """Stream SSE de logs e status do pipeline (substitui o polling)."""
+    client = register_stream_client()
+    if client is None:
+        # Resposta não-SSE: o EventSource fecha e o dashboard usa polling
+        response = jsonify({'error': 'Too many stream clients'})
+        response.headers['Retry-After'] = str(_STREAM_HEARTBEAT)
+        return response, 503
+    
+    response = Response(
+        event_stream(client),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
+    # Libera a vaga mesmo se o cliente cair antes do primeiro evento
+    response.call_on_close(lambda: unregister_stream_client(client))
+    return response
 
 
 @app.route('/api/pipeline/run', methods=['POST'])
 def api_run_pipeline():
     """Executa uma fase do pipeline."""
+    global _phase_future
+    
     data = request.json
     phase = data.get('phase')
     options = data.get('options', {})
@@ -239,258 +685,171 @@ def api_run_pipeline():
     if not phase:
         return jsonify({'error': 'Phase not specified'}), 400
     
-    # Verificar se já há algo rodando
-    with state_lock:
-        running = any([
-            pipeline_state['phase1_running'],
-            pipeline_state['phase2_running'],
-            pipeline_state['phase3_running'],
-            pipeline_state['phase4_running'],
-            pipeline_state['phase5_running'],
-            pipeline_state['export_running'],
-        ])
-        if running:
-            return jsonify({'error': 'Another phase is already running'}), 400
-    
-    # Iniciar a fase em background
-    if phase == 'phase1':
-        thread = threading.Thread(target=run_phase1, args=(options,))
-    elif phase == 'phase2':
-        thread = threading.Thread(target=run_phase2, args=(options,))
-    elif phase == 'phase3':
-        thread = threading.Thread(target=run_phase3, args=(options,))
-    elif phase == 'phase4':
-        thread = threading.Thread(target=run_phase4, args=(options,))
-    elif phase == 'phase5':
-        thread = threading.Thread(target=run_phase5, args=(options,))
-    elif phase == 'export':
-        thread = threading.Thread(target=run_export, args=(options,))
-    else:
+    runner = PHASE_RUNNERS.get(phase)
+    if runner is None:
         return jsonify({'error': f'Unknown phase: {phase}'}), 400
     
-    thread.daemon = True
-    thread.start()
+    # Verificar e reservar numa operação só: dois POSTs simultâneos não
+    # conseguem iniciar duas fases (liberado em finish_phase)
+    if not _run_slot.acquire(blocking=False):
+        return jsonify({'error': 'Another phase is already running'}), 409
+    
+    # Iniciar a fase em background
+    try:
+        _phase_future = _phase_executor.submit(runner, options)
+    except Exception:
+        _run_slot.release()
+        raise
+    _phase_future.add_done_callback(_phase_done)
     
     return jsonify({'status': 'started', 'phase': phase})
 
 
 def run_phase1(options):
     """Executa Fase 1: Ingestão."""
-    with state_lock:
-        pipeline_state['phase1_running'] = True
-        pipeline_state['current_task'] = 'Fase 1: Ingestão de Dados'
+    start_phase('phase1', 'Fase 1: Ingestão de Dados')
     
     add_log('🚀 Iniciando Fase 1: Ingestão via Google Places API', 'info')
     
     try:
-        import subprocess
+        from scripts.run_ingest import main as ingest_main
         states = options.get('states', ['IN'])
         add_log(f'📍 Estados selecionados: {", ".join(states)}', 'info')
         
-        result = subprocess.run(
-            ['python', 'scripts/run_ingest.py'],
-            capture_output=True,
-            text=True,
-            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
-            timeout=3600
-        )
-        
-        if result.returncode == 0:
+        if run_in_process('phase1', ingest_main, options):
             add_log('✅ Fase 1 concluída com sucesso!', 'success')
         else:
             add_log(f'⚠️ Fase 1 com avisos', 'warning')
         
-    except subprocess.TimeoutExpired:
-        add_log('⏰ Fase 1 timeout após 1 hora', 'warning')
     except Exception as e:
         add_log(f'❌ Erro na Fase 1: {str(e)}', 'error')
     
     finally:
-        with state_lock:
-            pipeline_state['phase1_running'] = False
-            pipeline_state['current_task'] = None
+        finish_phase('phase1')
 
 
 def run_phase2(options):
     """Executa Fase 2: Deduplicação."""
-    with state_lock:
-        pipeline_state['phase2_running'] = True
-        pipeline_state['current_task'] = 'Fase 2: Deduplicação'
+    start_phase('phase2', 'Fase 2: Deduplicação')
     
     add_log('🔄 Iniciando Fase 2: Deduplicação', 'info')
     
     try:
-        import subprocess
-        result = subprocess.run(
-            ['python', 'scripts/process_to_master.py'],
-            capture_output=True,
-            text=True,
-            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
-            timeout=600
-        )
+        from scripts.process_to_master import main as process_main
         
-        if result.returncode == 0:
+        if run_in_process('phase2', process_main, options):
             add_log('✅ Fase 2 concluída com sucesso!', 'success')
         else:
             add_log(f'❌ Erro na Fase 2', 'error')
             
-    except subprocess.TimeoutExpired:
-        add_log('⏰ Fase 2 timeout após 10 minutos', 'warning')
     except Exception as e:
         add_log(f'❌ Erro na Fase 2: {str(e)}', 'error')
     
     finally:
-        with state_lock:
-            pipeline_state['phase2_running'] = False
-            pipeline_state['current_task'] = None
+        finish_phase('phase2')
 
 
 def run_phase3(options):
     """Executa Fase 3: Identificação de Owners."""
-    with state_lock:
-        pipeline_state['phase3_running'] = True
-        pipeline_state['current_task'] = 'Fase 3: Identificação de Proprietários'
+    start_phase('phase3', 'Fase 3: Identificação de Proprietários')
     
     add_log('👤 Iniciando Fase 3: Criando owners a partir dos parques', 'info')
     
     try:
-        import subprocess
-        result = subprocess.run(
-            ['python', 'scripts/create_owners_from_parks.py'],
-            capture_output=True,
-            text=True,
-            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
-            timeout=600
-        )
+        from scripts.create_owners_from_parks import main as owners_main
         
-        if result.returncode == 0:
+        if run_in_process('phase3', owners_main, options):
             add_log('✅ Fase 3 concluída com sucesso!', 'success')
         else:
             add_log(f'❌ Erro na Fase 3', 'error')
             
-    except subprocess.TimeoutExpired:
-        add_log('⏰ Fase 3 timeout após 10 minutos', 'warning')
     except Exception as e:
         add_log(f'❌ Erro na Fase 3: {str(e)}', 'error')
     
     finally:
-        with state_lock:
-            pipeline_state['phase3_running'] = False
-            pipeline_state['current_task'] = None
+        finish_phase('phase3')
 
 
 def run_phase4(options):
     """Executa Fase 4: Enriquecimento Corporativo."""
-    with state_lock:
-        pipeline_state['phase4_running'] = True
-        pipeline_state['current_task'] = 'Fase 4: Enriquecimento Corporativo'
+    start_phase('phase4', 'Fase 4: Enriquecimento Corporativo')
     
     add_log('🏢 Iniciando Fase 4: Enriquecimento Corporativo', 'info')
     add_log('⚠️ Nota: APIs do SOS podem estar bloqueadas', 'warning')
     
     try:
-        import subprocess
+        from scripts.enrich_corporate import main as corporate_main
         limit = options.get('limit', 50)
-        result = subprocess.run(
-            ['python', 'scripts/enrich_corporate.py', '--limit', str(limit)],
-            capture_output=True,
-            text=True,
-            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
-            timeout=300
-        )
         
-        if result.returncode == 0:
+        if run_in_process('phase4', corporate_main, {'limit': int(limit)}):
             add_log('✅ Fase 4 concluída', 'success')
         else:
             add_log('⚠️ Fase 4: APIs podem estar bloqueadas', 'warning')
             
-    except subprocess.TimeoutExpired:
-        add_log('⏰ Fase 4 timeout - APIs do SOS bloqueando', 'warning')
     except Exception as e:
         add_log(f'❌ Erro na Fase 4: {str(e)}', 'error')
     
     finally:
-        with state_lock:
-            pipeline_state['phase4_running'] = False
-            pipeline_state['current_task'] = None
+        finish_phase('phase4')
 
 
 def run_phase5(options):
     """Executa Fase 5: Enriquecimento de Contatos."""
-    with state_lock:
-        pipeline_state['phase5_running'] = True
-        pipeline_state['current_task'] = 'Fase 5: Scraping de Contatos'
+    start_phase('phase5', 'Fase 5: Scraping de Contatos')
     
     add_log('📧 Iniciando Fase 5: Scraping de contatos dos websites', 'info')
     
     try:
-        import subprocess
+        from scripts.enrich_contacts import main as contacts_main
         limit = options.get('limit')
-        cmd = ['python', 'scripts/enrich_contacts.py', '--source', 'website', '--skip-apis']
+        contacts_options = {'source': 'website', 'skip_apis': True}
         if limit:
-            cmd.extend(['--limit', str(limit)])
-            
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
-            timeout=3600
-        )
+            contacts_options['limit'] = int(limit)
         
-        if result.returncode == 0:
+        if run_in_process('phase5', contacts_main, contacts_options):
             add_log('✅ Fase 5 concluída com sucesso!', 'success')
         else:
             add_log('⚠️ Fase 5 concluída com alguns avisos', 'warning')
             
-    except subprocess.TimeoutExpired:
-        add_log('⏰ Fase 5 timeout após 1 hora', 'warning')
     except Exception as e:
         add_log(f'❌ Erro na Fase 5: {str(e)}', 'error')
     
     finally:
-        with state_lock:
-            pipeline_state['phase5_running'] = False
-            pipeline_state['current_task'] = None
+        finish_phase('phase5')
 
 
 def run_export(options):
     """Executa exportação de CSVs."""
-    with state_lock:
-        pipeline_state['export_running'] = True
-        pipeline_state['current_task'] = 'Exportando CSVs'
+    start_phase('export', 'Exportando CSVs')
     
     states = options.get('states', ['IN'])
     add_log(f'📊 Iniciando exportação para: {", ".join(states)}', 'info')
     
     try:
-        import subprocess
-        
-        # Gerar CSVs
-        result = subprocess.run(
-            ['python', 'scripts/generate_csvs.py'],
-            input="1\n",
-            capture_output=True,
-            text=True,
-            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
-            timeout=300
-        )
+        from scripts.generate_csvs import main as export_main
         
-        if result.returncode == 0:
+        # Gerar CSVs (apenas Indiana, como a opção 1 do prompt)
+        if run_in_process('export', export_main, {'state_filter': 'IN'}):
             add_log('✅ CSVs gerados com sucesso!', 'success')
             add_log('📁 Arquivos salvos em output/', 'info')
         else:
             add_log('❌ Erro ao gerar CSVs', 'error')
             
-    except subprocess.TimeoutExpired:
-        add_log('⏰ Exportação timeout', 'warning')
     except Exception as e:
         add_log(f'❌ Erro na exportação: {str(e)}', 'error')
     
     finally:
-        with state_lock:
-            pipeline_state['export_running'] = False
-            pipeline_state['current_task'] = None
+        finish_phase('export')
+
+
+PHASE_RUNNERS = {
+    'phase1': run_phase1,
+    'phase2': run_phase2,
+    'phase3': run_phase3,
+    'phase4': run_phase4,
+    'phase5': run_phase5,
+    'export': run_export,
+}
 
 
 @app.route('/api/properties')
@@ -610,17 +969,17 @@ def api_owners():
 
 @app.route('/api/logs')
 def api_logs():
-    """Retorna logs recentes."""
-    with state_lock:
-        return jsonify(pipeline_state['logs'][-50:])
+    """Retorna os 50 logs mais recentes (sem copiar o deque inteiro)."""
+    logs = pipeline_state['logs']
+    return conditional_json(lambda: list(islice(logs, max(0, len(logs) - 50), None)))
 
 
 @app.route('/api/clear-logs', methods=['POST'])
 def api_clear_logs():
     """Limpa os logs."""
-    with state_lock:
-        pipeline_state['logs'] = []
+    pipeline_state['logs'].clear()
     add_log('🗑️ Logs limpos', 'info')
+    publish_event('snapshot', pipeline_snapshot())
     return jsonify({'status': 'ok'})
 
 
@@ -631,4 +990,8 @@ if __name__ == '__main__':
     print("║       Acesse: http://localhost:5000                      ║")
     print("╚══════════════════════════════════════════════════════════╝")
     print()
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    # Servidor de desenvolvimento; produção via WSGI (ver web/wsgi.py).
+    # Debug/reloader só com FLASK_DEBUG=1: o reloader importa o módulo duas
+    # vezes (dois engines, duas cópias do estado do pipeline)
+    debug = os.getenv('FLASK_DEBUG') == '1'
+    app.run(debug=debug, host='0.0.0.0', port=5000, threaded=True)
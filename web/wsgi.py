@@ -0,0 +1,25 @@
+"""
+Entrada WSGI do dashboard (produção).
+
+    gunicorn --preload -w 1 --threads 16 web.wsgi:app
+    waitress-serve --threads=16 web.wsgi:app      # Windows
+
+Um único worker: o estado do pipeline (fases, logs, clientes do
+/api/stream) vive em memória no processo. As threads do worker dividem
+o mesmo engine/pool; --preload cria o app antes de atender requests.
+
+Cada aba com o /api/stream aberto ocupa uma thread enquanto estiver
+conectada. O app aceita até DASHBOARD_STREAM_CLIENTS streams (padrão 8;
+os seguintes recebem 503 e o dashboard cai para o polling), então
+--threads precisa ser maior que esse limite para sobrar thread para as
+rotas JSON:
+
+    DASHBOARD_STREAM_CLIENTS=24 gunicorn --preload -w 1 --threads 32 web.wsgi:app
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import app  # noqa: E402